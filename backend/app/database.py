@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import os
+import threading
 from typing import Generator
 from urllib.parse import quote_plus
 
-from pymongo import ASCENDING, DESCENDING, MongoClient, ReturnDocument
-from pymongo.errors import InvalidURI
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, MongoClient, ReturnDocument
+from pymongo.errors import CollectionInvalid, InvalidURI, OperationFailure
 from pymongo.database import Database
 
 
@@ -69,15 +70,47 @@ def get_db() -> Generator[Database, None, None]:
     yield get_mongo_database()
 
 
+def _id_block_size() -> int:
+    return max(1, _mongo_int_env("ID_BLOCK_SIZE", 20))
+
+
+# (database name, sequence) -> [next id to hand out, last id of the reserved block]
+_id_blocks: dict[tuple[str, str], list[int]] = {}
+_id_blocks_lock = threading.Lock()
+
+
 def get_next_id(db: Database, sequence: str) -> int:
-    """Atomic, auto-incrementing integer ids (to keep existing API stable)."""
+    """Atomic, auto-incrementing integer ids (to keep existing API stable).
+
+    Hi/lo allocation: each process reserves ID_BLOCK_SIZE ids with one `$inc`
+    on the shared counter and hands them out locally, so ids stay unique across
+    processes and restarts (unused ids of a block are simply skipped).
+    """
+
+    key = (db.name, sequence)
+    with _id_blocks_lock:
+        block = _id_blocks.get(key)
+        if block is None or block[0] > block[1]:
+            reserved = get_next_ids(db, sequence, _id_block_size())
+            block = [reserved.start, reserved.stop - 1]
+            _id_blocks[key] = block
+        next_id = block[0]
+        block[0] += 1
+        return next_id
+
+
+def get_next_ids(db: Database, sequence: str, count: int) -> range:
+    """Reserve `count` consecutive ids with a single counter increment."""
+    if count <= 0:
+        return range(0)
     doc = db["counters"].find_one_and_update(
         {"_id": sequence},
-        {"$inc": {"seq": 1}},
+        {"$inc": {"seq": int(count)}},
         upsert=True,
         return_document=ReturnDocument.AFTER,
     )
-    return int(doc.get("seq", 1))
+    last = int(doc.get("seq", count))
+    return range(last - count + 1, last + 1)
 
 
 def ensure_indexes(db: Database) -> None:
@@ -91,16 +124,73 @@ def ensure_indexes(db: Database) -> None:
     users.create_index([("role", ASCENDING)])
     users.create_index([("district", ASCENDING)])
     users.create_index([("is_available", ASCENDING)])
+    users.create_index([("role", ASCENDING), ("district_key", ASCENDING), ("is_available", ASCENDING)])
 
     reports.create_index([("id", ASCENDING)], unique=True)
-    reports.create_index([("user_id", ASCENDING), ("created_at", DESCENDING)])
+    # List endpoints page by (created_at|assigned_at|completion_verified_at, id); see services/pagination.
+    reports.create_index([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)])
     reports.create_index([("district", ASCENDING), ("created_at", DESCENDING)])
+    reports.create_index([("district_key", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)])
     reports.create_index([("status", ASCENDING)])
     reports.create_index([("cluster_id", ASCENDING)])
-    reports.create_index([("assigned_worker_id", ASCENDING), ("assigned_at", DESCENDING)])
+    reports.create_index([("assigned_worker_id", ASCENDING), ("assigned_at", DESCENDING), ("id", DESCENDING)])
+    reports.create_index(
+        [
+            ("assigned_worker_id", ASCENDING),
+            ("status", ASCENDING),
+            ("completion_verified_at", DESCENDING),
+            ("id", DESCENDING),
+        ]
+    )
+    reports.create_index([("location", GEOSPHERE), ("status", ASCENDING)])
+    reports.create_index([("media_status", ASCENDING), ("created_at", ASCENDING)])
+    # `?since=` delta syncs; see services/report_sync.
+    reports.create_index([("district_key", ASCENDING), ("updated_at", ASCENDING)])
+    reports.create_index([("user_id", ASCENDING), ("updated_at", ASCENDING)])
+    reports.create_index([("assigned_worker_id", ASCENDING), ("updated_at", ASCENDING)])
+    reports.create_index([("previous_worker_ids", ASCENDING), ("updated_at", ASCENDING)])
 
     validations.create_index([("id", ASCENDING)], unique=True)
     validations.create_index([("user_id", ASCENDING)])
     validations.create_index([("report_id", ASCENDING)])
     validations.create_index([("report_id", ASCENDING), ("user_id", ASCENDING)], unique=True)
 
+    db["clusters"].create_index([("district_key", ASCENDING)])
+    db["clusters"].create_index([("latitude", ASCENDING), ("longitude", ASCENDING)])
+
+    # Hotspot rollup buckets: scored by granularity/start window; hourly and stale daily buckets expire.
+    db["cluster_buckets"].create_index([("g", ASCENDING), ("start", ASCENDING)])
+    db["cluster_buckets"].create_index([("district_key", ASCENDING), ("g", ASCENDING), ("start", ASCENDING)])
+    db["cluster_buckets"].create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+    db["worker_positions"].create_index(
+        [("location", GEOSPHERE), ("district_key", ASCENDING), ("updated_at", ASCENDING)]
+    )
+    _ensure_worker_tracks(db)
+
+    # Stored responses for Idempotency-Key retries expire on their own.
+    db["idempotency_keys"].create_index(
+        [("created_at", ASCENDING)],
+        expireAfterSeconds=_mongo_int_env("IDEMPOTENCY_TTL_SEC", 24 * 60 * 60),
+    )
+
+
+def _ensure_worker_tracks(db: Database) -> None:
+    """Create the `worker_tracks` time-series collection (a plain indexed one on MongoDB < 5.0)."""
+    ttl = _mongo_int_env("WORKER_TRACK_TTL_DAYS", 30) * 24 * 60 * 60
+    if "worker_tracks" not in db.list_collection_names(filter={"name": "worker_tracks"}):
+        try:
+            db.create_collection(
+                "worker_tracks",
+                timeseries={"timeField": "ts", "metaField": "worker_id", "granularity": "seconds"},
+                expireAfterSeconds=ttl,
+            )
+            return
+        except CollectionInvalid:
+            return  # created concurrently
+        except OperationFailure:
+            pass
+    options = db["worker_tracks"].options()
+    if "timeseries" not in options:
+        db["worker_tracks"].create_index([("worker_id", ASCENDING), ("ts", DESCENDING)])
+        db["worker_tracks"].create_index([("ts", ASCENDING)], expireAfterSeconds=ttl)
@@ -9,6 +9,7 @@ from pymongo.errors import PyMongoError
 from backend.app.auth import create_access_token, hash_password, verify_password
 from backend.app.database import get_db, get_next_id
 from backend.app.schemas import LoginIn, RegisterIn, TokenOut, UserOut
+from backend.app.services.districts import district_key
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -37,6 +38,7 @@ def register(payload: RegisterIn, db: Database = Depends(get_db)):
             "role": role,
             "phone": str(payload.phone).strip() or None,
             "district": _normalize_district(payload.district) or None,
+            "district_key": district_key(payload.district),
             "state": str(payload.state).strip() or None,
             "city": str(payload.city).strip() or None,
             "is_available": True,
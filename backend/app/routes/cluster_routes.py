@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-from typing import Annotated
+from typing import Annotated, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from pymongo.database import Database
 
 from backend.app.auth import get_current_user
 from backend.app.database import get_db
 from backend.app.schemas import ClusterOut
-from backend.app.services.cluster_service import get_clusters
+from backend.app.services import cluster_cache, hotspot_scores
+from backend.app.services.cluster_service import get_clusters, get_clusters_in_view, level_for_zoom
 
 router = APIRouter(prefix="/clusters", tags=["clusters"])
 
@@ -17,9 +18,48 @@ router = APIRouter(prefix="/clusters", tags=["clusters"])
 def clusters(
     user: Annotated[dict, Depends(get_current_user)],
     db: Annotated[Database, Depends(get_db)],
+    response: Response,
+    bbox: Optional[str] = Query(default=None, description="west,south,east,north in degrees"),
+    zoom: int = Query(default=18, ge=0, le=22),
+    sort: Literal["priority", "hotspot"] = Query(default="priority"),
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
+    district = None
     if user.get("role") == "supervisor":
         if not user.get("district"):
             return []
-        return get_clusters(db, district=user.get("district"))
-    return get_clusters(db)
+        district = user.get("district")
+
+    view = parse_bbox(bbox) if bbox is not None else None
+    # Hotspot scores decay hourly, so the scoring hour is part of the cache key and ETag.
+    now = hotspot_scores.score_time()
+    params = (view, level_for_zoom(zoom) if view is not None else None, sort, now.isoformat())
+
+    # Writes bump the district's version, so a matching ETag or cache entry is never stale.
+    scope = cluster_cache.scope_for(district)
+    version = cluster_cache.current_version(db, scope)
+    tag = cluster_cache.etag(scope, version, params)
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+    if if_none_match and tag in {t.strip() for t in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    if view is None:
+        return cluster_cache.get_or_compute(
+            (scope, params), version, lambda: get_clusters(db, district=district, sort=sort, now=now)
+        )
+    return cluster_cache.get_or_compute(
+        (scope, params),
+        version,
+        lambda: get_clusters_in_view(db, bbox=view, zoom=zoom, district=district, sort=sort, now=now),
+    )
+
+
+def parse_bbox(value: str) -> tuple[float, float, float, float]:
+    try:
+        west, south, east, north = (float(p) for p in value.split(","))
+    except Exception:
+        raise HTTPException(status_code=400, detail="bbox must be west,south,east,north")
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        raise HTTPException(status_code=400, detail="bbox out of range")
+    return west, south, east, north
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+from typing import Annotated, Iterable, Iterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pymongo.database import Database
+
+from backend.app.auth import get_current_user
+from backend.app.database import get_db
+from backend.app.routes.cluster_routes import parse_bbox
+from backend.app.services.cluster_service import (
+    CLUSTERS_COLLECTION,
+    SEVERITY_BY_WEIGHT,
+    SEVERITY_WEIGHT,
+    bbox_match,
+    cluster_layer_pipeline,
+)
+from backend.app.services.districts import district_key
+
+router = APIRouter(prefix="/map", tags=["map"])
+
+LAYERS = ("clusters", "reports")
+# Columnar output encodes severity as an index into this list.
+SEVERITIES = list(SEVERITY_WEIGHT)
+# Points per columnar chunk; bounds memory while streaming.
+CHUNK_SIZE = 1000
+
+# Only the fields the map draws (marker position, colour and popup).
+_REPORT_FIELDS = {"_id": 0, "id": 1, "latitude": 1, "longitude": 1, "severity": 1, "status": 1}
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _cluster_points(db: Database, *, district: Optional[str], bbox) -> Iterator[dict]:
+    for row in db[CLUSTERS_COLLECTION].aggregate(cluster_layer_pipeline(district=district, bbox=bbox)):
+        yield {
+            "id": str(row["cluster_id"]),
+            "latitude": float(row["latitude"]),
+            "longitude": float(row["longitude"]),
+            "severity": SEVERITY_BY_WEIGHT.get(int(row["weight"]), "Low"),
+            "report_count": int(row["report_count"]),
+            "priority": int(row["priority"]),
+        }
+
+
+def _report_points(db: Database, *, district: Optional[str], bbox) -> Iterator[dict]:
+    query = bbox_match(bbox) if bbox is not None else {}
+    if district:
+        query["district_key"] = district_key(district)
+    for r in db["reports"].find(query, _REPORT_FIELDS).batch_size(CHUNK_SIZE):
+        yield {
+            "id": int(r.get("id", 0)),
+            "latitude": float(r.get("latitude", 0.0)),
+            "longitude": float(r.get("longitude", 0.0)),
+            "severity": str(r.get("severity") or "Low"),
+            "status": str(r.get("status") or "submitted"),
+        }
+
+
+def _geojson(layers: Iterable[tuple[str, Iterator[dict]]]) -> Iterator[str]:
+    yield '{"type":"FeatureCollection","features":['
+    sep = ""
+    for layer, points in layers:
+        for p in points:
+            lat, lon = p.pop("latitude"), p.pop("longitude")
+            feature = {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {"layer": layer, **p},
+            }
+            yield sep + _dumps(feature)
+            sep = ","
+    yield "]}"
+
+
+def _columnar(layers: Iterable[tuple[str, Iterator[dict]]]) -> Iterator[str]:
+    """NDJSON: a header line, then per-layer chunks of parallel arrays (`lat`, `lon`, `severity`, ...)."""
+    yield _dumps({"format": "columnar", "severity": SEVERITIES}) + "\n"
+    severity_index = {name: i for i, name in enumerate(SEVERITIES)}
+    for layer, points in layers:
+        chunk: dict[str, list] = {}
+        count = 0
+        for p in points:
+            p["severity"] = severity_index.get(p["severity"], 0)
+            p["lat"], p["lon"] = p.pop("latitude"), p.pop("longitude")
+            for field, value in p.items():
+                chunk.setdefault(field, []).append(value)
+            count += 1
+            if count == CHUNK_SIZE:
+                yield _dumps({"layer": layer, **chunk}) + "\n"
+                chunk, count = {}, 0
+        if count:
+            yield _dumps({"layer": layer, **chunk}) + "\n"
+
+
+@router.get("/layers")
+def map_layers(
+    user: Annotated[dict, Depends(get_current_user)],
+    db: Annotated[Database, Depends(get_db)],
+    layers: str = Query(default="clusters", description="comma-separated: clusters,reports"),
+    format: Literal["geojson", "columnar"] = Query(default="geojson"),
+    bbox: Optional[str] = Query(default=None, description="west,south,east,north in degrees"),
+):
+    """Stream map points straight from MongoDB cursors as GeoJSON or columnar NDJSON.
+
+    Clusters come from the materialized cluster rows; the reports layer is
+    limited to supervisors and scoped to their district.
+    """
+
+    wanted = [name.strip() for name in layers.split(",") if name.strip()]
+    unknown = [name for name in wanted if name not in LAYERS]
+    if unknown or not wanted:
+        raise HTTPException(status_code=400, detail=f"layers must be a subset of {','.join(LAYERS)}")
+
+    district = None
+    if user.get("role") == "supervisor":
+        if not user.get("district"):
+            raise HTTPException(status_code=400, detail="Supervisor district not set")
+        district = str(user.get("district"))
+    elif "reports" in wanted:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    view = parse_bbox(bbox) if bbox is not None else None
+    sources = {
+        "clusters": lambda: _cluster_points(db, district=district, bbox=view),
+        "reports": lambda: _report_points(db, district=district, bbox=view),
+    }
+    streams = ((name, sources[name]()) for name in wanted)
+
+    if format == "columnar":
+        return StreamingResponse(_columnar(streams), media_type="application/x-ndjson")
+    return StreamingResponse(_geojson(streams), media_type="application/geo+json")
@@ -4,26 +4,50 @@ import base64
 import datetime as dt
 import os
 import mimetypes
-import re
+import threading
 import uuid
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Callable, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pymongo import DESCENDING
+import anyio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from pymongo import DESCENDING, UpdateOne
 from pymongo.database import Database
+from pymongo.errors import BulkWriteError
 
 from backend.app.auth import get_current_user, require_role
-from backend.app.database import get_db, get_next_id
+from backend.app.database import get_db, get_next_id, get_next_ids
 from backend.app.schemas import (
     ReportAssignIn,
+    ReportAutoAssignIn,
+    ReportAutoAssignItemOut,
+    ReportAutoAssignOut,
+    ReportBatchIn,
+    ReportBatchItemIn,
+    ReportBatchItemOut,
+    ReportBatchOut,
     ReportCompleteIn,
+    ReportCompleteMetaIn,
     ReportCreateIn,
+    ReportCreateMetaIn,
+    ReportDeltaOut,
     ReportOut,
     ReportVerifyIn,
 )
-from backend.app.services.cluster_service import compute_cluster_id
-from backend.app.services.geotag_service import annotate_report_image
+from backend.app.services.cluster_service import (
+    compute_cell_ids,
+    compute_cluster_id,
+    record_report,
+    record_reports,
+    record_status_change,
+    record_status_changes,
+)
+from backend.app.services import assignment, idempotency, location_buffer, media_pipeline, pagination, report_sync
+from backend.app.services.districts import district_key
+from backend.app.services.geo import geo_point, haversine_matrix
+from backend.app.services.geotag_service import annotate_report_image, make_image_derivatives
 from backend.app.services.qr_service import generate_qr_for_report
 from backend.app.services.supabase_storage import upload_file
 
@@ -32,6 +56,7 @@ router = APIRouter(prefix="/reports", tags=["reports"])
 STATIC_DIR = Path(__file__).resolve().parents[2] / "static"
 IMAGES_DIR = STATIC_DIR / "images"
 MAX_IMAGE_BYTES = 2 * 1024 * 1024
+UPLOAD_CONTENT_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/webp", "application/octet-stream"}
 try:
     MAX_REPORT_LOCATION_ACCURACY_M = int(os.getenv("MAX_REPORT_LOCATION_ACCURACY_M", os.getenv("MAX_LOCATION_ACCURACY_M", "300")))
 except Exception:
@@ -45,16 +70,8 @@ except Exception:
     MAX_WORKER_COMPLETION_ACCURACY_M = 800
 
 
-def _district_regex(value: str):
-    cleaned = " ".join(str(value or "").strip().split())
-    escaped = re.escape(cleaned).replace(r"\ ", r"\s+")
-    return re.compile(rf"^\s*{escaped}\s*$", re.IGNORECASE)
-
-
 def _same_district(a: str | None, b: str | None) -> bool:
-    na = " ".join(str(a or "").strip().split()).lower()
-    nb = " ".join(str(b or "").strip().split()).lower()
-    return na == nb
+    return district_key(a) == district_key(b)
 
 
 def _normalize_district(value: str) -> str:
@@ -91,6 +108,162 @@ def _decode_data_url(data_url_or_b64: str) -> bytes:
         raise HTTPException(status_code=400, detail="Invalid base64 image")
 
 
+async def _stream_image_to_disk(request: Request, target: Path) -> int:
+    """Write a raw image request body to `target` chunk by chunk.
+
+    Rejects the upload as soon as it exceeds MAX_IMAGE_BYTES (checking the
+    declared Content-Length first), so oversized photos never sit in memory.
+    File operations run in the threadpool so a slow disk never blocks the event loop.
+    """
+
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if content_type not in UPLOAD_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail="Unsupported image content type")
+
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > MAX_IMAGE_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large (max 2MB)")
+
+    await run_in_threadpool(IMAGES_DIR.mkdir, parents=True, exist_ok=True)
+    partial = target.with_name(target.name + ".part")
+    size = 0
+    try:
+        fh = await run_in_threadpool(partial.open, "wb")
+        try:
+            async for chunk in request.stream():
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > MAX_IMAGE_BYTES:
+                    raise HTTPException(status_code=413, detail="Image too large (max 2MB)")
+                await run_in_threadpool(fh.write, chunk)
+        finally:
+            # Shielded so a cancelled upload still closes and removes its partial file.
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(fh.close)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty image")
+        await run_in_threadpool(partial.replace, target)
+    except BaseException:
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(partial.unlink, missing_ok=True)
+        raise
+    return size
+
+
+def _query_model(model, request: Request):
+    try:
+        return model.model_validate(dict(request.query_params))
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False))
+
+
+def _report_meta_from_query(request: Request) -> ReportCreateMetaIn:
+    return _query_model(ReportCreateMetaIn, request)
+
+
+def _completion_meta_from_query(request: Request) -> ReportCompleteMetaIn:
+    return _query_model(ReportCompleteMetaIn, request)
+
+
+IdempotencyKey = Annotated[Optional[str], Header(alias="Idempotency-Key", max_length=200)]
+
+
+def _idempotency_claim(db: Database, user: dict, scope: str, key: str | None) -> ReportOut | None:
+    """Return the stored response for a replayed key, or None if this request should run."""
+    if not key:
+        return None
+    existing = idempotency.claim(db, key=key, user_id=int(user["id"]), scope=scope)
+    if existing is None:
+        return None
+    if existing.get("response") is None:
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+    return ReportOut.model_validate(existing["response"])
+
+
+def _idempotency_finish(db: Database, user: dict, scope: str, key: str | None, out: ReportOut | None) -> None:
+    if not key:
+        return
+    if out is None:
+        idempotency.release(db, key=key, user_id=int(user["id"]), scope=scope)
+    else:
+        idempotency.store(db, key=key, user_id=int(user["id"]), scope=scope, response=out.model_dump())
+
+
+def _idempotent(db: Database, user: dict, scope: str, key: str | None, fn: Callable[[], ReportOut]) -> ReportOut:
+    replay = _idempotency_claim(db, user, scope, key)
+    if replay is not None:
+        return replay
+    try:
+        out = fn()
+    except BaseException:
+        _idempotency_finish(db, user, scope, key, None)
+        raise
+    _idempotency_finish(db, user, scope, key, out)
+    return out
+
+
+def _assigned_workers(db: Database, reports: list[dict]) -> dict[int, dict]:
+    """Worker details for every `assigned_worker_id` in `reports`, fetched with a single `$in`."""
+    ids = sorted({int(r["assigned_worker_id"]) for r in reports if r.get("assigned_worker_id")})
+    if not ids:
+        return {}
+    return {
+        int(w["id"]): w
+        for w in db["users"].find({"id": {"$in": ids}}, {"_id": 0, "id": 1, "name": 1, "phone": 1, "district": 1})
+    }
+
+
+def _report_page(
+    db: Database, response: Response, query: dict, field: str, limit: int, cursor: str | None
+) -> list[dict]:
+    """Rows of one list page; the next page's cursor goes out in the X-Next-Cursor header.
+
+    `limit=0` (every row) is a temporary opt-out for clients that do not follow cursors yet.
+
+    The first page (no cursor) also carries X-Report-Seq, the server time read before it, which is
+    the `since` for the next delta sync; later pages skip that extra round trip.
+    """
+    if not cursor:
+        response.headers["X-Report-Seq"] = str(report_sync.server_seq(db))
+    try:
+        rows, next_cursor = pagination.page(db["reports"], query, field, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+
+def _reports_out(db: Database, rows: list[dict]) -> list[ReportOut]:
+    # Attach worker details when assigned, resolved with one query for the whole page.
+    workers = _assigned_workers(db, rows)
+    out: list[ReportOut] = []
+    for r in rows:
+        assigned_worker = None
+        if r.get("assigned_worker_id"):
+            assigned_worker = workers.get(int(r["assigned_worker_id"]))
+        out.append(_to_report_out(r, assigned_worker=assigned_worker))
+    return out
+
+
+def _report_delta(
+    db: Database,
+    scope: dict,
+    since: int,
+    listed: Callable[[dict], bool],
+    render: Callable[[list[dict]], list[ReportOut]],
+) -> ReportDeltaOut:
+    """Rows of `scope` changed after `since`; those failing `listed` are returned as removals.
+
+    `render` serializes the kept rows exactly like the endpoint's full list does.
+    """
+    seq = report_sync.server_seq(db)
+    rows = report_sync.changes(db["reports"], scope, since)
+    kept = [r for r in rows if listed(r)]
+    return ReportDeltaOut(seq=seq, reports=render(kept), removed_ids=[int(r["id"]) for r in rows if not listed(r)])
+
+
 def _to_report_out(report: dict, assigned_worker: dict | None = None) -> ReportOut:
     worker_out = None
     if assigned_worker is not None:
@@ -101,13 +274,14 @@ def _to_report_out(report: dict, assigned_worker: dict | None = None) -> ReportO
             "district": assigned_worker.get("district"),
         }
 
+    image_url = str(report.get("image_url") or f"/static/{report.get('image_path','')}")
     return ReportOut(
         id=int(report.get("id", 0)),
         user_id=int(report.get("user_id", 0)),
         latitude=float(report.get("latitude", 0.0)),
         longitude=float(report.get("longitude", 0.0)),
         location_accuracy=float(report.get("location_accuracy", 0.0)),
-        image_url=str(report.get("image_url") or f"/static/{report.get('image_path','')}"),
+        image_url=image_url,
         description=str(report.get("description") or ""),
         contact_phone=str(report.get("contact_phone") or ""),
         district=str(report.get("district") or ""),
@@ -117,6 +291,8 @@ def _to_report_out(report: dict, assigned_worker: dict | None = None) -> ReportO
         status=report.get("status", "submitted"),
         cluster_id=str(report.get("cluster_id") or ""),
         qr_url=str(report.get("qr_url") or (f"/static/{report.get('qr_path','')}" if report.get("qr_path") else "")),
+        thumbnail_url=str(report.get("thumbnail_url") or image_url),
+        medium_url=str(report.get("medium_url") or image_url),
         assigned_worker=worker_out,
         expected_completion_at=report.get("expected_completion_at"),
         completion_image_url=str(
@@ -126,52 +302,141 @@ def _to_report_out(report: dict, assigned_worker: dict | None = None) -> ReportO
         completed_at=report.get("completed_at"),
         completion_verified_at=report.get("completion_verified_at"),
         resolution_message=str(report.get("resolution_message") or ""),
+        agree_count=int(report.get("agree_count") or 0),
+        disagree_count=int(report.get("disagree_count") or 0),
+        media_status=report.get("media_status") or "ready",
         created_at=report.get("created_at") or dt.datetime.utcnow(),
     )
 
 
-@router.post("", response_model=ReportOut)
-def create_report(
-    payload: ReportCreateIn,
-    user: Annotated[dict, Depends(require_role("user", "supervisor"))],
-    db: Database = Depends(get_db),
-):
-    if payload.accuracy > MAX_REPORT_LOCATION_ACCURACY_M:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Location accuracy too low (>{MAX_REPORT_LOCATION_ACCURACY_M}m)",
+def _process_report_media(
+    *,
+    db: Database,
+    report_id: int,
+    image_file: Path,
+    report_image_url: str,
+    latitude: float,
+    longitude: float,
+    accuracy_m: float,
+    created_at: dt.datetime,
+    reported_timestamp: int | None,
+) -> None:
+    """Background step of report submission: QR, geotag footer, uploads.
+
+    The report is already persisted with `media_status: pending` and local URLs;
+    this fills in `qr_path`/`qr_url`/`image_path`/`image_url` with a single
+    update when done. The job is idempotent: the raw upload is never modified
+    (the annotated copy goes to its own file), every output is replaced
+    atomically, and a report that is no longer pending is skipped, so a job
+    re-queued by the sweep while the original still runs is harmless.
+    """
+
+    # Refresh the claim so the sweep leaves a job alone while it runs.
+    claimed = db["reports"].find_one_and_update(
+        {"id": report_id, "media_status": "pending"},
+        {"$set": {"media_queued_at": dt.datetime.utcnow()}},
+        {"_id": 1},
+    )
+    if claimed is None:
+        return
+
+    try:
+        with media_pipeline.stage("qr"):
+            qr_rel_path = generate_qr_for_report(report_id=report_id, latitude=latitude, longitude=longitude)
+    except Exception:
+        db["reports"].update_one({"id": report_id}, {"$set": {"media_status": "failed"}, **report_sync.STAMP})
+        raise
+    qr_file = STATIC_DIR / qr_rel_path
+
+    # Annotate a copy of the saved image with an auto geotag footer for supervisor review.
+    # Best-effort: if annotation fails, the raw upload is served instead.
+    annotated_file = image_file.with_name(f"{image_file.stem}_geotag.jpg")
+    try:
+        with media_pipeline.stage("annotate"):
+            annotate_report_image(
+                image_file=image_file,
+                output_file=annotated_file,
+                qr_file=qr_file,
+                latitude=latitude,
+                longitude=longitude,
+                accuracy_m=accuracy_m,
+                created_at=created_at,
+                reported_timestamp=reported_timestamp,
+            )
+        image_file = annotated_file
+        report_image_url = f"/static/images/{annotated_file.name}"
+    except Exception:
+        pass
+
+    # List views use the small renditions; the annotated original stays the source of truth.
+    derivatives: dict[str, tuple[Path, str]] = {}
+    try:
+        with media_pipeline.stage("derivatives"):
+            derivatives = make_image_derivatives(image_file)
+    except Exception:
+        pass
+
+    with media_pipeline.stage("upload_image"):
+        image_url = _store_media(
+            local_file=image_file,
+            object_path=f"reports/{report_id}/report.jpg",
+            local_url=report_image_url,
+            default_content_type="image/jpeg",
+        )
+    with media_pipeline.stage("upload_qr"):
+        qr_url = _store_media(
+            local_file=qr_file,
+            object_path=f"reports/{report_id}/qr.png",
+            local_url=f"/static/{qr_rel_path}",
+            default_content_type="image/png",
         )
 
-    image_bytes = _decode_data_url(payload.image_base64)
-    if len(image_bytes) > MAX_IMAGE_BYTES:
-        raise HTTPException(status_code=413, detail="Image too large (max 2MB)")
+    updates = {
+        "qr_path": qr_rel_path,
+        "image_path": f"images/{image_file.name}",
+        "image_url": image_url,
+        "qr_url": qr_url,
+        "media_status": "ready",
+    }
+    with media_pipeline.stage("upload_derivatives"):
+        for name, (path, content_type) in derivatives.items():
+            updates[f"{name}_path"] = f"images/{path.name}"
+            updates[f"{name}_url"] = _store_media(
+                local_file=path,
+                object_path=f"reports/{report_id}/{name}{path.suffix}",
+                local_url=f"/static/images/{path.name}",
+                default_content_type=content_type,
+            )
 
-    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
-    filename = f"{uuid.uuid4().hex}.jpg"
-    file_path = IMAGES_DIR / filename
-    file_path.write_bytes(image_bytes)
+    db["reports"].update_one({"id": report_id}, {"$set": updates, **report_sync.STAMP})
 
-    cluster_id = compute_cluster_id(payload.latitude, payload.longitude)
 
-    report_id = get_next_id(db, "reports")
-    created_at = dt.datetime.utcnow()
+def _check_report_accuracy(accuracy: float) -> None:
+    if accuracy > MAX_REPORT_LOCATION_ACCURACY_M:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Location accuracy too low (>{MAX_REPORT_LOCATION_ACCURACY_M}m)",
+        )
 
-    report_image_object = f"reports/{report_id}/report.jpg"
-    report_image_url = f"/static/images/{filename}"
 
-    report = {
+def _build_report_doc(
+    *, report_id: int, user: dict, meta: ReportCreateMetaIn, filename: str, created_at: dt.datetime
+) -> dict:
+    return {
         "id": report_id,
         "user_id": int(user["id"]),
-        "latitude": float(payload.latitude),
-        "longitude": float(payload.longitude),
-        "location_accuracy": float(payload.accuracy),
+        "latitude": float(meta.latitude),
+        "longitude": float(meta.longitude),
+        "location": geo_point(meta.latitude, meta.longitude),
+        "location_accuracy": float(meta.accuracy),
         "image_path": f"images/{filename}",
-        "image_url": report_image_url,
-        "description": payload.description,
-        "contact_phone": payload.contact_phone.strip(),
-        "district": _normalize_district(payload.district),
-        "state": (payload.state or "").strip(),
-        "city": (payload.city or "").strip(),
+        "image_url": f"/static/images/{filename}",
+        "description": meta.description,
+        "contact_phone": meta.contact_phone.strip(),
+        "district": _normalize_district(meta.district),
+        "district_key": district_key(meta.district),
+        "state": (meta.state or "").strip(),
+        "city": (meta.city or "").strip(),
         "severity": "Low",
         "status": "submitted",
         "accepted_at": None,
@@ -187,53 +452,270 @@ def create_report(
         "completion_verified_at": None,
         "completion_verified_by": None,
         "resolution_message": "",
-        "cluster_id": cluster_id,
+        "cluster_id": compute_cluster_id(meta.latitude, meta.longitude),
+        "cells": compute_cell_ids(meta.latitude, meta.longitude),
         "qr_path": "",
+        "agree_count": 0,
+        "disagree_count": 0,
+        "media_status": "pending",
+        # Queued right after the insert; see _queue_report_media.
+        "media_queued_at": created_at,
+        "reported_timestamp": meta.timestamp,
         "created_at": created_at,
     }
-    db["reports"].insert_one(report)
 
-    qr_rel_path = generate_qr_for_report(report_id=report_id, latitude=report["latitude"], longitude=report["longitude"])
-    report["qr_path"] = qr_rel_path
-    db["reports"].update_one({"id": report_id}, {"$set": {"qr_path": qr_rel_path}})
 
-    # Annotate the saved image with an auto geotag footer for supervisor review.
-    # Best-effort: if reverse geocoding is unavailable, still keep the report.
+# Report ids whose media job is queued or running in this process; their
+# `media_queued_at` claim is renewed on every sweep (see requeue_stale_media).
+_media_inflight: set[int] = set()
+_media_inflight_lock = threading.Lock()
+
+
+def _run_report_media(**kwargs) -> None:
     try:
-        annotate_report_image(
-            image_file=file_path,
-            qr_file=STATIC_DIR / qr_rel_path,
-            latitude=report["latitude"],
-            longitude=report["longitude"],
-            accuracy_m=report["location_accuracy"],
-            created_at=created_at,
-            reported_timestamp=payload.timestamp,
-        )
+        _process_report_media(**kwargs)
+    finally:
+        with _media_inflight_lock:
+            _media_inflight.discard(kwargs["report_id"])
+
+
+def _queue_report_media(db: Database, report: dict, reported_timestamp: int | None) -> None:
+    """Queue the media job of `report` and hold its claim while it is in this process.
+
+    `media_queued_at` is stamped by the insert (new reports) or by the sweep's
+    claim (re-queued ones); from then on this process renews it on every sweep
+    until the job finishes, so a job waiting behind a long backlog never looks
+    stale to another process.
+    """
+
+    with _media_inflight_lock:
+        _media_inflight.add(int(report["id"]))
+    media_pipeline.submit(
+        _run_report_media,
+        db=db,
+        report_id=int(report["id"]),
+        image_file=STATIC_DIR / report["image_path"],
+        report_image_url=report["image_url"],
+        latitude=report["latitude"],
+        longitude=report["longitude"],
+        accuracy_m=report["location_accuracy"],
+        created_at=report["created_at"],
+        reported_timestamp=reported_timestamp,
+    )
+
+
+def _media_stale_seconds() -> int:
+    try:
+        return max(60, int(os.getenv("MEDIA_STALE_SEC", "600")))
     except Exception:
-        pass
+        return 600
 
-    report["image_url"] = _store_media(
-        local_file=file_path,
-        object_path=report_image_object,
-        local_url=report_image_url,
-        default_content_type="image/jpeg",
-    )
-    qr_file = STATIC_DIR / qr_rel_path
-    report["qr_url"] = _store_media(
-        local_file=qr_file,
-        object_path=f"reports/{report_id}/qr.png",
-        local_url=f"/static/{qr_rel_path}",
-        default_content_type="image/png",
-    )
 
-    db["reports"].update_one(
-        {"id": report_id},
-        {"$set": {"image_url": report["image_url"], "qr_url": report["qr_url"]}},
-    )
+def _media_sweep_seconds() -> int:
+    # Claims are renewed once per sweep, so sweeps must come well within the stale window.
+    try:
+        sweep = int(os.getenv("MEDIA_SWEEP_SEC", "300"))
+    except Exception:
+        sweep = 300
+    return min(sweep, _media_stale_seconds() // 2)
+
+
+def requeue_stale_media(db: Database) -> int:
+    """Re-queue media jobs of reports still `pending` after MEDIA_STALE_SEC.
+
+    Such jobs were lost with the process that queued them (restart, deploy,
+    crash): every process renews the claims (`media_queued_at`) of the jobs it
+    still holds before looking for stale ones. Each report is claimed first,
+    so several processes sweeping at once queue it only once. Returns the
+    number queued.
+    """
+
+    now = dt.datetime.utcnow()
+    with _media_inflight_lock:
+        inflight = sorted(_media_inflight)
+    if inflight:
+        # Jobs still queued or running here are alive; renew their claims first.
+        db["reports"].update_many(
+            {"id": {"$in": inflight}, "media_status": "pending"}, {"$set": {"media_queued_at": now}}
+        )
+    cutoff = now - dt.timedelta(seconds=_media_stale_seconds())
+    stale = {
+        "media_status": "pending",
+        "$or": [
+            {"media_queued_at": {"$lt": cutoff}},
+            {"media_queued_at": {"$exists": False}, "created_at": {"$lt": cutoff}},
+        ],
+    }
+    queued = 0
+    while True:
+        report = db["reports"].find_one_and_update(stale, {"$set": {"media_queued_at": now}})
+        if report is None:
+            return queued
+        if not (STATIC_DIR / str(report.get("image_path") or "")).is_file():
+            # The upload never reached this disk; nothing left to process.
+            db["reports"].update_one({"id": report["id"]}, {"$set": {"media_status": "failed"}, **report_sync.STAMP})
+            continue
+        _queue_report_media(db, report, report.get("reported_timestamp"))
+        queued += 1
+
+
+def start_media_sweeper(db: Database) -> None:
+    media_pipeline.start_sweeper(lambda: requeue_stale_media(db), _media_sweep_seconds())
+
+
+def _save_base64_image(data_url_or_b64: str, prefix: str = "") -> str:
+    """Decode, size-check and write a base64 photo; returns its IMAGES_DIR filename."""
+    image_bytes = _decode_data_url(data_url_or_b64)
+    if len(image_bytes) > MAX_IMAGE_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large (max 2MB)")
 
+    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    filename = f"{prefix}{uuid.uuid4().hex}.jpg"
+    (IMAGES_DIR / filename).write_bytes(image_bytes)
+    return filename
+
+
+def _submit_report(*, db: Database, user: dict, meta: ReportCreateMetaIn, filename: str) -> ReportOut:
+    """Persist a report whose photo is already saved as IMAGES_DIR/filename."""
+    report = _build_report_doc(
+        report_id=get_next_id(db, "reports"),
+        user=user,
+        meta=meta,
+        filename=filename,
+        created_at=dt.datetime.utcnow(),
+    )
+    db["reports"].bulk_write([report_sync.insert_op(report)])
+    record_report(db, report)
+    _queue_report_media(db, report, meta.timestamp)
     return _to_report_out(report)
 
 
+@router.post("", response_model=ReportOut)
+def create_report(
+    payload: ReportCreateIn,
+    user: Annotated[dict, Depends(require_role("user", "supervisor"))],
+    db: Database = Depends(get_db),
+    idempotency_key: IdempotencyKey = None,
+):
+    def _run() -> ReportOut:
+        _check_report_accuracy(payload.accuracy)
+        filename = _save_base64_image(payload.image_base64)
+        return _submit_report(db=db, user=user, meta=payload, filename=filename)
+
+    return _idempotent(db, user, "reports:create", idempotency_key, _run)
+
+
+def _insert_batch(
+    db: Database,
+    user: dict,
+    items: dict[int, ReportBatchItemIn],
+    saved: list[tuple[int, str]],
+    results: list[ReportBatchItemOut],
+) -> None:
+    ids = get_next_ids(db, "reports", len(saved))
+    created_at = dt.datetime.utcnow()
+    docs = [
+        _build_report_doc(report_id=rid, user=user, meta=items[i], filename=filename, created_at=created_at)
+        for rid, (i, filename) in zip(ids, saved)
+    ]
+
+    failed: set[int] = set()
+    try:
+        db["reports"].bulk_write([report_sync.insert_op(doc) for doc in docs], ordered=False)
+    except BulkWriteError as exc:
+        failed = {int(err.get("index", -1)) for err in exc.details.get("writeErrors", [])}
+
+    record_reports(db, [report for pos, report in enumerate(docs) if pos not in failed])
+    for pos, ((i, filename), report) in enumerate(zip(saved, docs)):
+        if pos in failed:
+            results[i].error = "Could not save report"
+            (IMAGES_DIR / filename).unlink(missing_ok=True)
+            continue
+        _queue_report_media(db, report, items[i].timestamp)
+        results[i].ok = True
+        results[i].report = _to_report_out(report)
+
+
+@router.post("/batch", response_model=ReportBatchOut)
+def create_reports_batch(
+    payload: ReportBatchIn,
+    user: Annotated[dict, Depends(require_role("user", "supervisor"))],
+    db: Database = Depends(get_db),
+):
+    """Submit several offline-queued reports in one request.
+
+    Ids come from a single counter increment and the accepted reports are
+    written with one `bulk_write`. Each item gets its own result, so clients
+    only resend the ones that failed. An item's `idempotency_key` works like
+    the Idempotency-Key header of `POST /reports` (same scope): a resent item
+    gets its original result back instead of creating a second report.
+    """
+
+    results: list[ReportBatchItemOut] = [ReportBatchItemOut(index=i, ok=False) for i in range(len(payload.reports))]
+    items: dict[int, ReportBatchItemIn] = {}
+    claimed: dict[int, str] = {}
+    saved: list[tuple[int, str]] = []
+    try:
+        for i, raw in enumerate(payload.reports):
+            try:
+                item = items[i] = ReportBatchItemIn.model_validate(raw)
+            except ValidationError as exc:
+                results[i].error = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+                )
+                continue
+            try:
+                replay = _idempotency_claim(db, user, "reports:create", item.idempotency_key)
+            except HTTPException as exc:
+                results[i].error = str(exc.detail)
+                continue
+            if replay is not None:
+                results[i].ok = True
+                results[i].report = replay
+                continue
+            if item.idempotency_key:
+                claimed[i] = item.idempotency_key
+            try:
+                _check_report_accuracy(item.accuracy)
+                saved.append((i, _save_base64_image(item.image_base64)))
+            except HTTPException as exc:
+                results[i].error = str(exc.detail)
+
+        if saved:
+            _insert_batch(db, user, items, saved, results)
+    finally:
+        # Store finished items for replay; release the rest so a resend can run them.
+        for i, key in claimed.items():
+            _idempotency_finish(db, user, "reports:create", key, results[i].report if results[i].ok else None)
+
+    return ReportBatchOut(results=results)
+
+
+@router.post("/upload", response_model=ReportOut)
+async def create_report_upload(
+    request: Request,
+    meta: Annotated[ReportCreateMetaIn, Depends(_report_meta_from_query)],
+    user: Annotated[dict, Depends(require_role("user", "supervisor"))],
+    db: Database = Depends(get_db),
+    idempotency_key: IdempotencyKey = None,
+):
+    """Binary variant of `POST /reports`: raw image body, report fields as query params."""
+    scope = "reports:create"
+    replay = await run_in_threadpool(_idempotency_claim, db, user, scope, idempotency_key)
+    if replay is not None:
+        return replay
+
+    out = None
+    try:
+        _check_report_accuracy(meta.accuracy)
+        filename = f"{uuid.uuid4().hex}.jpg"
+        await _stream_image_to_disk(request, IMAGES_DIR / filename)
+        out = await run_in_threadpool(_submit_report, db=db, user=user, meta=meta, filename=filename)
+        return out
+    finally:
+        await run_in_threadpool(_idempotency_finish, db, user, scope, idempotency_key, out)
+
+
 @router.patch("/{report_id}/accept", response_model=ReportOut)
 def accept_report(
     report_id: int,
@@ -251,11 +733,14 @@ def accept_report(
         raise HTTPException(status_code=400, detail=f"Cannot accept report in status {report.get('status')}")
 
     now = dt.datetime.utcnow()
-    db["reports"].update_one(
-        {"id": report_id},
-        {"$set": {"status": "accepted", "accepted_at": now, "accepted_by": int(supervisor["id"])}} ,
-    )
-    report.update({"status": "accepted", "accepted_at": now, "accepted_by": int(supervisor["id"])})
+    updates = {
+        "status": "accepted",
+        "accepted_at": now,
+        "accepted_by": int(supervisor["id"]),
+    }
+    db["reports"].update_one({"id": report_id}, {"$set": updates, **report_sync.STAMP})
+    record_status_change(db, report, "accepted")
+    report.update(updates)
     return _to_report_out(report)
 
 
@@ -293,72 +778,209 @@ def assign_report(
     if expected is None and payload.eta_hours:
         expected = now + dt.timedelta(hours=int(payload.eta_hours))
 
-    upd = db["reports"].update_one(
-        {"id": report_id},
-        {
-            "$set": {
-                "assigned_worker_id": int(payload.worker_id),
-                "assigned_at": now,
-                "status": "assigned",
-                "expected_completion_at": expected,
-            }
-        },
-    )
+    updates = {
+        "assigned_worker_id": int(payload.worker_id),
+        "assigned_at": now,
+        "status": "assigned",
+        "expected_completion_at": expected,
+    }
+    change: dict = {"$set": updates, **report_sync.STAMP}
+    previous = report.get("assigned_worker_id")
+    if previous and int(previous) != int(payload.worker_id):
+        # Lets the previous worker's delta sync see the report leave their list.
+        change["$addToSet"] = {"previous_worker_ids": int(previous)}
+    upd = db["reports"].update_one({"id": report_id}, change)
     if upd.matched_count == 0:
         # Best-effort rollback
         db["users"].update_one({"id": int(payload.worker_id)}, {"$set": {"is_available": True}})
         raise HTTPException(status_code=404, detail="Report not found")
+    record_status_change(db, report, "assigned")
 
-    report.update(
-        {
-            "assigned_worker_id": int(payload.worker_id),
-            "assigned_at": now,
-            "status": "assigned",
-            "expected_completion_at": expected,
-        }
-    )
+    report.update(updates)
     worker = db["users"].find_one({"id": int(payload.worker_id)})
     return _to_report_out(report, assigned_worker=worker)
 
 
-@router.get("/assigned", response_model=list[ReportOut])
+def _auto_assign_budget_sec() -> float:
+    try:
+        return max(0.01, int(os.getenv("AUTO_ASSIGN_TIME_BUDGET_MS", "2000")) / 1000.0)
+    except Exception:
+        return 2.0
+
+
+@router.post("/auto-assign", response_model=ReportAutoAssignOut)
+def auto_assign_reports(
+    payload: ReportAutoAssignIn,
+    supervisor: Annotated[dict, Depends(require_role("supervisor"))],
+    db: Database = Depends(get_db),
+):
+    """Assign every accepted report of the district to the available workers at once.
+
+    Pairs minimize the total report-to-worker distance (Hungarian algorithm,
+    falling back to greedy for whatever is left when AUTO_ASSIGN_TIME_BUDGET_MS
+    runs out). Workers are reserved with the same `is_available` guard as
+    `assign_report`, but in one `bulk_write`, and the reports are updated
+    in another; pairs that lose a race are rolled back and reported as
+    unassigned.
+    """
+
+    if not supervisor.get("district"):
+        raise HTTPException(status_code=400, detail="Supervisor district not set")
+    key = district_key(supervisor.get("district"))
+
+    reports = list(
+        db["reports"].find({"district_key": key, "status": "accepted"}).sort("created_at", DESCENDING)
+    )
+    workers = list(db["users"].find({"role": "worker", "district_key": key, "is_available": True}))
+    positions = location_buffer.latest_positions(db, [int(w["id"]) for w in workers])
+    fresh_after = dt.datetime.utcnow() - dt.timedelta(seconds=payload.max_age_sec)
+    located: list[tuple[int, float, float]] = []
+    for w in workers:
+        p = positions.get(int(w["id"])) or {
+            "latitude": w.get("current_latitude"),
+            "longitude": w.get("current_longitude"),
+            "updated_at": w.get("location_updated_at"),
+        }
+        if p["latitude"] is not None and p["updated_at"] is not None and p["updated_at"] >= fresh_after:
+            located.append((int(w["id"]), float(p["latitude"]), float(p["longitude"])))
+
+    if not reports or not located:
+        return ReportAutoAssignOut(
+            assignments=[], unassigned_report_ids=[int(r["id"]) for r in reports], method="none"
+        )
+
+    dist = haversine_matrix(
+        [float(r.get("latitude", 0.0)) for r in reports],
+        [float(r.get("longitude", 0.0)) for r in reports],
+        [lat for _, lat, _ in located],
+        [lon for _, _, lon in located],
+    )
+    pairs, method = assignment.solve(dist, _auto_assign_budget_sec())
+
+    # Reserve the chosen workers; the batch tag tells ours apart from concurrent reservations.
+    batch = uuid.uuid4().hex
+    chosen = {int(reports[i]["id"]): (located[j][0], int(dist[i, j])) for i, j in pairs}
+    worker_ids = [wid for wid, _ in chosen.values()]
+    reserved_ops = [
+        UpdateOne(
+            {"id": wid, "role": "worker", "is_available": True},
+            {"$set": {"is_available": False, "auto_assign_batch": batch}},
+        )
+        for wid in worker_ids
+    ]
+    if db["users"].bulk_write(reserved_ops, ordered=False).modified_count < len(reserved_ops):
+        reserved = {
+            int(u["id"])
+            for u in db["users"].find({"id": {"$in": worker_ids}, "auto_assign_batch": batch}, {"id": 1})
+        }
+        chosen = {rid: pair for rid, pair in chosen.items() if pair[0] in reserved}
+
+    now = dt.datetime.utcnow()
+    expected = payload.expected_completion_at
+    if expected is None and payload.eta_hours:
+        expected = now + dt.timedelta(hours=int(payload.eta_hours))
+    assigned_fields = {"assigned_at": now, "status": "assigned", "expected_completion_at": expected}
+    report_ops = [
+        UpdateOne(
+            {"id": rid, "status": "accepted"},
+            {"$set": {"assigned_worker_id": wid, **assigned_fields}, **report_sync.STAMP},
+        )
+        for rid, (wid, _) in chosen.items()
+    ]
+    if report_ops and db["reports"].bulk_write(report_ops, ordered=False).modified_count < len(report_ops):
+        # Some reports changed status meanwhile; release their workers.
+        current = {
+            int(r["id"]): r.get("assigned_worker_id")
+            for r in db["reports"].find({"id": {"$in": list(chosen)}}, {"id": 1, "assigned_worker_id": 1})
+        }
+        lost = [rid for rid, (wid, _) in chosen.items() if current.get(rid) != wid]
+        db["users"].update_many(
+            {"id": {"$in": [chosen[rid][0] for rid in lost]}, "auto_assign_batch": batch},
+            {"$set": {"is_available": True}},
+        )
+        for rid in lost:
+            del chosen[rid]
+
+    assigned = [r for r in reports if int(r["id"]) in chosen]
+    for r in assigned:
+        r.update({"assigned_worker_id": chosen[int(r["id"])][0], **assigned_fields})
+    record_status_changes(db, assigned, "assigned")
+
+    return ReportAutoAssignOut(
+        assignments=[
+            ReportAutoAssignItemOut(report_id=rid, worker_id=wid, distance_m=distance_m)
+            for rid, (wid, distance_m) in chosen.items()
+        ],
+        unassigned_report_ids=[int(r["id"]) for r in reports if int(r["id"]) not in chosen],
+        method=method,
+    )
+
+
+def _worker_scope(worker: dict) -> dict:
+    """Reports a worker holds or held; the latter surface as removals in delta syncs."""
+    wid = int(worker["id"])
+    return {"$or": [{"assigned_worker_id": wid}, {"previous_worker_ids": wid}]}
+
+
+@router.get("/assigned", response_model=Union[list[ReportOut], ReportDeltaOut])
 def worker_assigned_reports(
     worker: Annotated[dict, Depends(require_role("worker"))],
+    response: Response,
     db: Database = Depends(get_db),
+    limit: Annotated[int, Query(ge=0, le=pagination.MAX_PAGE_SIZE)] = pagination.DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    since: Annotated[Optional[int], Query(ge=0)] = None,
 ):
-    cursor = (
-        db["reports"]
-        .find({"assigned_worker_id": int(worker["id"]), "status": {"$in": ["assigned", "completed"]}})
-        .sort("assigned_at", DESCENDING)
+    if since is not None:
+        return _report_delta(
+            db,
+            _worker_scope(worker),
+            since,
+            lambda r: r.get("assigned_worker_id") == int(worker["id"]) and r.get("status") in {"assigned", "completed"},
+            lambda rows: [_to_report_out(r, assigned_worker=worker) for r in rows],
+        )
+    rows = _report_page(
+        db,
+        response,
+        {"assigned_worker_id": int(worker["id"]), "status": {"$in": ["assigned", "completed"]}},
+        "assigned_at",
+        limit,
+        cursor,
     )
-    rows = list(cursor)
     return [_to_report_out(r, assigned_worker=worker) for r in rows]
 
 
-@router.get("/history", response_model=list[ReportOut])
+@router.get("/history", response_model=Union[list[ReportOut], ReportDeltaOut])
 def worker_history(
     worker: Annotated[dict, Depends(require_role("worker"))],
+    response: Response,
     db: Database = Depends(get_db),
+    limit: Annotated[int, Query(ge=0, le=pagination.MAX_PAGE_SIZE)] = pagination.DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    since: Annotated[Optional[int], Query(ge=0)] = None,
 ):
-    cursor = db["reports"].find({"assigned_worker_id": int(worker["id"]), "status": "closed"}).sort(
-        [
-            ("completion_verified_at", DESCENDING),
-            ("completed_at", DESCENDING),
-            ("assigned_at", DESCENDING),
-        ]
+    if since is not None:
+        return _report_delta(
+            db,
+            _worker_scope(worker),
+            since,
+            lambda r: r.get("assigned_worker_id") == int(worker["id"]) and r.get("status") == "closed",
+            lambda rows: [_to_report_out(r, assigned_worker=worker) for r in rows],
+        )
+    # Every closed report has completion_verified_at, so it alone (with id) orders the history.
+    rows = _report_page(
+        db,
+        response,
+        {"assigned_worker_id": int(worker["id"]), "status": "closed"},
+        "completion_verified_at",
+        limit,
+        cursor,
     )
-    rows = list(cursor)
     return [_to_report_out(r, assigned_worker=worker) for r in rows]
 
 
-@router.post("/{report_id}/complete", response_model=ReportOut)
-def complete_report(
-    report_id: int,
-    payload: ReportCompleteIn,
-    worker: Annotated[dict, Depends(require_role("worker"))],
-    db: Database = Depends(get_db),
-):
-    if payload.accuracy > MAX_WORKER_COMPLETION_ACCURACY_M:
+def _load_completable_report(db: Database, report_id: int, worker: dict, accuracy: float) -> dict:
+    if accuracy > MAX_WORKER_COMPLETION_ACCURACY_M:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Location accuracy too low (>{MAX_WORKER_COMPLETION_ACCURACY_M}m)",
@@ -371,18 +993,15 @@ def complete_report(
         raise HTTPException(status_code=403, detail="Not assigned to this report")
     if report.get("status") != "assigned":
         raise HTTPException(status_code=400, detail=f"Cannot complete report in status {report.get('status')}")
+    return report
 
-    image_bytes = _decode_data_url(payload.image_base64)
-    if len(image_bytes) > MAX_IMAGE_BYTES:
-        raise HTTPException(status_code=413, detail="Image too large (max 2MB)")
-
-    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
-    filename = f"completion_{uuid.uuid4().hex}.jpg"
-    completion_file = IMAGES_DIR / filename
-    completion_file.write_bytes(image_bytes)
 
+def _submit_completion(
+    *, db: Database, report: dict, worker: dict, meta: ReportCompleteMetaIn, filename: str
+) -> ReportOut:
+    report_id = int(report["id"])
     completion_url = _store_media(
-        local_file=completion_file,
+        local_file=IMAGES_DIR / filename,
         object_path=f"reports/{report_id}/completion.jpg",
         local_url=f"/static/images/{filename}",
         default_content_type="image/jpeg",
@@ -392,18 +1011,63 @@ def complete_report(
     updates = {
         "completion_image_path": f"images/{filename}",
         "completion_image_url": completion_url,
-        "completion_latitude": float(payload.latitude),
-        "completion_longitude": float(payload.longitude),
-        "completion_accuracy": float(payload.accuracy),
+        "completion_latitude": float(meta.latitude),
+        "completion_longitude": float(meta.longitude),
+        "completion_accuracy": float(meta.accuracy),
         "completed_at": now,
         "status": "completed",
     }
 
-    db["reports"].update_one({"id": report_id}, {"$set": updates})
+    db["reports"].update_one({"id": report_id}, {"$set": updates, **report_sync.STAMP})
+    record_status_change(db, report, "completed")
     report.update(updates)
     return _to_report_out(report, assigned_worker=worker)
 
 
+@router.post("/{report_id}/complete", response_model=ReportOut)
+def complete_report(
+    report_id: int,
+    payload: ReportCompleteIn,
+    worker: Annotated[dict, Depends(require_role("worker"))],
+    db: Database = Depends(get_db),
+    idempotency_key: IdempotencyKey = None,
+):
+    def _run() -> ReportOut:
+        report = _load_completable_report(db, report_id, worker, payload.accuracy)
+        filename = _save_base64_image(payload.image_base64, prefix="completion_")
+        return _submit_completion(db=db, report=report, worker=worker, meta=payload, filename=filename)
+
+    return _idempotent(db, worker, f"reports:{report_id}:complete", idempotency_key, _run)
+
+
+@router.post("/{report_id}/complete/upload", response_model=ReportOut)
+async def complete_report_upload(
+    report_id: int,
+    request: Request,
+    meta: Annotated[ReportCompleteMetaIn, Depends(_completion_meta_from_query)],
+    worker: Annotated[dict, Depends(require_role("worker"))],
+    db: Database = Depends(get_db),
+    idempotency_key: IdempotencyKey = None,
+):
+    """Binary variant of `POST /reports/{id}/complete`: raw image body, location as query params."""
+    scope = f"reports:{report_id}:complete"
+    replay = await run_in_threadpool(_idempotency_claim, db, worker, scope, idempotency_key)
+    if replay is not None:
+        return replay
+
+    out = None
+    try:
+        report = await run_in_threadpool(_load_completable_report, db, report_id, worker, meta.accuracy)
+        filename = f"completion_{uuid.uuid4().hex}.jpg"
+        await _stream_image_to_disk(request, IMAGES_DIR / filename)
+        out = await run_in_threadpool(
+            _submit_completion, db=db, report=report, worker=worker, meta=meta, filename=filename
+        )
+        return out
+    finally:
+        await run_in_threadpool(_idempotency_finish, db, worker, scope, idempotency_key, out)
+
+
 @router.patch("/{report_id}/verify", response_model=ReportOut)
 def verify_completion(
     report_id: int,
@@ -442,7 +1106,8 @@ def verify_completion(
             "resolution_message": payload.message.strip() or "Completion rejected. Please re-check and resubmit.",
         }
 
-    db["reports"].update_one({"id": report_id}, {"$set": updates})
+    db["reports"].update_one({"id": report_id}, {"$set": updates, **report_sync.STAMP})
+    record_status_change(db, report, updates["status"])
     report.update(updates)
     assigned_worker = None
     if report.get("assigned_worker_id"):
@@ -450,32 +1115,40 @@ def verify_completion(
     return _to_report_out(report, assigned_worker=assigned_worker)
 
 
-@router.get("/me", response_model=list[ReportOut])
+@router.get("/me", response_model=Union[list[ReportOut], ReportDeltaOut])
 def my_reports(
     user: Annotated[dict, Depends(get_current_user)],
+    response: Response,
     db: Database = Depends(get_db),
+    limit: Annotated[int, Query(ge=0, le=pagination.MAX_PAGE_SIZE)] = pagination.DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    since: Annotated[Optional[int], Query(ge=0)] = None,
 ):
-    cursor = db["reports"].find({"user_id": int(user["id"])}).sort("created_at", DESCENDING)
-    rows = list(cursor)
+    if since is not None:
+        # Citizens never see assigned worker details, in deltas or full lists.
+        return _report_delta(
+            db, {"user_id": int(user["id"])}, since, lambda r: True, lambda rows: [_to_report_out(r) for r in rows]
+        )
+    rows = _report_page(db, response, {"user_id": int(user["id"])}, "created_at", limit, cursor)
     return [_to_report_out(r) for r in rows]
 
 
-@router.get("", response_model=list[ReportOut])
+@router.get("", response_model=Union[list[ReportOut], ReportDeltaOut])
 def all_reports(
     supervisor: Annotated[dict, Depends(require_role("supervisor"))],
+    response: Response,
     db: Database = Depends(get_db),
+    limit: Annotated[int, Query(ge=0, le=pagination.MAX_PAGE_SIZE)] = pagination.DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    since: Annotated[Optional[int], Query(ge=0)] = None,
 ):
     if not supervisor.get("district"):
         raise HTTPException(status_code=400, detail="Supervisor district not set")
 
     district = str(supervisor.get("district") or "").strip()
-    cursor = db["reports"].find({"district": _district_regex(district)}).sort("created_at", DESCENDING)
-    rows = list(cursor)
-    # Attach worker details when assigned
-    out: list[ReportOut] = []
-    for r in rows:
-        assigned_worker = None
-        if r.get("assigned_worker_id"):
-            assigned_worker = db["users"].find_one({"id": int(r["assigned_worker_id"])})
-        out.append(_to_report_out(r, assigned_worker=assigned_worker))
-    return out
+    if since is not None:
+        return _report_delta(
+            db, {"district_key": district_key(district)}, since, lambda r: True, lambda rows: _reports_out(db, rows)
+        )
+    rows = _report_page(db, response, {"district_key": district_key(district)}, "created_at", limit, cursor)
+    return _reports_out(db, rows)
@@ -1,73 +1,127 @@
 from __future__ import annotations
 
 import datetime as dt
-import math
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from pymongo import DESCENDING
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pymongo.database import Database
 from pymongo.errors import DuplicateKeyError
 
 from backend.app.auth import get_current_user
 from backend.app.database import get_db, get_next_id
 from backend.app.schemas import ValidationCandidateOut, ValidationVoteIn
+from backend.app.services import report_index, report_sync
+from backend.app.services.cluster_service import record_vote
+from backend.app.services.geo import geo_point
 
 router = APIRouter(prefix="/validation", tags=["validation"])
 
-
-def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    # Approx Earth radius in meters
-    r = 6371000.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return r * c
+MAX_CANDIDATES = 20
 
 
 @router.get("/nearby", response_model=list[ValidationCandidateOut])
 def nearby_candidates(
-    lat: float,
-    lon: float,
+    lat: Annotated[float, Query(ge=-90, le=90)],
+    lon: Annotated[float, Query(ge=-180, le=180)],
     user: Annotated[dict, Depends(get_current_user)],
     db: Annotated[Database, Depends(get_db)],
-    radius_m: int = 3000,
+    radius_m: Annotated[int, Query(gt=0)] = 3000,
 ):
-    # Pull recent reports; filter by distance in Python to keep the query simple.
-    rows = list(
-        db["reports"]
-        .find({"status": {"$in": ["submitted", "accepted", "assigned"]}})
-        .sort("created_at", DESCENDING)
-        .limit(200)
-    )
+    """Closest open reports within `radius_m` that the caller did not file or vote on.
 
-    voted_report_ids = set(
-        int(v["report_id"]) for v in db["validations"].find({"user_id": int(user["id"])}, {"report_id": 1})
-    )
+    Served from the in-memory report index (see report_index); with
+    REPORT_INDEX_ENABLED=0 the `location` 2dsphere index is queried instead.
+    """
 
+    user_id = int(user["id"])
+    if not report_index.enabled():
+        return _nearby_from_db(db, lat=lat, lon=lon, radius_m=radius_m, user_id=user_id)
+
+    report_index.ensure_fresh(db)
+    hits = report_index.nearby(lat, lon, float(radius_m), exclude_user_id=user_id)
     out: list[ValidationCandidateOut] = []
-    for r in rows:
-        if int(r.get("user_id", 0)) == int(user["id"]):
-            continue
-        rid = int(r.get("id", 0))
-        if rid in voted_report_ids:
-            continue
-        if _haversine_m(lat, lon, float(r.get("latitude", 0.0)), float(r.get("longitude", 0.0))) <= float(radius_m):
+    # Check the caller's votes only for the nearest few candidates at a time.
+    step = MAX_CANDIDATES * 2
+    for start in range(0, len(hits), step):
+        chunk = hits[start : start + step]
+        voted = {
+            int(v["report_id"])
+            for v in db["validations"].find(
+                {"user_id": user_id, "report_id": {"$in": [h["id"] for h in chunk]}}, {"_id": 0, "report_id": 1}
+            )
+        }
+        for h in chunk:
+            if h["id"] in voted:
+                continue
             out.append(
                 ValidationCandidateOut(
-                    report_id=rid,
-                    latitude=float(r.get("latitude", 0.0)),
-                    longitude=float(r.get("longitude", 0.0)),
-                    district=str(r.get("district") or ""),
-                    description=str(r.get("description") or ""),
-                    severity=r.get("severity", "Low"),
-                    created_at=r.get("created_at"),
+                    report_id=h["id"],
+                    latitude=h["latitude"],
+                    longitude=h["longitude"],
+                    district=h["district"],
+                    description=h["description"],
+                    severity=h["severity"],
+                    created_at=h["created_at"],
                 )
             )
-    return out[:20]
+            if len(out) == MAX_CANDIDATES:
+                return out
+    return out
+
+
+def _nearby_from_db(db: Database, *, lat: float, lon: float, radius_m: int, user_id: int) -> list[ValidationCandidateOut]:
+    """Nearby candidates via $geoNear, dropping already-voted reports server-side with a $lookup."""
+    pipeline = [
+        {
+            "$geoNear": {
+                "near": geo_point(lat, lon),
+                "key": "location",
+                "distanceField": "distance_m",
+                "maxDistance": float(radius_m),
+                "spherical": True,
+                "query": {"status": {"$in": ["submitted", "accepted", "assigned"]}, "user_id": {"$ne": user_id}},
+            }
+        },
+        {
+            "$lookup": {
+                "from": "validations",
+                "let": {"rid": "$id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$and": [{"$eq": ["$report_id", "$$rid"]}, {"$eq": ["$user_id", user_id]}]}}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 1}},
+                ],
+                "as": "own_votes",
+            }
+        },
+        {"$match": {"own_votes": {"$size": 0}}},
+        {"$limit": MAX_CANDIDATES},
+        {
+            "$project": {
+                "_id": 0,
+                "id": 1,
+                "latitude": 1,
+                "longitude": 1,
+                "district": 1,
+                "description": 1,
+                "severity": 1,
+                "created_at": 1,
+            }
+        },
+    ]
+
+    return [
+        ValidationCandidateOut(
+            report_id=int(r.get("id", 0)),
+            latitude=float(r.get("latitude", 0.0)),
+            longitude=float(r.get("longitude", 0.0)),
+            district=str(r.get("district") or ""),
+            description=str(r.get("description") or ""),
+            severity=r.get("severity", "Low"),
+            created_at=r.get("created_at"),
+        )
+        for r in db["reports"].aggregate(pipeline)
+    ]
 
 
 @router.post("/{report_id}/vote")
@@ -94,5 +148,10 @@ def vote(
         db["validations"].insert_one(vdoc)
     except DuplicateKeyError:
         raise HTTPException(status_code=409, detail="Already voted")
+    db["reports"].update_one(
+        {"id": int(report_id)},
+        {"$inc": {"agree_count" if vdoc["vote"] == 1 else "disagree_count": 1}, **report_sync.STAMP},
+    )
+    record_vote(db, report, vdoc["vote"])
 
     return {"ok": True}
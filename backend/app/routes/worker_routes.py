@@ -1,18 +1,19 @@
 from __future__ import annotations
 
 import datetime as dt
-import math
 import os
-import re
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pymongo import ASCENDING
 from pymongo.database import Database
 
 from backend.app.auth import require_role
 from backend.app.database import get_db
 from backend.app.schemas import WorkerLocationIn, WorkerOut
+from backend.app.services import location_buffer
+from backend.app.services.districts import district_key
+from backend.app.services.geo import geo_point, haversine_many
 
 router = APIRouter(prefix="/workers", tags=["workers"])
 try:
@@ -23,29 +24,8 @@ except Exception:
     MAX_WORKER_LOCATION_ACCURACY_M = 800
 
 
-def _normalize_district(value: str | None) -> str:
-    return " ".join(str(value or "").strip().split()).lower()
-
-
 def _same_district(a: str | None, b: str | None) -> bool:
-    return _normalize_district(a) == _normalize_district(b)
-
-
-def _district_regex(value: str):
-    cleaned = " ".join(str(value or "").strip().split())
-    escaped = re.escape(cleaned).replace(r"\ ", r"\s+")
-    return re.compile(rf"^\s*{escaped}\s*$", re.IGNORECASE)
-
-
-def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    r = 6371000.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return r * c
+    return district_key(a) == district_key(b)
 
 
 @router.post("/location")
@@ -58,25 +38,16 @@ def update_my_location(
     if payload.accuracy > MAX_WORKER_LOCATION_ACCURACY_M:
         raise HTTPException(status_code=400, detail=f"Location accuracy too low (>{MAX_WORKER_LOCATION_ACCURACY_M}m)")
 
+    # Buffered and written in bulk every few seconds; see location_buffer.
     updated_at = dt.datetime.utcnow()
-    db["users"].update_one(
-        {"id": int(worker["id"]), "role": "worker"},
-        {
-            "$set": {
-                "current_latitude": float(payload.latitude),
-                "current_longitude": float(payload.longitude),
-                "current_accuracy": float(payload.accuracy),
-                "location_updated_at": updated_at,
-            }
-        },
-    )
-    worker.update(
-        {
-            "current_latitude": float(payload.latitude),
-            "current_longitude": float(payload.longitude),
-            "current_accuracy": float(payload.accuracy),
-            "location_updated_at": updated_at,
-        }
+    location_buffer.record(
+        db,
+        worker_id=int(worker["id"]),
+        district_key=district_key(worker.get("district")),
+        latitude=payload.latitude,
+        longitude=payload.longitude,
+        accuracy=payload.accuracy,
+        at=updated_at,
     )
     return {"ok": True, "location_updated_at": updated_at}
 
@@ -104,28 +75,40 @@ def list_workers(
 
     query: dict = {"role": "worker"}
     if district:
-        query["district"] = _district_regex(district)
+        query["district_key"] = district_key(district)
     if only_available:
         query["is_available"] = True
 
     workers = list(db["users"].find(query).sort("id", ASCENDING))
+    positions = location_buffer.latest_positions(db, [int(w.get("id", 0)) for w in workers])
+    for w in workers:
+        # Positions written before pings moved out of `users` remain the fallback.
+        p = positions.get(int(w.get("id", 0)))
+        if p is not None:
+            w["current_latitude"] = p["latitude"]
+            w["current_longitude"] = p["longitude"]
+            w["location_updated_at"] = p["updated_at"]
 
     now = dt.datetime.utcnow()
-    items: list[tuple[dict, Optional[int]]] = []
-    for w in workers:
-        dist_m: Optional[int] = None
-        if lat is not None and lon is not None:
-            if (
-                w.get("current_latitude") is not None
-                and w.get("current_longitude") is not None
-                and w.get("location_updated_at") is not None
-            ):
-                age = (now - w["location_updated_at"]).total_seconds()
-                if age <= float(max_age_sec):
-                    dist_m = int(
-                        _haversine_m(float(lat), float(lon), float(w["current_latitude"]), float(w["current_longitude"]))
-                    )
-        items.append((w, dist_m))
+    distances: dict[int, int] = {}
+    if lat is not None and lon is not None:
+        located = [
+            k
+            for k, w in enumerate(workers)
+            if w.get("current_latitude") is not None
+            and w.get("current_longitude") is not None
+            and w.get("location_updated_at") is not None
+            and (now - w["location_updated_at"]).total_seconds() <= float(max_age_sec)
+        ]
+        if located:
+            dist = haversine_many(
+                float(lat),
+                float(lon),
+                [float(workers[k]["current_latitude"]) for k in located],
+                [float(workers[k]["current_longitude"]) for k in located],
+            )
+            distances = dict(zip(located, dist.astype(int).tolist()))
+    items: list[tuple[dict, Optional[int]]] = [(w, distances.get(k)) for k, w in enumerate(workers)]
 
     # Sort by distance when applicable; unknown/stale locations go last.
     if lat is not None and lon is not None:
@@ -146,3 +129,75 @@ def list_workers(
         for (w, dist_m) in items
     ]
 
+
+@router.get("/nearest", response_model=list[WorkerOut])
+def nearest_workers(
+    report_id: int,
+    supervisor: Annotated[dict, Depends(require_role("supervisor"))],
+    db: Annotated[Database, Depends(get_db)],
+    k: Annotated[int, Query(ge=1, le=50)] = 5,
+    max_age_sec: int = 900,
+):
+    """The `k` closest available workers of the report's district with a fresh position.
+
+    One $geoNear over the indexed `worker_positions` (district and freshness
+    filtered in the index scan), with availability checked per candidate
+    against `users`; cost does not grow with the number of workers in the
+    district. Positions reach MongoDB within one location flush interval.
+    """
+
+    if not supervisor.get("district"):
+        raise HTTPException(status_code=400, detail="Supervisor district not set")
+    report = db["reports"].find_one({"id": report_id}, {"_id": 0, "district": 1, "latitude": 1, "longitude": 1})
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if not _same_district(report.get("district"), supervisor.get("district")):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    fresh_after = dt.datetime.utcnow() - dt.timedelta(seconds=max_age_sec)
+    pipeline = [
+        {
+            "$geoNear": {
+                "near": geo_point(float(report.get("latitude", 0.0)), float(report.get("longitude", 0.0))),
+                "key": "location",
+                "distanceField": "distance_m",
+                "spherical": True,
+                "query": {
+                    "district_key": district_key(supervisor.get("district")),
+                    "updated_at": {"$gte": fresh_after},
+                },
+            }
+        },
+        {
+            "$lookup": {
+                "from": "users",
+                "let": {"wid": "$_id"},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "$expr": {"$eq": ["$id", "$$wid"]},
+                            "role": "worker",
+                            "is_available": True,
+                        }
+                    },
+                    {"$project": {"_id": 0, "name": 1, "phone": 1, "district": 1}},
+                ],
+                "as": "worker",
+            }
+        },
+        {"$unwind": "$worker"},
+        {"$limit": k},
+    ]
+
+    return [
+        WorkerOut(
+            id=int(row["_id"]),
+            name=str(row["worker"].get("name", "")),
+            phone=row["worker"].get("phone"),
+            district=row["worker"].get("district"),
+            is_available=True,
+            distance_m=int(row["distance_m"]),
+            location_updated_at=row.get("updated_at"),
+        )
+        for row in db["worker_positions"].aggregate(pipeline)
+    ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import datetime as dt
 import re
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
@@ -17,6 +17,9 @@ ReportStatus = Literal[
     "closed",
     "rejected",
 ]
+MediaStatus = Literal["pending", "ready", "failed"]
+
+MAX_BATCH_REPORTS = 20
 
 
 class RegisterIn(BaseModel):
@@ -79,7 +82,7 @@ class UserOut(BaseModel):
         from_attributes = True
 
 
-class ReportCreateIn(BaseModel):
+class ReportCreateMetaIn(BaseModel):
     latitude: float = Field(ge=-90, le=90)
     longitude: float = Field(ge=-180, le=180)
     accuracy: float = Field(gt=0)
@@ -89,25 +92,48 @@ class ReportCreateIn(BaseModel):
     city: str = Field(default="", max_length=120)
     contact_phone: str = Field(min_length=6, max_length=30)
     description: str = Field(default="", max_length=2000)
+
+
+class ReportCreateIn(ReportCreateMetaIn):
     image_base64: str = Field(min_length=50)
 
 
+class ReportBatchItemIn(ReportCreateIn):
+    # Same role as the Idempotency-Key header of POST /reports (and shares its scope).
+    idempotency_key: Optional[str] = Field(default=None, max_length=200)
+
+
+class ReportBatchIn(BaseModel):
+    # Raw items, validated one by one as ReportBatchItemIn so a bad item fails alone.
+    reports: list[Any] = Field(min_length=1, max_length=MAX_BATCH_REPORTS)
+
+
 class ReportAssignIn(BaseModel):
     worker_id: int
     expected_completion_at: Optional[dt.datetime] = None
     eta_hours: Optional[int] = Field(default=None, ge=1, le=168)
 
 
+class ReportAutoAssignIn(BaseModel):
+    expected_completion_at: Optional[dt.datetime] = None
+    eta_hours: Optional[int] = Field(default=None, ge=1, le=168)
+    # Workers whose last location is older than this are not considered.
+    max_age_sec: int = Field(default=900, ge=1)
+
+
 class ReportVerifyIn(BaseModel):
     approved: bool
     message: str = Field(default="", max_length=2000)
 
 
-class ReportCompleteIn(BaseModel):
+class ReportCompleteMetaIn(BaseModel):
     latitude: float = Field(ge=-90, le=90)
     longitude: float = Field(ge=-180, le=180)
     accuracy: float = Field(gt=0)
     timestamp: Optional[int] = None
+
+
+class ReportCompleteIn(ReportCompleteMetaIn):
     image_base64: str = Field(min_length=50)
 
 
@@ -127,15 +153,51 @@ class ReportOut(BaseModel):
     status: ReportStatus
     cluster_id: str
     qr_url: str
+    thumbnail_url: str = ""
+    medium_url: str = ""
     assigned_worker: Optional[dict] = None
     expected_completion_at: Optional[dt.datetime] = None
     completion_image_url: str = ""
     completed_at: Optional[dt.datetime] = None
     completion_verified_at: Optional[dt.datetime] = None
     resolution_message: str = ""
+    agree_count: int = 0
+    disagree_count: int = 0
+    media_status: MediaStatus = "ready"
     created_at: dt.datetime
 
 
+class ReportDeltaOut(BaseModel):
+    """Report list changes after `since`: rows to upsert and ids that left the list."""
+
+    seq: int
+    reports: list[ReportOut]
+    removed_ids: list[int]
+
+
+class ReportBatchItemOut(BaseModel):
+    index: int
+    ok: bool
+    report: Optional[ReportOut] = None
+    error: Optional[str] = None
+
+
+class ReportBatchOut(BaseModel):
+    results: list[ReportBatchItemOut]
+
+
+class ReportAutoAssignItemOut(BaseModel):
+    report_id: int
+    worker_id: int
+    distance_m: int
+
+
+class ReportAutoAssignOut(BaseModel):
+    assignments: list[ReportAutoAssignItemOut]
+    unassigned_report_ids: list[int]
+    method: str
+
+
 class WorkerOut(BaseModel):
     id: int
     name: str
@@ -174,3 +236,5 @@ class ClusterOut(BaseModel):
     report_count: int
     severity: Severity
     priority: int
+    level: int = 3
+    hotspot_score: float = 0.0
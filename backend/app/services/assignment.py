@@ -0,0 +1,101 @@
+"""Min-cost one-to-one assignment (Hungarian algorithm) with a time budget."""
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+
+def _greedy(cost: np.ndarray, rows: list[int], cols: list[int]) -> list[tuple[int, int]]:
+    """Cheapest-pair-first matching of `rows` to `cols`."""
+    if not rows or not cols:
+        return []
+    sub = cost[np.ix_(rows, cols)]
+    order = np.argsort(sub, axis=None, kind="stable")
+    used_r: set[int] = set()
+    used_c: set[int] = set()
+    pairs = []
+    limit = min(len(rows), len(cols))
+    for flat in order.tolist():
+        r, c = divmod(flat, len(cols))
+        if r in used_r or c in used_c:
+            continue
+        used_r.add(r)
+        used_c.add(c)
+        pairs.append((rows[r], cols[c]))
+        if len(pairs) == limit:
+            break
+    return pairs
+
+
+def _hungarian(cost: np.ndarray, deadline: float) -> tuple[list[tuple[int, int]], bool]:
+    """Optimal assignment of every row (n <= m), one row at a time with potentials.
+
+    Returns the pairs for the rows finished before `deadline` and whether all
+    rows were finished; the partial result is optimal for the rows it covers.
+    """
+
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)  # p[j]: row (1-based) matched to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+    done = 0
+    for i in range(1, n + 1):
+        if time.monotonic() > deadline:
+            break
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+        done = i
+    pairs = [(int(p[j]) - 1, j - 1) for j in range(1, m + 1) if p[j]]
+    return pairs, done == n
+
+
+def solve(cost: np.ndarray, time_budget_sec: float) -> tuple[list[tuple[int, int]], str]:
+    """Match rows to columns minimizing total cost; returns (row, col) pairs and the method used.
+
+    Runs the Hungarian algorithm until the budget is spent; rows left over
+    are then matched greedily ("hungarian+greedy").
+    """
+
+    cost = np.asarray(cost, dtype=np.float64)
+    n, m = cost.shape
+    if n == 0 or m == 0:
+        return [], "hungarian"
+    transposed = n > m
+    work = cost.T if transposed else cost
+    pairs, complete = _hungarian(work, time.monotonic() + time_budget_sec)
+    method = "hungarian"
+    if not complete:
+        done_r = {r for r, _ in pairs}
+        done_c = {c for _, c in pairs}
+        rows = [r for r in range(work.shape[0]) if r not in done_r]
+        cols = [c for c in range(work.shape[1]) if c not in done_c]
+        pairs += _greedy(work, rows, cols)
+        method = "hungarian+greedy"
+    if transposed:
+        pairs = [(c, r) for r, c in pairs]
+    return sorted(pairs), method
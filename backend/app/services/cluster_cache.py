@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+from backend.app.services.districts import district_key
+
+# Version scope covering every district (the nationwide view).
+ALL_SCOPE = "*"
+VERSIONS_COLLECTION = "cluster_versions"
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _ttl_seconds() -> int:
+    return _int_env("CLUSTER_CACHE_TTL_SEC", 60)
+
+
+def _max_rows() -> int:
+    """Memory cap: total cluster rows held across all cached results."""
+    return _int_env("CLUSTER_CACHE_MAX_ROWS", 200_000)
+
+
+# key -> (version, stored_at, clusters); most recently used last.
+_entries: "OrderedDict[Hashable, tuple[int, float, list[dict]]]" = OrderedDict()
+_rows = 0
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def scope_for(district: str | None) -> str:
+    return district_key(district) or ALL_SCOPE
+
+
+def current_version(db: Database, scope: str) -> int:
+    doc = db[VERSIONS_COLLECTION].find_one({"_id": scope}, {"v": 1})
+    return int(doc.get("v", 0)) if doc else 0
+
+
+def bump(db: Database, districts: Iterable[str | None]) -> None:
+    """Invalidate cached clusters for `districts` (and the nationwide view) after a write."""
+    scopes = {ALL_SCOPE} | {scope_for(d) for d in districts}
+    db[VERSIONS_COLLECTION].bulk_write(
+        [UpdateOne({"_id": scope}, {"$inc": {"v": 1}}, upsert=True) for scope in sorted(scopes)],
+        ordered=False,
+    )
+
+
+def bump_all(db: Database) -> None:
+    """Invalidate every scope, e.g. after the clusters collection was rebuilt."""
+    db[VERSIONS_COLLECTION].update_many({}, {"$inc": {"v": 1}})
+    bump(db, [])
+
+
+def etag(scope: str, version: int, params: Hashable) -> str:
+    digest = hashlib.sha1(repr((scope, params)).encode("utf-8")).hexdigest()[:12]
+    return f'W/"{version}-{digest}"'
+
+
+def _evict_locked() -> None:
+    global _rows
+    limit = _max_rows()
+    while _entries and _rows > limit:
+        _, (_, _, clusters) = _entries.popitem(last=False)
+        _rows -= len(clusters)
+        _stats["evictions"] += 1
+
+
+def get_or_compute(key: Hashable, version: int, compute: Callable[[], list[dict]]) -> list[dict]:
+    """Return the cached clusters for `key` if stored at `version` and within TTL."""
+    global _rows
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == version and now - entry[1] <= _ttl_seconds():
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[2]
+        _stats["misses"] += 1
+
+    clusters = compute()
+
+    with _lock:
+        old = _entries.pop(key, None)
+        if old is not None:
+            _rows -= len(old[2])
+        _entries[key] = (version, now, clusters)
+        _rows += len(clusters)
+        _evict_locked()
+    return clusters
+
+
+def stats() -> dict:
+    with _lock:
+        return {"entries": len(_entries), "rows": _rows, "max_rows": _max_rows(), **_stats}
@@ -1,90 +1,666 @@
 from __future__ import annotations
 
+import datetime as dt
+import os
+import uuid
 from collections import defaultdict
 
+from pymongo import UpdateOne
 from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from backend.app.database import ensure_indexes
+from backend.app.services import cluster_cache, hotspot_scores, proximity_clusters, report_index
+from backend.app.services.districts import district_key
 
 SEVERITY_WEIGHT = {"Low": 1, "Medium": 3, "High": 5}
+SEVERITY_BY_WEIGHT = {w: name for name, w in SEVERITY_WEIGHT.items()}
+
+# Materialized per-(district_key, cluster_id) aggregates, kept current on write.
+CLUSTERS_COLLECTION = "clusters"
+# One-off data migrations that have run, by `_id`.
+MIGRATIONS_COLLECTION = "migrations"
+_MATERIALIZED = "clusters_materialized"
+
+
+# Grid resolutions, as decimals of lat/lon rounding: 0 ~ 110 km, 1 ~ 11 km, 2 ~ 1.1 km, 3 ~ 110 m.
+CELL_LEVELS = (0, 1, 2, 3)
+FINEST_LEVEL = CELL_LEVELS[-1]
+# Highest map zoom served by each level (Leaflet/OSM zoom numbers).
+_LEVEL_MAX_ZOOM = ((0, 5), (1, 8), (2, 11))
 
 
 def compute_cluster_id(latitude: float, longitude: float) -> str:
     return f"{round(latitude, 3)}_{round(longitude, 3)}"
 
 
+def compute_cell_ids(latitude: float, longitude: float) -> dict[str, str]:
+    """Cell id of a point at every grid level, keyed `l0`..`l3` (`l3` == cluster_id).
+
+    Coarser cells are derived from the finest cell's center, so every fine cell
+    rolls up into exactly one cell per coarser level.
+    """
+
+    lat3, lon3 = round(latitude, FINEST_LEVEL), round(longitude, FINEST_LEVEL)
+    return {f"l{d}": f"{round(lat3, d)}_{round(lon3, d)}" for d in CELL_LEVELS}
+
+
+def level_for_zoom(zoom: int) -> int:
+    for level, max_zoom in _LEVEL_MAX_ZOOM:
+        if zoom <= max_zoom:
+            return level
+    return FINEST_LEVEL
+
+
 def _cluster_center(cluster_id: str) -> tuple[float, float]:
     lat_s, lon_s = cluster_id.split("_", 1)
     return float(lat_s), float(lon_s)
 
 
-def get_clusters(db: Database, *, district: str | None = None):
+def _escalate(base: str, agree: int, disagree: int) -> str:
+    total = agree + disagree
+    if total == 0:
+        return base
+    ratio = agree / total
+    # Escalation rules to make clusters "more reddish" as more people agree.
+    if agree >= 4 and ratio >= 0.7:
+        return "High"
+    if agree >= 2 and ratio >= 0.6:
+        return "Medium" if base == "Low" else base
+    return base
+
+
+def _cluster_out(cluster_id: str, report_count: int, base_severity: str, agree: int, disagree: int) -> dict:
+    lat, lon = _cluster_center(cluster_id)
+    severity = _escalate(base_severity, agree, disagree)
+    return {
+        "cluster_id": cluster_id,
+        "latitude": lat,
+        "longitude": lon,
+        "report_count": report_count,
+        "severity": severity,
+        "priority": int(report_count * SEVERITY_WEIGHT.get(severity, 1)),
+    }
+
+
+def _report_weight(report: dict) -> int:
+    return SEVERITY_WEIGHT.get(str(report.get("severity") or "Low"), 1)
+
+
+def _row_id(district: str | None, cluster_id: str) -> str:
+    return f"{district_key(district)}|{cluster_id}"
+
+
+def _row_district(district: str | None) -> dict:
+    """District fields stored on cluster rows and buckets: the display name and the key filtered on."""
+    return {"district": str(district or ""), "district_key": district_key(district)}
+
+
+def _row_geo(cluster_id: str) -> dict:
+    lat, lon = _cluster_center(cluster_id)
+    return {"cluster_id": cluster_id, "latitude": lat, "longitude": lon, "cells": compute_cell_ids(lat, lon)}
+
+
+def record_report(db: Database, report: dict) -> None:
+    """Fold a newly inserted report into the materialized cluster row."""
+    record_reports(db, [report])
+
+
+def record_reports(db: Database, reports: list[dict]) -> None:
+    ops = []
+    bucket_ops = []
+    for r in reports:
+        cluster_id = str(r.get("cluster_id") or "")
+        if not cluster_id:
+            continue
+        district = r.get("district")
+        ops.append(
+            UpdateOne(
+                {"_id": _row_id(district, cluster_id)},
+                {
+                    "$inc": {"report_count": 1},
+                    "$max": {"max_weight": _report_weight(r)},
+                    "$setOnInsert": {**_row_district(district), "agree": 0, "disagree": 0, **_row_geo(cluster_id)},
+                },
+                upsert=True,
+            )
+        )
+        bucket_ops += hotspot_scores.bucket_updates(
+            _row_id(district, cluster_id),
+            {**_row_district(district), **_row_geo(cluster_id)},
+            _report_weight(r),
+            r.get("created_at"),
+        )
+    if ops:
+        db[CLUSTERS_COLLECTION].bulk_write(ops, ordered=False)
+        db[hotspot_scores.BUCKETS_COLLECTION].bulk_write(bucket_ops, ordered=False)
+        cluster_cache.bump(db, [r.get("district") for r in reports])
+    for r in reports:
+        proximity_clusters.add_report(r, _report_weight(r))
+        report_index.add_report(r)
+
+
+def record_vote(db: Database, report: dict, vote: int) -> None:
+    """Count a validation vote on the report's cluster row."""
+    cluster_id = str(report.get("cluster_id") or "")
+    if not cluster_id:
+        return
+    field = "agree" if int(vote) == 1 else "disagree"
+    db[CLUSTERS_COLLECTION].update_one(
+        {"_id": _row_id(report.get("district"), cluster_id)},
+        {"$inc": {field: 1}},
+    )
+    cluster_cache.bump(db, [report.get("district")])
+    proximity_clusters.update_report(int(report.get("id", 0)), vote=vote)
+
+
+def record_status_change(db: Database, report: dict, status: str) -> None:
+    """Invalidate cached clusters and update in-memory indexes after a report moved to `status`."""
+    record_status_changes(db, [report], status)
+
+
+def record_status_changes(db: Database, reports: list[dict], status: str) -> None:
+    if not reports:
+        return
+    cluster_cache.bump(db, [r.get("district") for r in reports])
+    for report in reports:
+        report_index.set_status(report, status)
+        proximity_clusters.update_report(int(report.get("id", 0)), status=status)
+        if status in proximity_clusters.OPEN_STATUSES:
+            # Reopened reports the engine never loaded join it here.
+            proximity_clusters.add_report({**report, "status": status}, _report_weight(report))
+
+
+def _cluster_backend() -> str:
+    return os.getenv("CLUSTER_BACKEND", "materialized").strip().lower()
+
+
+# Sort keys accepted by get_clusters / get_clusters_in_view (descending).
+CLUSTER_SORT_KEYS = {
+    "priority": lambda c: c["priority"],
+    "hotspot": lambda c: (c["hotspot_score"], c["priority"]),
+}
+
+
+def get_clusters(
+    db: Database,
+    *,
+    district: str | None = None,
+    backend: str | None = None,
+    sort: str = "priority",
+    now: dt.datetime | None = None,
+):
+    """Clusters with their decayed `hotspot_score`, ranked by `sort` (see CLUSTER_SORT_KEYS).
+
+    `backend` (default: CLUSTER_BACKEND env, else "materialized") selects the
+    implementation: "materialized" reads the `clusters` rows, "pipeline" runs a
+    server-side aggregation over `reports`, "scan" recomputes in Python, and
+    "proximity" groups open reports by distance instead of grid buckets.
+    """
+
+    impl = CLUSTER_BACKENDS.get(backend or _cluster_backend(), get_clusters_materialized)
+    now = hotspot_scores.score_time(now)
+    if impl is get_clusters_proximity:
+        clusters = get_clusters_proximity(db, district=district, now=now)
+    else:
+        clusters = impl(db, district=district)
+        scores = hotspot_scores.scores(
+            db, match={"district_key": district_key(district)} if district else {}, group_key="$cluster_id", now=now
+        )
+        for c in clusters:
+            c["hotspot_score"] = scores.get(c["cluster_id"], 0.0)
+    clusters.sort(key=CLUSTER_SORT_KEYS[sort], reverse=True)
+    return clusters
+
+
+def get_clusters_materialized(db: Database, *, district: str | None = None):
+    """Clusters ranked by priority, read from the materialized `clusters` rows."""
     query: dict = {}
     if district:
-        query["district"] = district
-    reports = list(db["reports"].find(query, {"id": 1, "cluster_id": 1, "severity": 1}))
+        query["district_key"] = district_key(district)
+
+    merged: dict[str, list[int]] = {}
+    for row in db[CLUSTERS_COLLECTION].find(query, {"_id": 0, "cluster_id": 1, "report_count": 1, "max_weight": 1, "agree": 1, "disagree": 1}):
+        cluster_id = str(row.get("cluster_id") or "")
+        if not cluster_id:
+            continue
+        acc = merged.setdefault(cluster_id, [0, 0, 0, 0])
+        acc[0] += int(row.get("report_count", 0))
+        acc[1] = max(acc[1], int(row.get("max_weight", 1)))
+        acc[2] += int(row.get("agree", 0))
+        acc[3] += int(row.get("disagree", 0))
+
+    clusters = [
+        _cluster_out(cluster_id, count, SEVERITY_BY_WEIGHT.get(weight, "Low"), agree, disagree)
+        for cluster_id, (count, weight, agree, disagree) in merged.items()
+        if count > 0
+    ]
+    clusters.sort(key=lambda c: c["priority"], reverse=True)
+    return clusters
+
+
+def _swap_in(db: Database, name: str, docs: dict[str, dict]) -> None:
+    """Replace collection `name` with `docs` (keyed by `_id`) via a scratch collection and rename.
+
+    The scratch name is unique per call, so concurrent rebuilds (several
+    workers booting at once) never write into each other's scratch
+    collection; the last rename wins.
+    """
+    if not docs:
+        db[name].delete_many({})
+        return
+    scratch = db[f"{name}_rebuild_{uuid.uuid4().hex}"]
+    try:
+        scratch.insert_many([{"_id": doc_id, **doc} for doc_id, doc in docs.items()])
+        scratch.rename(name, dropTarget=True)
+    except Exception:
+        scratch.drop()
+        raise
+
+
+def rebuild_clusters(db: Database) -> int:
+    """Recompute the `clusters` rows and hotspot buckets from `reports` (using their vote counters).
+
+    Builds into scratch collections and swaps them in with a rename, so readers
+    never see a half-built table. Writes landing during the rebuild may be
+    lost; run it while traffic is quiet. Returns the number of rows written.
+    """
+
+    now = dt.datetime.utcnow()
+    rows: dict[str, dict] = {}
+    buckets: dict[str, dict] = {}
+    for r in db["reports"].find(
+        {}, {"cluster_id": 1, "district": 1, "severity": 1, "agree_count": 1, "disagree_count": 1, "created_at": 1}
+    ):
+        cluster_id = str(r.get("cluster_id") or "")
+        if not cluster_id:
+            continue
+        district = r.get("district")
+        row_id = _row_id(district, cluster_id)
+        row = rows.setdefault(
+            row_id,
+            {**_row_district(district), "report_count": 0, "max_weight": 0, "agree": 0, "disagree": 0, **_row_geo(cluster_id)},
+        )
+        row["report_count"] += 1
+        row["max_weight"] = max(row["max_weight"], _report_weight(r))
+        row["agree"] += int(r.get("agree_count") or 0)
+        row["disagree"] += int(r.get("disagree_count") or 0)
+
+        for bucket_id, doc in hotspot_scores.bucket_docs(
+            row_id, {**_row_district(district), **_row_geo(cluster_id)}, _report_weight(r), r.get("created_at")
+        ).items():
+            if doc["expires_at"] <= now:
+                continue
+            if bucket_id in buckets:
+                buckets[bucket_id]["report_count"] += doc["report_count"]
+                buckets[bucket_id]["weight"] += doc["weight"]
+            else:
+                buckets[bucket_id] = doc
+
+    _swap_in(db, CLUSTERS_COLLECTION, rows)
+    _swap_in(db, hotspot_scores.BUCKETS_COLLECTION, buckets)
+    ensure_indexes(db)
+    cluster_cache.bump_all(db)
+    return len(rows)
+
+
+def get_clusters_scan(db: Database, *, district: str | None = None):
+    """Reference implementation: recompute clusters from the reports collection."""
+    query: dict = {}
+    if district:
+        query["district_key"] = district_key(district)
+    reports = list(
+        db["reports"].find(query, {"cluster_id": 1, "severity": 1, "agree_count": 1, "disagree_count": 1})
+    )
     counts: dict[str, int] = defaultdict(int)
     max_weight: dict[str, int] = defaultdict(int)
     max_sev: dict[str, str] = defaultdict(lambda: "Low")
-
-    report_ids_by_cluster: dict[str, list[int]] = defaultdict(list)
+    agree_by_cluster: dict[str, int] = defaultdict(int)
+    disagree_by_cluster: dict[str, int] = defaultdict(int)
 
     for r in reports:
-        report_id = int(r.get("id", 0))
         cluster_id = str(r.get("cluster_id") or "")
         severity = str(r.get("severity") or "Low")
         if not cluster_id:
             continue
         counts[cluster_id] += 1
-        report_ids_by_cluster[cluster_id].append(int(report_id))
+        agree_by_cluster[cluster_id] += int(r.get("agree_count") or 0)
+        disagree_by_cluster[cluster_id] += int(r.get("disagree_count") or 0)
         w = SEVERITY_WEIGHT.get(severity or "Low", 1)
         if w >= max_weight[cluster_id]:
             max_weight[cluster_id] = w
             max_sev[cluster_id] = severity or "Low"
 
-    votes = list(db["validations"].find({}, {"report_id": 1, "vote": 1}))
-    agree_by_report: dict[int, int] = defaultdict(int)
-    disagree_by_report: dict[int, int] = defaultdict(int)
-    for v in votes:
-        rid = int(v.get("report_id", 0))
-        vote = int(v.get("vote", 0))
-        if vote == 1:
-            agree_by_report[rid] += 1
-        else:
-            disagree_by_report[rid] += 1
+    clusters = [
+        _cluster_out(cluster_id, report_count, max_sev[cluster_id], agree_by_cluster[cluster_id], disagree_by_cluster[cluster_id])
+        for cluster_id, report_count in counts.items()
+    ]
+    clusters.sort(key=lambda c: c["priority"], reverse=True)
+    return clusters
 
-    agree_by_cluster: dict[str, int] = defaultdict(int)
-    disagree_by_cluster: dict[str, int] = defaultdict(int)
-    for cluster_id, rids in report_ids_by_cluster.items():
-        for rid in rids:
-            agree_by_cluster[cluster_id] += agree_by_report.get(rid, 0)
-            disagree_by_cluster[cluster_id] += disagree_by_report.get(rid, 0)
-
-    def _escalate(base: str, agree: int, disagree: int) -> str:
-        total = agree + disagree
-        if total == 0:
-            return base
-        ratio = agree / total
-        # Escalation rules to make clusters "more reddish" as more people agree.
-        if agree >= 4 and ratio >= 0.7:
-            return "High"
-        if agree >= 2 and ratio >= 0.6:
-            return "Medium" if base == "Low" else base
-        return base
 
+def _weight_expr(field: str) -> dict:
+    return {
+        "$switch": {
+            "branches": [{"case": {"$eq": [field, name]}, "then": w} for name, w in SEVERITY_WEIGHT.items()],
+            "default": 1,
+        }
+    }
+
+
+def _escalation_stages() -> list[dict]:
+    """Stages turning `agree`/`total`/`max_weight`/`report_count` into `weight` and `priority` (see _escalate)."""
+    return [
+        {"$addFields": {"ratio": {"$cond": [{"$gt": ["$total", 0]}, {"$divide": ["$agree", "$total"]}, 0]}}},
+        {
+            "$addFields": {
+                "weight": {
+                    "$switch": {
+                        "branches": [
+                            {
+                                "case": {"$and": [{"$gte": ["$agree", 4]}, {"$gte": ["$ratio", 0.7]}]},
+                                "then": SEVERITY_WEIGHT["High"],
+                            },
+                            {
+                                "case": {
+                                    "$and": [
+                                        {"$gte": ["$agree", 2]},
+                                        {"$gte": ["$ratio", 0.6]},
+                                        {"$eq": ["$max_weight", SEVERITY_WEIGHT["Low"]]},
+                                    ]
+                                },
+                                "then": SEVERITY_WEIGHT["Medium"],
+                            },
+                        ],
+                        "default": "$max_weight",
+                    }
+                }
+            }
+        },
+        {"$addFields": {"priority": {"$multiply": ["$report_count", "$weight"]}}},
+    ]
+
+
+def cluster_pipeline(district: str | None = None) -> list[dict]:
+    """Aggregation computing cluster rows server-side (group, vote totals, escalation, sort)."""
+    match: dict = {"cluster_id": {"$nin": [None, ""]}}
+    if district:
+        match["district_key"] = district_key(district)
+    return [
+        {"$match": match},
+        {
+            "$project": {
+                "_id": 0,
+                "cluster_id": 1,
+                "weight": _weight_expr("$severity"),
+                "agree": {"$ifNull": ["$agree_count", 0]},
+                "total": {"$add": [{"$ifNull": ["$agree_count", 0]}, {"$ifNull": ["$disagree_count", 0]}]},
+            }
+        },
+        {
+            "$group": {
+                "_id": "$cluster_id",
+                "report_count": {"$sum": 1},
+                "max_weight": {"$max": "$weight"},
+                "agree": {"$sum": "$agree"},
+                "total": {"$sum": "$total"},
+            }
+        },
+        *_escalation_stages(),
+        {"$sort": {"priority": -1, "_id": 1}},
+        {"$project": {"_id": 0, "cluster_id": "$_id", "report_count": 1, "weight": 1, "priority": 1}},
+    ]
+
+
+def get_clusters_pipeline(db: Database, *, district: str | None = None):
+    """Clusters ranked by priority, computed by MongoDB; only cluster rows cross the wire."""
     clusters = []
-    for cluster_id, report_count in counts.items():
+    for row in db["reports"].aggregate(cluster_pipeline(district)):
+        cluster_id = str(row["cluster_id"])
         lat, lon = _cluster_center(cluster_id)
-        severity = _escalate(max_sev[cluster_id], agree_by_cluster[cluster_id], disagree_by_cluster[cluster_id])
-        priority = report_count * SEVERITY_WEIGHT.get(severity, 1)
         clusters.append(
             {
                 "cluster_id": cluster_id,
                 "latitude": lat,
                 "longitude": lon,
-                "report_count": report_count,
-                "severity": severity,
-                "priority": int(priority),
+                "report_count": int(row["report_count"]),
+                "severity": SEVERITY_BY_WEIGHT.get(int(row["weight"]), "Low"),
+                "priority": int(row["priority"]),
             }
         )
+    return clusters
+
+
+def bbox_match(bbox: tuple[float, float, float, float]) -> dict:
+    west, south, east, north = bbox
+    match: dict = {"latitude": {"$gte": south, "$lte": north}}
+    if west <= east:
+        match["longitude"] = {"$gte": west, "$lte": east}
+    else:  # viewport crosses the antimeridian
+        match["$or"] = [{"longitude": {"$gte": west}}, {"longitude": {"$lte": east}}]
+    return match
+
+
+def cluster_layer_pipeline(
+    *, district: str | None = None, bbox: tuple[float, float, float, float] | None = None
+) -> list[dict]:
+    """Aggregation over the `clusters` rows yielding one escalated map point per cluster_id.
+
+    Rows carry `cluster_id`, `latitude`, `longitude`, `report_count`, `weight`
+    (escalated severity weight) and `priority`, unsorted, so the result can be
+    streamed straight from the cursor.
+    """
+
+    match = bbox_match(bbox) if bbox is not None else {}
+    if district:
+        match["district_key"] = district_key(district)
+    return [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": "$cluster_id",
+                "latitude": {"$first": "$latitude"},
+                "longitude": {"$first": "$longitude"},
+                "report_count": {"$sum": "$report_count"},
+                "max_weight": {"$max": "$max_weight"},
+                "agree": {"$sum": "$agree"},
+                "total": {"$sum": {"$add": ["$agree", "$disagree"]}},
+            }
+        },
+        {"$match": {"report_count": {"$gt": 0}}},
+        *_escalation_stages(),
+        {
+            "$project": {
+                "_id": 0,
+                "cluster_id": "$_id",
+                "latitude": 1,
+                "longitude": 1,
+                "report_count": 1,
+                "weight": 1,
+                "priority": 1,
+            }
+        },
+    ]
+
+
+def get_clusters_in_view(
+    db: Database,
+    *,
+    bbox: tuple[float, float, float, float],
+    zoom: int,
+    district: str | None = None,
+    sort: str = "priority",
+    now: dt.datetime | None = None,
+):
+    """Clusters inside `bbox` (west, south, east, north) at the grid level for `zoom`.
 
+    Fine cluster rows in the viewport are escalated as usual and then rolled up
+    into their coarser cell server-side: counts, priorities and hotspot scores
+    add up and the highest severity wins. The result size depends on the
+    viewport, not on the total number of reports.
+    """
+
+    level = level_for_zoom(zoom)
+    match = bbox_match(bbox)
+    if district:
+        match["district_key"] = district_key(district)
+    pipeline = [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": "$cluster_id",
+                "cell": {"$first": f"$cells.l{level}"},
+                "report_count": {"$sum": "$report_count"},
+                "max_weight": {"$max": "$max_weight"},
+                "agree": {"$sum": "$agree"},
+                "total": {"$sum": {"$add": ["$agree", "$disagree"]}},
+            }
+        },
+        {"$match": {"report_count": {"$gt": 0}}},
+        *_escalation_stages(),
+        {
+            "$group": {
+                "_id": "$cell",
+                "report_count": {"$sum": "$report_count"},
+                "weight": {"$max": "$weight"},
+                "priority": {"$sum": "$priority"},
+            }
+        },
+        {"$sort": {"priority": -1, "_id": 1}},
+    ]
+
+    clusters = []
+    for row in db[CLUSTERS_COLLECTION].aggregate(pipeline):
+        cell_id = str(row["_id"])
+        lat, lon = _cluster_center(cell_id)
+        clusters.append(
+            {
+                "cluster_id": cell_id,
+                "latitude": lat,
+                "longitude": lon,
+                "report_count": int(row["report_count"]),
+                "severity": SEVERITY_BY_WEIGHT.get(int(row["weight"]), "Low"),
+                "priority": int(row["priority"]),
+                "level": level,
+            }
+        )
+
+    scores = hotspot_scores.scores(db, match=match, group_key=f"$cells.l{level}", now=hotspot_scores.score_time(now))
+    for c in clusters:
+        c["hotspot_score"] = scores.get(c["cluster_id"], 0.0)
+    clusters.sort(key=CLUSTER_SORT_KEYS[sort], reverse=True)
+    return clusters
+
+
+def get_clusters_proximity(db: Database, *, district: str | None = None, now: dt.datetime | None = None):
+    """Clusters of open reports chained within PROXIMITY_RADIUS_M, ranked by priority.
+
+    Unlike the grid backends, a hotspot is not cut at rounded-coordinate cell
+    borders. Cluster ids are `p<smallest report id>` and the position is the
+    centroid of the member reports.
+    """
+
+    if not proximity_clusters.is_fresh():
+        rows = []
+        for r in db["reports"].find(
+            {"status": {"$in": list(proximity_clusters.OPEN_STATUSES)}},
+            {
+                "_id": 0,
+                "id": 1,
+                "latitude": 1,
+                "longitude": 1,
+                "severity": 1,
+                "district": 1,
+                "agree_count": 1,
+                "disagree_count": 1,
+                "created_at": 1,
+            },
+        ):
+            r["weight"] = _report_weight(r)
+            rows.append(r)
+        proximity_clusters.load(rows)
+
+    clusters = []
+    groups = proximity_clusters.groups(
+        district, now=hotspot_scores.score_time(now), half_life_hours=hotspot_scores.half_life_hours()
+    )
+    for g in groups:
+        severity = _escalate(SEVERITY_BY_WEIGHT.get(g["max_weight"], "Low"), g["agree"], g["disagree"])
+        clusters.append(
+            {
+                "cluster_id": g["cluster_id"],
+                "latitude": g["latitude"],
+                "longitude": g["longitude"],
+                "report_count": g["report_count"],
+                "severity": severity,
+                "priority": int(g["report_count"] * SEVERITY_WEIGHT.get(severity, 1)),
+                "hotspot_score": g["hotspot_score"],
+            }
+        )
     clusters.sort(key=lambda c: c["priority"], reverse=True)
     return clusters
+
+
+CLUSTER_BACKENDS = {
+    "materialized": get_clusters_materialized,
+    "pipeline": get_clusters_pipeline,
+    "scan": get_clusters_scan,
+    "proximity": get_clusters_proximity,
+}
+# Backends that bucket reports by grid cell and must agree with the scan.
+GRID_BACKENDS = ("materialized", "pipeline", "scan")
+
+
+def backfill_vote_counts(db: Database) -> int:
+    """Recompute `agree_count`/`disagree_count` on every report from `validations`.
+
+    Votes cast while this runs may be overwritten; run it while traffic is
+    quiet. Returns the number of reports that have votes.
+    """
+
+    totals = db["validations"].aggregate(
+        [
+            {
+                "$group": {
+                    "_id": "$report_id",
+                    "agree": {"$sum": {"$cond": [{"$eq": ["$vote", 1]}, 1, 0]}},
+                    "total": {"$sum": 1},
+                }
+            }
+        ]
+    )
+    ops = [
+        UpdateOne(
+            {"id": row["_id"]},
+            {"$set": {"agree_count": int(row["agree"]), "disagree_count": int(row["total"] - row["agree"])}},
+        )
+        for row in totals
+    ]
+    db["reports"].update_many({}, {"$set": {"agree_count": 0, "disagree_count": 0}})
+    for i in range(0, len(ops), 1000):
+        db["reports"].bulk_write(ops[i : i + 1000], ordered=False)
+    return len(ops)
+
+
+def materialize_once(db: Database) -> int | None:
+    """Build the cluster rows and hotspot buckets on the first boot after upgrading.
+
+    Only the process that inserts the `clusters_materialized` marker runs
+    backfill_vote_counts and rebuild_clusters; later boots and processes
+    racing it return None. Deployments that already have cluster rows just
+    get the marker. If the rebuild fails the marker is removed so the next
+    boot retries. Returns the number of rows built.
+    """
+
+    try:
+        db[MIGRATIONS_COLLECTION].insert_one({"_id": _MATERIALIZED, "at": dt.datetime.utcnow()})
+    except DuplicateKeyError:
+        return None
+    if db[CLUSTERS_COLLECTION].estimated_document_count() or not db["reports"].estimated_document_count():
+        return 0
+    try:
+        backfill_vote_counts(db)
+        return rebuild_clusters(db)
+    except Exception:
+        db[MIGRATIONS_COLLECTION].delete_one({"_id": _MATERIALIZED})
+        raise
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+
+def district_key(value: str | None) -> str:
+    """Lookup key for a district name: whitespace-collapsed and lower-cased."""
+    return " ".join(str(value or "").split()).lower()
+
+
+def backfill_district_keys(db: Database) -> int:
+    """Set `district_key` on users and reports stored before the field existed.
+
+    Safe to run repeatedly; returns the number of documents updated.
+    """
+
+    updated = 0
+    for name in ("users", "reports"):
+        ops = []
+        for doc in db[name].find({"district_key": {"$exists": False}}, {"district": 1}):
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"district_key": district_key(doc.get("district"))}}))
+            if len(ops) >= 1000:
+                updated += db[name].bulk_write(ops, ordered=False).modified_count
+                ops = []
+        if ops:
+            updated += db[name].bulk_write(ops, ordered=False).modified_count
+    return updated
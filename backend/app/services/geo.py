@@ -0,0 +1,97 @@
+"""Great-circle distances and bounding-box prefilters, vectorized with NumPy."""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+# Meters per degree of latitude (and of longitude at the equator).
+_M_PER_DEG = math.pi * EARTH_RADIUS_M / 180.0
+
+
+def geo_point(latitude: float, longitude: float) -> dict:
+    """GeoJSON point as stored in `location` fields (note the lon, lat order)."""
+    return {"type": "Point", "coordinates": [float(longitude), float(latitude)]}
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance in meters between two points (scalar reference implementation)."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def _haversine(lat1, lon1, lat2, lon2) -> np.ndarray:
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(np.asarray(lon2, dtype=np.float64) - lon1)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return EARTH_RADIUS_M * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_many(lat: float, lon: float, lats, lons) -> np.ndarray:
+    """Distances in meters from one origin to each of N points."""
+    return _haversine(float(lat), float(lon), np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64))
+
+
+def haversine_pairs(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """Element-wise distances in meters between two equally long point arrays."""
+    return _haversine(
+        np.asarray(lats1, dtype=np.float64),
+        np.asarray(lons1, dtype=np.float64),
+        np.asarray(lats2, dtype=np.float64),
+        np.asarray(lons2, dtype=np.float64),
+    )
+
+
+def haversine_matrix(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """N x M matrix of distances in meters between two point sets."""
+    lats1 = np.asarray(lats1, dtype=np.float64)[:, None]
+    lons1 = np.asarray(lons1, dtype=np.float64)[:, None]
+    return _haversine(lats1, lons1, np.asarray(lats2, dtype=np.float64)[None, :], np.asarray(lons2, dtype=np.float64)[None, :])
+
+
+def bbox_around(lat: float, lon: float, radius_m: float) -> tuple[float, float, float, float]:
+    """(west, south, east, north) box containing every point within `radius_m` of the origin.
+
+    West may exceed east when the box crosses the antimeridian; near the poles
+    the box spans all longitudes.
+    """
+
+    dlat = radius_m / _M_PER_DEG
+    south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    cos_lat = min(math.cos(math.radians(south)), math.cos(math.radians(north)))
+    if cos_lat <= 1e-9 or radius_m / (_M_PER_DEG * cos_lat) >= 180.0:
+        return -180.0, south, 180.0, north
+    dlon = radius_m / (_M_PER_DEG * cos_lat)
+    west = (lon - dlon + 540.0) % 360.0 - 180.0
+    east = (lon + dlon + 540.0) % 360.0 - 180.0
+    return west, south, east, north
+
+
+def in_bbox(lats, lons, bbox: tuple[float, float, float, float]) -> np.ndarray:
+    """Boolean mask of points inside `bbox` (handles boxes crossing the antimeridian)."""
+    west, south, east, north = bbox
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    mask = (lats >= south) & (lats <= north)
+    if west <= east:
+        return mask & (lons >= west) & (lons <= east)
+    return mask & ((lons >= west) | (lons <= east))
+
+
+def within_radius(lat: float, lon: float, lats, lons, radius_m: float) -> tuple[np.ndarray, np.ndarray]:
+    """Indices of points within `radius_m` of the origin and their distances.
+
+    A cheap bounding-box test runs first; haversine is computed only for the
+    points inside the box.
+    """
+
+    idx = np.nonzero(in_bbox(lats, lons, bbox_around(lat, lon, radius_m)))[0]
+    dist = haversine_many(lat, lon, np.asarray(lats, dtype=np.float64)[idx], np.asarray(lons, dtype=np.float64)[idx])
+    keep = dist <= radius_m
+    return idx[keep], dist[keep]
@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import datetime as dt
 import json
+import os
+import uuid
 from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from urllib.request import Request, urlopen
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, features
+
+# Longest-edge sizes of the renditions served to list/detail views.
+DERIVATIVE_SIZES = {"thumbnail": 320, "medium": 1024}
 
 
 def _parse_reported_at(ts: Optional[int], created_at: dt.datetime) -> dt.datetime:
@@ -49,9 +54,20 @@ def reverse_geocode_address(latitude: float, longitude: float) -> str:
         return ""
 
 
+def _save_atomic(img: Image.Image, target: Path, **save_kwargs) -> None:
+    """Save `img` as `target` via a uniquely named temp file, so concurrent writers never interleave."""
+    partial = target.with_name(f".{target.name}.{uuid.uuid4().hex}.part")
+    try:
+        img.save(partial, **save_kwargs)
+        os.replace(partial, target)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
 def annotate_report_image(
     *,
     image_file: Path,
+    output_file: Path,
     qr_file: Path,
     latitude: float,
     longitude: float,
@@ -61,7 +77,8 @@ def annotate_report_image(
 ) -> None:
     """Draw a geotag footer onto the image (QR + address + coords + timestamp).
 
-    Writes the annotated image back to the same file.
+    Writes the annotated image to `output_file` and leaves `image_file`
+    untouched, so running the job again yields the same image.
     """
 
     base = Image.open(image_file).convert("RGB")
@@ -129,4 +146,33 @@ def annotate_report_image(
         draw.text((text_x, y), line, fill=(255, 255, 255), font=font)
         y += 16
 
-    out.save(image_file, format="JPEG", quality=85, optimize=True)
+    _save_atomic(out, output_file, format="JPEG", quality=85, optimize=True)
+
+
+def _derivative_format() -> tuple[str, str, str]:
+    if features.check("webp"):
+        return "WEBP", "webp", "image/webp"
+    return "JPEG", "jpg", "image/jpeg"
+
+
+def make_image_derivatives(image_file: Path) -> dict[str, tuple[Path, str]]:
+    """Write downscaled renditions of `image_file` next to it.
+
+    Returns `{name: (path, content_type)}` for each entry of DERIVATIVE_SIZES,
+    e.g. `photo_thumbnail.webp`. WebP is used when Pillow supports it, else JPEG.
+    """
+
+    fmt, ext, content_type = _derivative_format()
+    out: dict[str, tuple[Path, str]] = {}
+    with Image.open(image_file) as src:
+        base = src.convert("RGB")
+    for name, max_px in DERIVATIVE_SIZES.items():
+        img = base.copy()
+        img.thumbnail((max_px, max_px), Image.LANCZOS)
+        target = image_file.with_name(f"{image_file.stem}_{name}.{ext}")
+        if fmt == "WEBP":
+            _save_atomic(img, target, format=fmt, quality=80, method=4)
+        else:
+            _save_atomic(img, target, format=fmt, quality=80, optimize=True, progressive=True)
+        out[name] = (target, content_type)
+    return out
@@ -0,0 +1,117 @@
+"""Time-decayed hotspot scores from hourly/daily rollup buckets.
+
+Every report adds its severity weight to one hourly and one daily bucket of
+its cluster row. A cluster's score is the sum of bucket weights decayed by
+bucket age with a half-life of HOTSPOT_HALF_LIFE_HOURS: hourly buckets are
+used for the most recent HOTSPOT_HOURLY_DAYS UTC days, daily buckets before
+that, so scoring reads O(buckets) documents and never the reports.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import os
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+BUCKETS_COLLECTION = "cluster_buckets"
+_SPANS = {"h": dt.timedelta(hours=1), "d": dt.timedelta(days=1)}
+# Buckets older than this many half-lives contribute < 1e-6 of their weight.
+_HORIZON_HALF_LIVES = 20
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def half_life_hours() -> float:
+    return max(0.01, _float_env("HOTSPOT_HALF_LIFE_HOURS", 72.0))
+
+
+def _hourly_days() -> int:
+    return max(1, int(_float_env("HOTSPOT_HOURLY_DAYS", 2)))
+
+
+def _retention_days() -> int:
+    return max(1, int(_float_env("HOTSPOT_BUCKET_RETENTION_DAYS", 365)))
+
+
+def _floor(ts: dt.datetime, granularity: str) -> dt.datetime:
+    ts = ts.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+    return ts.replace(hour=0) if granularity == "d" else ts
+
+
+def score_time(now: dt.datetime | None = None) -> dt.datetime:
+    """Scores are evaluated at the start of the current hour, so they only change hourly."""
+    return _floor(now or dt.datetime.utcnow(), "h")
+
+
+def bucket_docs(row_id: str, fields: dict, weight: int, created_at: dt.datetime | None) -> dict[str, dict]:
+    """Hourly and daily bucket documents (keyed by `_id`) for one report of cluster row `row_id`."""
+    created_at = created_at or dt.datetime.utcnow()
+    docs = {}
+    for granularity, span in _SPANS.items():
+        start = _floor(created_at, granularity)
+        keep_days = _hourly_days() + 1 if granularity == "h" else _retention_days()
+        docs[f"{row_id}|{granularity}|{start:%Y%m%d%H}"] = {
+            **fields,
+            "g": granularity,
+            "start": start,
+            "mid": start + span / 2,
+            "expires_at": start + dt.timedelta(days=keep_days),
+            "report_count": 1,
+            "weight": int(weight),
+        }
+    return docs
+
+
+def bucket_updates(row_id: str, fields: dict, weight: int, created_at: dt.datetime | None) -> list[UpdateOne]:
+    ops = []
+    for bucket_id, doc in bucket_docs(row_id, fields, weight, created_at).items():
+        counters = {"report_count": doc.pop("report_count"), "weight": doc.pop("weight")}
+        ops.append(UpdateOne({"_id": bucket_id}, {"$inc": counters, "$setOnInsert": doc}, upsert=True))
+    return ops
+
+
+def score_pipeline(match: dict, group_key: str, now: dt.datetime) -> list[dict]:
+    """Aggregation summing decayed bucket weights per `group_key` (e.g. "$cluster_id")."""
+    cutoff = _floor(now, "d") - dt.timedelta(days=_hourly_days() - 1)
+    horizon = now - dt.timedelta(hours=half_life_hours() * _HORIZON_HALF_LIVES)
+    half_life_ms = half_life_hours() * 3600 * 1000
+    window = {
+        "$or": [
+            {"g": "h", "start": {"$gte": cutoff}},
+            {"g": "d", "start": {"$lt": cutoff, "$gte": _floor(horizon, "d")}},
+        ]
+    }
+    return [
+        {"$match": {"$and": [match, window]} if match else window},
+        {
+            "$group": {
+                "_id": group_key,
+                "score": {
+                    "$sum": {
+                        "$multiply": [
+                            "$weight",
+                            {
+                                "$pow": [
+                                    0.5,
+                                    {"$divide": [{"$max": [0, {"$subtract": [now, "$mid"]}]}, half_life_ms]},
+                                ]
+                            },
+                        ]
+                    }
+                },
+            }
+        },
+    ]
+
+
+def scores(db: Database, *, match: dict, group_key: str, now: dt.datetime) -> dict[str, float]:
+    return {
+        str(row["_id"]): round(float(row["score"]), 3)
+        for row in db[BUCKETS_COLLECTION].aggregate(score_pipeline(match, group_key, now))
+    }
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+
+from pymongo import ReturnDocument
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+COLLECTION = "idempotency_keys"
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def pending_timeout_seconds() -> int:
+    """How long an unfinished claim blocks retries before another request may take it over."""
+    return _int_env("IDEMPOTENCY_PENDING_TIMEOUT_SEC", 120)
+
+
+def _doc_id(*, key: str, user_id: int, scope: str) -> str:
+    return f"{int(user_id)}:{scope}:{key.strip()}"
+
+
+def claim(db: Database, *, key: str, user_id: int, scope: str) -> dict | None:
+    """Claim an idempotency key for a new request.
+
+    Returns None when the caller now owns the key and should do the work.
+    Otherwise returns the existing record: `response` is set when the original
+    request finished, and is None while it is still in flight.
+    """
+
+    coll = db[COLLECTION]
+    doc_id = _doc_id(key=key, user_id=user_id, scope=scope)
+    now = dt.datetime.utcnow()
+    try:
+        coll.insert_one({"_id": doc_id, "response": None, "created_at": now})
+        return None
+    except DuplicateKeyError:
+        pass
+
+    # Take over a claim whose owner died before finishing.
+    stale_before = now - dt.timedelta(seconds=pending_timeout_seconds())
+    taken = coll.find_one_and_update(
+        {"_id": doc_id, "response": None, "created_at": {"$lt": stale_before}},
+        {"$set": {"created_at": now}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if taken is not None:
+        return None
+    return coll.find_one({"_id": doc_id}) or {"_id": doc_id, "response": None}
+
+
+def store(db: Database, *, key: str, user_id: int, scope: str, response: dict) -> None:
+    db[COLLECTION].update_one(
+        {"_id": _doc_id(key=key, user_id=user_id, scope=scope)},
+        {"$set": {"response": response, "created_at": dt.datetime.utcnow()}},
+    )
+
+
+def release(db: Database, *, key: str, user_id: int, scope: str) -> None:
+    """Drop an unfinished claim so that a retry can run the request again."""
+    db[COLLECTION].delete_one({"_id": _doc_id(key=key, user_id=user_id, scope=scope), "response": None})
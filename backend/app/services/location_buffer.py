@@ -0,0 +1,186 @@
+"""Buffered worker location pings.
+
+Pings are held in memory and flushed every LOCATION_FLUSH_SEC with two bulk
+writes: the latest position per worker goes to `worker_positions` (one small
+document per worker, keyed by worker id) and every ping is appended to the
+`worker_tracks` time-series collection. The `users` documents are not
+touched by pings at all. Readers merge the unflushed pings of this process
+over the stored positions, so a worker's own process never serves a stale
+position; other processes see it after at most one flush interval.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import os
+import threading
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+from backend.app.services.geo import geo_point
+
+logger = logging.getLogger(__name__)
+
+POSITIONS_COLLECTION = "worker_positions"
+TRACKS_COLLECTION = "worker_tracks"
+_DUPLICATE_KEY = 11000
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _flush_seconds() -> int:
+    return max(1, _int_env("LOCATION_FLUSH_SEC", 5))
+
+
+def _max_buffered() -> int:
+    """Track points held before an early flush (and the cap kept while MongoDB is down)."""
+    return max(1, _int_env("LOCATION_BUFFER_MAX", 10_000))
+
+
+_lock = threading.Lock()
+_positions: dict[int, dict] = {}
+_track: list[dict] = []
+_db: Database | None = None
+_flusher: threading.Thread | None = None
+_wake = threading.Event()
+_stop = threading.Event()
+_stats = {"pings": 0, "flushes": 0, "positions_written": 0, "track_points_written": 0, "dropped": 0, "errors": 0}
+
+
+def _ensure_started(db: Database) -> None:
+    global _db, _flusher
+    with _lock:
+        _db = db
+        if _flusher is None:
+            _stop.clear()
+            _flusher = threading.Thread(target=_flush_loop, name="location-flusher", daemon=True)
+            _flusher.start()
+
+
+def record(
+    db: Database,
+    *,
+    worker_id: int,
+    district_key: str,
+    latitude: float,
+    longitude: float,
+    accuracy: float,
+    at: dt.datetime,
+) -> None:
+    """Buffer one ping; a later ping from the same worker replaces the pending position."""
+    _ensure_started(db)
+    coords = {"latitude": float(latitude), "longitude": float(longitude), "accuracy": float(accuracy)}
+    with _lock:
+        _stats["pings"] += 1
+        current = _positions.get(int(worker_id))
+        if current is None or current["updated_at"] <= at:
+            # `location` and `district_key` back the $geoNear lookup in GET /workers/nearest.
+            _positions[int(worker_id)] = {
+                **coords,
+                "location": geo_point(latitude, longitude),
+                "district_key": district_key,
+                "updated_at": at,
+            }
+        _track.append({"worker_id": int(worker_id), "ts": at, **coords})
+        if len(_track) >= _max_buffered():
+            _wake.set()
+
+
+def latest_positions(db: Database, worker_ids: list[int]) -> dict[int, dict]:
+    """Latest known position per worker: stored positions overlaid with unflushed pings."""
+    ids = [int(w) for w in worker_ids]
+    if not ids:
+        return {}
+    out = {int(doc["_id"]): doc for doc in db[POSITIONS_COLLECTION].find({"_id": {"$in": ids}})}
+    with _lock:
+        for wid in ids:
+            pending = _positions.get(wid)
+            if pending is not None and (wid not in out or out[wid]["updated_at"] <= pending["updated_at"]):
+                out[wid] = pending
+    return out
+
+
+def flush(db: Database | None = None) -> int:
+    """Write buffered pings now; returns the number of track points written."""
+    with _lock:
+        db = db or _db
+        if db is None or not _positions:
+            return 0
+        positions, track = dict(_positions), list(_track)
+        _positions.clear()
+        _track.clear()
+
+    try:
+        ops = [
+            # Guarded so an older ping flushed late (e.g. by another process) never wins;
+            # the upsert then collides with the newer document and is skipped.
+            UpdateOne({"_id": wid, "updated_at": {"$lt": p["updated_at"]}}, {"$set": p}, upsert=True)
+            for wid, p in positions.items()
+        ]
+        try:
+            db[POSITIONS_COLLECTION].bulk_write(ops, ordered=False)
+        except BulkWriteError as exc:
+            if any(e.get("code") != _DUPLICATE_KEY for e in exc.details.get("writeErrors", [])):
+                raise
+        db[TRACKS_COLLECTION].insert_many(track, ordered=False)
+    except Exception:
+        logger.exception("Flushing %d worker location pings failed", len(track))
+        _requeue(positions, track)
+        return 0
+
+    with _lock:
+        _stats["flushes"] += 1
+        _stats["positions_written"] += len(positions)
+        _stats["track_points_written"] += len(track)
+    return len(track)
+
+
+def _requeue(positions: dict[int, dict], track: list[dict]) -> None:
+    with _lock:
+        _stats["errors"] += 1
+        for wid, p in positions.items():
+            current = _positions.get(wid)
+            if current is None or current["updated_at"] < p["updated_at"]:
+                _positions[wid] = p
+        _track[:0] = track
+        overflow = len(_track) - _max_buffered()
+        if overflow > 0:
+            # Keep the newest points; the latest positions are never dropped.
+            del _track[:overflow]
+            _stats["dropped"] += overflow
+
+
+def _flush_loop() -> None:
+    while not _stop.is_set():
+        _wake.wait(_flush_seconds())
+        _wake.clear()
+        flush()
+
+
+def shutdown(timeout: float = 10.0) -> None:
+    """Stop the flusher and write whatever is still buffered."""
+    global _flusher
+    with _lock:
+        flusher, _flusher = _flusher, None
+    if flusher is not None:
+        _stop.set()
+        _wake.set()
+        flusher.join(timeout)
+    flush()
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            "pending_positions": len(_positions),
+            "pending_track_points": len(_track),
+            "flush_interval_sec": _flush_seconds(),
+            **_stats,
+        }
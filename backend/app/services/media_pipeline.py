@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+_queue: "queue.Queue[tuple[Callable[..., Any], dict] | None] | None" = None
+_workers: list[threading.Thread] = []
+_lock = threading.Lock()
+
+_sweeper: threading.Thread | None = None
+_sweep_stop = threading.Event()
+
+_counters: dict[str, int] = {"submitted": 0, "completed": 0, "failed": 0, "inline": 0, "swept": 0}
+_stage_stats: dict[str, dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    return max(1, _int_env("MEDIA_WORKERS", 2))
+
+
+def _queue_size() -> int:
+    return max(1, _int_env("MEDIA_QUEUE_SIZE", 100))
+
+
+def _bump(name: str) -> None:
+    with _stats_lock:
+        _counters[name] = _counters.get(name, 0) + 1
+
+
+def _record_stage(name: str, seconds: float) -> None:
+    with _stats_lock:
+        s = _stage_stats.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        ms = seconds * 1000.0
+        s["count"] += 1
+        s["total_ms"] += ms
+        if ms > s["max_ms"]:
+            s["max_ms"] = ms
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time one step of a media job (e.g. `qr`, `annotate`, `upload_image`)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_stage(name, time.perf_counter() - started)
+
+
+def _run(fn: Callable[..., Any], kwargs: dict) -> None:
+    try:
+        with stage("job"):
+            fn(**kwargs)
+        _bump("completed")
+    except Exception:
+        _bump("failed")
+        logger.exception("Media job %s failed", getattr(fn, "__name__", fn))
+
+
+def _worker_loop(q: "queue.Queue[tuple[Callable[..., Any], dict] | None]") -> None:
+    while True:
+        item = q.get()
+        try:
+            if item is None:
+                return
+            fn, kwargs = item
+            _run(fn, kwargs)
+        finally:
+            q.task_done()
+
+
+def _ensure_started() -> "queue.Queue[tuple[Callable[..., Any], dict] | None]":
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = queue.Queue(maxsize=_queue_size())
+            for i in range(_worker_count()):
+                t = threading.Thread(target=_worker_loop, args=(_queue,), name=f"media-worker-{i}", daemon=True)
+                t.start()
+                _workers.append(t)
+        return _queue
+
+
+def submit(fn: Callable[..., Any], **kwargs: Any) -> bool:
+    """Queue `fn(**kwargs)` on the bounded media worker pool.
+
+    Returns False when the queue is full; the job then runs inline in the
+    caller so that back-pressure lands on the submitting request instead of
+    growing memory without bound.
+    """
+
+    q = _ensure_started()
+    _bump("submitted")
+    try:
+        q.put_nowait((fn, kwargs))
+        return True
+    except queue.Full:
+        _bump("inline")
+        _run(fn, kwargs)
+        return False
+
+
+def _sweep_loop(sweep: Callable[[], int], interval_sec: float) -> None:
+    while not _sweep_stop.is_set():
+        try:
+            swept = sweep()
+            if swept:
+                logger.info("Re-queued %d orphaned media jobs", swept)
+                with _stats_lock:
+                    _counters["swept"] += swept
+        except Exception:
+            logger.exception("Media sweep failed")
+        _sweep_stop.wait(interval_sec)
+
+
+def start_sweeper(sweep: Callable[[], int], interval_sec: float) -> None:
+    """Run `sweep` now and every `interval_sec` on a daemon thread.
+
+    Queued jobs live only in this process, so jobs lost to a restart are
+    found again by the sweep (it returns how many it re-queued).
+    """
+
+    global _sweeper
+    with _lock:
+        if _sweeper is not None:
+            return
+        _sweep_stop.clear()
+        _sweeper = threading.Thread(
+            target=_sweep_loop, args=(sweep, max(1.0, interval_sec)), name="media-sweeper", daemon=True
+        )
+        _sweeper.start()
+
+
+def shutdown(timeout: float = 10.0) -> None:
+    """Stop the workers after the queued jobs have drained (best-effort, bounded by `timeout`)."""
+    global _queue, _sweeper
+    with _lock:
+        q = _queue
+        workers = list(_workers)
+        sweeper = _sweeper
+        _queue = None
+        _sweeper = None
+        _workers.clear()
+    _sweep_stop.set()
+    deadline = time.monotonic() + timeout
+    if sweeper is not None:
+        sweeper.join(max(0.0, deadline - time.monotonic()))
+    if q is None:
+        return
+    for _ in workers:
+        try:
+            q.put(None, timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Full:
+            # Workers are daemons; whatever is left is picked up by the next sweep.
+            break
+    for t in workers:
+        t.join(max(0.0, deadline - time.monotonic()))
+
+
+def stats() -> dict:
+    q = _queue
+    with _stats_lock:
+        stages = {
+            name: {
+                "count": int(s["count"]),
+                "avg_ms": round(s["total_ms"] / s["count"], 1) if s["count"] else 0.0,
+                "max_ms": round(s["max_ms"], 1),
+            }
+            for name, s in _stage_stats.items()
+        }
+        counters = dict(_counters)
+    return {
+        "workers": len(_workers),
+        "queue_depth": q.qsize() if q is not None else 0,
+        "queue_capacity": _queue_size(),
+        **counters,
+        "stages": stages,
+    }
@@ -0,0 +1,70 @@
+"""Keyset pagination for report lists.
+
+Pages are ordered by `(field DESC, id DESC)` and the next page starts strictly
+after the last row served, so every page is one index range scan, whatever
+its depth (no `skip()`). The cursor handed to clients is the last row's sort
+key, base64url-encoded; clients pass it back unchanged.
+
+Rows without the sort field (e.g. reports assigned before `assigned_at` was
+stored) sort after every dated row, ordered by id alone.
+"""
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+
+from pymongo import DESCENDING
+from pymongo.collection import Collection
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(field: str, row: dict) -> str:
+    value = row.get(field)
+    key = [value.isoformat() if isinstance(value, dt.datetime) else None, int(row.get("id", 0))]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[dt.datetime | None, int]:
+    """Sort key encoded by `encode_cursor` (value None for rows without the field); raises ValueError for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value, report_id = json.loads(raw)
+        return (None if value is None else dt.datetime.fromisoformat(value)), int(report_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _after(field: str, value: dt.datetime | None, report_id: int) -> dict:
+    """Rows sorting strictly after `(value, report_id)`; missing/null values come last."""
+    if value is None:
+        return {field: None, "id": {"$lt": report_id}}
+    return {"$or": [{field: {"$lt": value}}, {field: value, "id": {"$lt": report_id}}, {field: None}]}
+
+
+def page(
+    collection: Collection,
+    query: dict,
+    field: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """One page of `query` newest-first by `field`, and the cursor of the next page (None on the last one).
+
+    `limit=0` returns every remaining row. It is a temporary opt-out for
+    clients that predate paging and will be removed.
+    """
+
+    if cursor:
+        query = {"$and": [query, _after(field, *decode_cursor(cursor))]}
+    found = collection.find(query).sort([(field, DESCENDING), ("id", DESCENDING)])
+    if limit == 0:
+        return list(found), None
+    rows = list(found.limit(limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(field, rows[-1])
@@ -0,0 +1,679 @@
+"""Distance-based hotspot clustering of open reports (grid-hash DBSCAN).
+
+Reports within PROXIMITY_RADIUS_M of each other are chained into one cluster
+(DBSCAN with min_samples=1, i.e. single-linkage at the radius). Candidate
+pairs come from a spatial hash over an equirectangular projection shared by
+the whole batch, with cells widened so that projection error never hides a
+neighbour; candidates are then confirmed with haversine. Distance checks are
+NumPy-vectorized and components are labelled with SciPy's sparse-graph
+connected_components.
+
+The engine keeps the open reports of this process in memory. Local writes
+update it incrementally (new reports join or merge clusters in place; status
+changes and votes patch it) and patch the cached groups() rows of the affected
+clusters only. cluster_service reloads it from MongoDB
+every PROXIMITY_REFRESH_SEC so writes from other processes are picked up
+within that bound.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+import time
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from backend.app.services.districts import district_key
+from backend.app.services.geo import EARTH_RADIUS_M, haversine_pairs, within_radius
+
+OPEN_STATUSES = ("submitted", "accepted", "assigned")
+# Cap on candidate pairs materialized at once while scanning dense cells.
+_PAIR_CHUNK = 4_000_000
+# Headroom on the projected cell size for the planar approximation itself.
+_SLACK = 1.01
+# Floor on cos(latitude) so polar points cannot blow up the cell size.
+_MIN_COS = 0.01
+# Widest neighbourhood (in cells) the fine-grid labelling scans before
+# falling back to enumerating every candidate pair.
+_MAX_REACH = 6
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def radius_m() -> float:
+    return max(1.0, _float_env("PROXIMITY_RADIUS_M", 100.0))
+
+
+def _refresh_seconds() -> float:
+    return _float_env("PROXIMITY_REFRESH_SEC", 30.0)
+
+
+def _epoch(value) -> float:
+    """Seconds since the epoch for a naive-UTC `created_at` (now when missing)."""
+    if isinstance(value, dt.datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=dt.timezone.utc)).timestamp()
+    return time.time()
+
+
+def _frame(lat: np.ndarray) -> float:
+    """cos of the reference latitude (the batch mean) for `_project`."""
+    return max(_MIN_COS, float(np.cos(np.radians(np.mean(lat))))) if len(lat) else 1.0
+
+
+def _stretch(lat: np.ndarray, cos0: float) -> float:
+    """Largest factor by which `_project` overstates east-west distances at these latitudes."""
+    if not len(lat):
+        return _SLACK
+    cos_min = max(_MIN_COS, float(np.cos(np.radians(np.max(np.abs(lat))))))
+    return max(1.0, cos0 / cos_min) * _SLACK
+
+
+def _shrink(lat: np.ndarray, cos0: float) -> float:
+    """Largest factor by which `_project` understates east-west distances at these latitudes."""
+    if not len(lat):
+        return _SLACK
+    cos_max = float(np.cos(np.radians(np.min(np.abs(lat)))))
+    return max(1.0, cos_max / cos0) * _SLACK
+
+
+def _project(lat: np.ndarray, lon: np.ndarray, cos0: float) -> tuple[np.ndarray, np.ndarray]:
+    """Equirectangular projection to meters with one reference latitude for all points.
+
+    Distances come out exact north-south and scaled by cos0 / cos(lat) east-west,
+    so they are only used to find candidates (see `_stretch`), never to decide.
+    """
+    return EARTH_RADIUS_M * cos0 * np.radians(lon), EARTH_RADIUS_M * np.radians(lat)
+
+
+def _cells(x: np.ndarray, y: np.ndarray, eps: float) -> tuple[np.ndarray, np.ndarray]:
+    return np.floor(x / eps).astype(np.int64), np.floor(y / eps).astype(np.int64)
+
+
+def _pairs_within(lat: np.ndarray, lon: np.ndarray, eps: float) -> tuple[np.ndarray, np.ndarray]:
+    """All index pairs (i < j) within `eps` meters (haversine), via a hash grid over the projection."""
+    n = len(lat)
+    if n < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    cos0 = _frame(lat)
+    x, y = _project(lat, lon, cos0)
+    cell = eps * _stretch(lat, cos0)
+    cx, cy = _cells(x, y, cell)
+    # Points sorted by cell; each cell is a contiguous run [start, start + count).
+    key = (cx << 32) ^ (cy & 0xFFFFFFFF)
+    order = np.argsort(key, kind="stable")
+    skey = key[order]
+    ukeys, starts, counts = np.unique(skey, return_index=True, return_counts=True)
+    ucx = cx[order][starts]
+    ucy = cy[order][starts]
+
+    out_i: list[np.ndarray] = []
+    out_j: list[np.ndarray] = []
+    cell2 = cell * cell
+    # Half of the 3x3 neighbourhood, so each cell pair is visited once.
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        nkey = ((ucx + dx) << 32) ^ ((ucy + dy) & 0xFFFFFFFF)
+        pos = np.searchsorted(ukeys, nkey)
+        pos = np.minimum(pos, len(ukeys) - 1)
+        hit = ukeys[pos] == nkey
+        src = np.nonzero(hit)[0]
+        dst = pos[hit]
+        sizes = counts[src] * counts[dst]
+
+        # Expand cell pairs into point pairs, chunked to bound memory in dense areas.
+        csum = np.cumsum(sizes)
+        lo = 0
+        while lo < len(src):
+            base = int(csum[lo - 1]) if lo else 0
+            hi = max(lo + 1, int(np.searchsorted(csum, base + _PAIR_CHUNK, side="right")))
+            s_src, s_dst, s_sizes = src[lo:hi], dst[lo:hi], sizes[lo:hi]
+            lo = hi
+            total = int(s_sizes.sum())
+            if total == 0:
+                continue
+            p = np.repeat(np.arange(len(s_src)), s_sizes)
+            k = np.arange(total) - np.repeat(np.cumsum(s_sizes) - s_sizes, s_sizes)
+            width = counts[s_dst][p]
+            i = order[starts[s_src][p] + k // width]
+            j = order[starts[s_dst][p] + k % width]
+            if dx == 0 and dy == 0:
+                keep = i < j
+                i, j = i[keep], j[keep]
+            near = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 <= cell2
+            i, j = i[near], j[near]
+            close = haversine_pairs(lat[i], lon[i], lat[j], lon[j]) <= eps
+            out_i.append(i[close])
+            out_j.append(j[close])
+
+    if not out_i:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(out_i), np.concatenate(out_j)
+
+
+def _components(n: int, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """Connected-component label (smallest member index) for each of n nodes."""
+    if len(i) == 0:
+        return np.arange(n, dtype=np.int64)
+    graph = coo_matrix((np.ones(len(i), dtype=np.int8), (i, j)), shape=(n, n)).tocsr()
+    _, comp = connected_components(graph, directed=False)
+    # First occurrence of each component == its smallest member index.
+    _, first, inv = np.unique(comp, return_index=True, return_inverse=True)
+    return first[inv].astype(np.int64)
+
+
+def _isolated(lat: np.ndarray, lon: np.ndarray, eps: float) -> np.ndarray:
+    """Mask of points with no other point in their own or any neighbouring candidate cell."""
+    n = len(lat)
+    if n < 2:
+        return np.ones(n, dtype=bool)
+    cos0 = _frame(lat)
+    x, y = _project(lat, lon, cos0)
+    cx, cy = _cells(x, y, eps * _stretch(lat, cos0))
+    cx = cx - cx.min() + 1
+    cy = cy - cy.min() + 1
+    ukeys, cell_of, counts = np.unique((cx << 32) | cy, return_inverse=True, return_counts=True)
+    ucx, ucy = ukeys >> 32, ukeys & 0xFFFFFFFF
+    crowded = counts > 1
+    for dx, dy in ((1, -1), (1, 0), (1, 1), (0, 1)):
+        nkey = ((ucx + dx) << 32) | (ucy + dy)
+        pos = np.minimum(np.searchsorted(ukeys, nkey), len(ukeys) - 1)
+        hit = ukeys[pos] == nkey
+        crowded[hit] = True
+        crowded[pos[hit]] = True
+    return ~crowded[cell_of.ravel()]
+
+
+def _cell_pairs(
+    src: np.ndarray,
+    dst: np.ndarray,
+    order: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    lat: np.ndarray,
+    lon: np.ndarray,
+    eps: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Point pairs within `eps` meters (haversine) between cells `src[k]` and `dst[k]` (distinct cells)."""
+    out_i: list[np.ndarray] = []
+    out_j: list[np.ndarray] = []
+    sizes = counts[src] * counts[dst]
+    csum = np.cumsum(sizes)
+    lo = 0
+    # Expand cell pairs into point pairs, chunked to bound memory in dense areas.
+    while lo < len(src):
+        base = int(csum[lo - 1]) if lo else 0
+        hi = max(lo + 1, int(np.searchsorted(csum, base + _PAIR_CHUNK, side="right")))
+        s_src, s_dst, s_sizes = src[lo:hi], dst[lo:hi], sizes[lo:hi]
+        lo = hi
+        total = int(s_sizes.sum())
+        if total == 0:
+            continue
+        p = np.repeat(np.arange(len(s_src)), s_sizes)
+        k = np.arange(total) - np.repeat(np.cumsum(s_sizes) - s_sizes, s_sizes)
+        width = counts[s_dst][p]
+        i = order[starts[s_src][p] + k // width]
+        j = order[starts[s_dst][p] + k % width]
+        close = haversine_pairs(lat[i], lon[i], lat[j], lon[j]) <= eps
+        out_i.append(i[close])
+        out_j.append(j[close])
+    if not out_i:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(out_i), np.concatenate(out_j)
+
+
+def _labels_by_cells(lat: np.ndarray, lon: np.ndarray, eps: float) -> np.ndarray | None:
+    """Component labels via a fine grid whose neighbouring cells are always connected.
+
+    Cells are sized so that any two points in the same or in 8-adjacent cells
+    are within `eps`, so those cells are joined without looking at points.
+    Only cells further apart (up to the candidate reach) whose components
+    still differ are compared point by point. Dense areas therefore cost
+    O(cells), not O(pairs). Returns None when the latitude spread makes the
+    reach too wide for this to pay off.
+    """
+
+    cos0 = _frame(lat)
+    side = eps / (2 * np.sqrt(2) * _shrink(lat, cos0))
+    reach = int(np.ceil(eps * _stretch(lat, cos0) / side))
+    if reach > _MAX_REACH:
+        return None
+
+    x, y = _project(lat, lon, cos0)
+    cx, cy = _cells(x, y, side)
+    # Non-negative cell coordinates make the keys sort like (cx, cy), so every
+    # shifted key array below is sorted too and searchsorted stays cache-friendly.
+    cx = cx - cx.min() + reach + 1
+    cy = cy - cy.min() + reach + 1
+    key = (cx << 32) | cy
+    ukeys, first, cell_of, counts = np.unique(key, return_index=True, return_inverse=True, return_counts=True)
+    cell_of = cell_of.ravel()
+    m = len(ukeys)
+    ucx, ucy = cx[first], cy[first]
+    # Points sorted by cell; cell c is order[starts[c]:starts[c] + counts[c]].
+    order = np.argsort(cell_of, kind="stable")
+    starts = np.cumsum(counts) - counts
+
+    def neighbours(dx: int, dy: int) -> tuple[np.ndarray, np.ndarray]:
+        nkey = ((ucx + dx) << 32) | (ucy + dy)
+        pos = np.minimum(np.searchsorted(ukeys, nkey), m - 1)
+        hit = ukeys[pos] == nkey
+        return np.nonzero(hit)[0], pos[hit]
+
+    edges_i: list[np.ndarray] = []
+    edges_j: list[np.ndarray] = []
+    for dx, dy in ((1, -1), (1, 0), (1, 1), (0, 1)):
+        src, dst = neighbours(dx, dy)
+        edges_i.append(src)
+        edges_j.append(dst)
+    comp = _components(m, np.concatenate(edges_i), np.concatenate(edges_j))
+
+    # Half of the wider neighbourhood, skipping cells that can never hold a pair within eps.
+    limit = eps * _stretch(lat, cos0)
+    for dx in range(0, reach + 1):
+        for dy in range(-reach, reach + 1):
+            if (dx == 0 and dy <= 0) or max(abs(dx), abs(dy)) <= 1:
+                continue
+            if side * np.hypot(max(abs(dx) - 1, 0), max(abs(dy) - 1, 0)) > limit:
+                continue
+            src, dst = neighbours(dx, dy)
+            apart = comp[src] != comp[dst]
+            i, j = _cell_pairs(src[apart], dst[apart], order, starts, counts, lat, lon, eps)
+            edges_i.append(cell_of[i])
+            edges_j.append(cell_of[j])
+    comp = _components(m, np.concatenate(edges_i), np.concatenate(edges_j))
+
+    # Relabel by the smallest point index of each component.
+    _, smallest, inv = np.unique(comp[cell_of], return_index=True, return_inverse=True)
+    return smallest[inv.ravel()].astype(np.int64)
+
+
+def cluster_points(lat: np.ndarray, lon: np.ndarray, radius: float | None = None) -> np.ndarray:
+    """Cluster label per point: points within `radius` meters (transitively) share a label.
+
+    The label is the smallest index of the cluster's points.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    eps = float(radius or radius_m())
+    labels = np.arange(len(lat), dtype=np.int64)
+    # Points alone in their neighbourhood are their own cluster; label only the rest.
+    idx = np.nonzero(~_isolated(lat, lon, eps))[0]
+    if len(idx) < 2:
+        return labels
+    sub = _labels_by_cells(lat[idx], lon[idx], eps)
+    if sub is None:
+        i, j = _pairs_within(lat[idx], lon[idx], eps)
+        sub = _components(len(idx), i, j)
+    labels[idx] = idx[sub]
+    return labels
+
+
+# --- process-local engine -------------------------------------------------
+
+_lock = threading.RLock()
+_state: dict = {}
+# (district_key, now, half_life_hours) -> cached groups(); patched in place on writes.
+_results: dict[tuple, "_Groups"] = {}
+
+# Per-point columns, held in NumPy arrays with spare capacity so inserts do not copy.
+_COLUMNS = {
+    "id": np.int64,
+    "lat": np.float64,
+    "lon": np.float64,
+    "weight": np.int64,
+    "agree": np.int64,
+    "disagree": np.int64,
+    "district": np.int64,
+    "created": np.float64,
+    "alive": bool,
+    "labels": np.int64,
+}
+_MIN_CAPACITY = 1024
+
+
+def _district_code(key: str) -> int:
+    codes = _state["districts"]
+    return codes.setdefault(key, len(codes))
+
+
+def _reset(rows: list[dict], eps: float) -> None:
+    n = len(rows)
+    cap = max(_MIN_CAPACITY, 2 * n)
+    _state.clear()
+    _state.update({"eps": eps, "loaded_at": time.monotonic(), "n": n, "districts": {}, "labels_ready": False})
+    values = {
+        "id": [int(r.get("id", 0)) for r in rows],
+        "lat": [float(r.get("latitude", 0.0)) for r in rows],
+        "lon": [float(r.get("longitude", 0.0)) for r in rows],
+        "weight": [int(r.get("weight", 1)) for r in rows],
+        "agree": [int(r.get("agree_count") or 0) for r in rows],
+        "disagree": [int(r.get("disagree_count") or 0) for r in rows],
+        "district": [_district_code(district_key(r.get("district"))) for r in rows],
+        "created": [_epoch(r.get("created_at")) for r in rows],
+        "alive": [True] * n,
+        "labels": [-1] * n,
+    }
+    for name, dtype in _COLUMNS.items():
+        column = np.zeros(cap, dtype=dtype)
+        column[:n] = values[name]
+        _state[name] = column
+    _state["index"] = {rid: k for k, rid in enumerate(values["id"])}
+    _results.clear()
+
+
+def _append(report: dict, weight: int) -> int:
+    """Store a point at the end of the columns (growing them by doubling) and return its index."""
+    k = _state["n"]
+    if k == len(_state["id"]):
+        for name in _COLUMNS:
+            grown = np.zeros(2 * k, dtype=_state[name].dtype)
+            grown[:k] = _state[name][:k]
+            _state[name] = grown
+    _state["id"][k] = int(report.get("id", 0))
+    _state["lat"][k] = float(report.get("latitude", 0.0))
+    _state["lon"][k] = float(report.get("longitude", 0.0))
+    _state["weight"][k] = int(weight)
+    _state["agree"][k] = int(report.get("agree_count") or 0)
+    _state["disagree"][k] = int(report.get("disagree_count") or 0)
+    _state["district"][k] = _district_code(district_key(report.get("district")))
+    _state["created"][k] = _epoch(report.get("created_at"))
+    _state["alive"][k] = True
+    _state["labels"][k] = -1
+    _state["n"] = k + 1
+    _state["index"][int(report.get("id", 0))] = k
+    return k
+
+
+def _ensure_labels() -> np.ndarray:
+    """Labels of the first n points (smallest member index; -1 for closed reports), computed in batch if needed."""
+    n = _state["n"]
+    labels = _state["labels"]
+    if not _state["labels_ready"]:
+        idx = np.nonzero(_state["alive"][:n])[0]
+        labels[:n] = -1
+        labels[idx] = idx[cluster_points(_state["lat"][idx], _state["lon"][idx], _state["eps"])]
+        _state["labels_ready"] = True
+        _results.clear()
+    return labels[:n]
+
+
+def _row(acc: list) -> dict:
+    """Render one groups() row from its running aggregate (see `_rows`)."""
+    count, max_weight, agree, disagree, lat_sum, lon_sum, score, first_id = acc
+    return {
+        "cluster_id": f"p{int(first_id)}",
+        "latitude": float(np.round(lat_sum / count, 6)),
+        "longitude": float(np.round(lon_sum / count, 6)),
+        "report_count": int(count),
+        "max_weight": int(max_weight),
+        "agree": int(agree),
+        "disagree": int(disagree),
+        "hotspot_score": float(np.round(score, 3)),
+    }
+
+
+def _decayed(weights, created, now: dt.datetime, half_life_hours: float):
+    return weights * 0.5 ** (np.maximum(0.0, _epoch(now) - created) / 3600.0 / half_life_hours)
+
+
+def _rows(idx: np.ndarray, labels: np.ndarray, now: dt.datetime, half_life_hours: float) -> "_Groups":
+    """Aggregates and rendered rows of the points `idx` grouped by their `labels`."""
+    uniq, inv = np.unique(labels, return_inverse=True)
+    inv = inv.ravel()
+    g = len(uniq)
+    weights = _state["weight"][idx]
+    count = np.bincount(inv, minlength=g)
+    max_weight = np.zeros(g, dtype=np.int64)
+    np.maximum.at(max_weight, inv, weights)
+    first_id = np.full(g, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first_id, inv, _state["id"][idx])
+    agree = np.bincount(inv, weights=_state["agree"][idx], minlength=g).astype(np.int64)
+    disagree = np.bincount(inv, weights=_state["disagree"][idx], minlength=g).astype(np.int64)
+    lat_sum = np.bincount(inv, weights=_state["lat"][idx], minlength=g)
+    lon_sum = np.bincount(inv, weights=_state["lon"][idx], minlength=g)
+    score = np.bincount(inv, weights=_decayed(weights, _state["created"][idx], now, half_life_hours), minlength=g)
+
+    columns = (count, max_weight, agree, disagree, lat_sum, lon_sum, score, first_id)
+    rows = {
+        label: {
+            "cluster_id": f"p{cid}",
+            "latitude": la,
+            "longitude": lo,
+            "report_count": c,
+            "max_weight": mw,
+            "agree": a,
+            "disagree": d,
+            "hotspot_score": sc,
+        }
+        for label, cid, la, lo, c, mw, a, d, sc in zip(
+            uniq.tolist(),
+            first_id.tolist(),
+            np.round(lat_sum / count, 6).tolist(),
+            np.round(lon_sum / count, 6).tolist(),
+            count.tolist(),
+            max_weight.tolist(),
+            agree.tolist(),
+            disagree.tolist(),
+            np.round(score, 3).tolist(),
+        )
+    }
+    return _Groups(dict(zip(uniq.tolist(), range(g))), columns, rows)
+
+
+class _Groups:
+    """Cached groups() result for one (district, now, half-life).
+
+    Rows are kept by cluster label together with their running aggregates,
+    which stay in the batch columns until a write patches the label.
+    """
+
+    def __init__(self, pos: dict[int, int], columns: tuple, rows: dict[int, dict]) -> None:
+        self.pos = pos
+        self.columns = columns
+        self.patched: dict[int, list] = {}
+        self.rows = rows
+
+    def acc(self, label: int) -> list | None:
+        acc = self.patched.get(label)
+        if acc is None and label in self.pos:
+            acc = [c[self.pos[label]].item() for c in self.columns]
+        return acc
+
+    def set(self, label: int, acc: list | None) -> None:
+        self.pos.pop(label, None)
+        if acc is None or acc[0] == 0:
+            self.patched.pop(label, None)
+            self.rows.pop(label, None)
+        else:
+            self.patched[label] = acc
+            self.rows[label] = _row(acc)
+
+    def update(self, other: "_Groups") -> None:
+        for label in other.rows:
+            self.set(label, other.acc(label))
+
+
+def _visible(key: tuple, k: int) -> bool:
+    return not key[0] or _state["districts"].get(key[0]) == int(_state["district"][k])
+
+
+def _point_acc(key: tuple, k: int) -> list:
+    weight = int(_state["weight"][k])
+    return [
+        1,
+        weight,
+        int(_state["agree"][k]),
+        int(_state["disagree"][k]),
+        float(_state["lat"][k]),
+        float(_state["lon"][k]),
+        float(_decayed(weight, _state["created"][k], key[1], key[2])),
+        int(_state["id"][k]),
+    ]
+
+
+def _merge_accs(accs: list[list]) -> list | None:
+    if not accs:
+        return None
+    return [
+        sum(a[0] for a in accs),
+        max(a[1] for a in accs),
+        sum(a[2] for a in accs),
+        sum(a[3] for a in accs),
+        sum(a[4] for a in accs),
+        sum(a[5] for a in accs),
+        sum(a[6] for a in accs),
+        min(a[7] for a in accs),
+    ]
+
+
+def _join(k: int) -> None:
+    """Attach open point k to the clusters within eps of it, merging them if it bridges several.
+
+    Cached results are updated from the merged clusters' aggregates, without
+    touching their members.
+    """
+    labels = _state["labels"]
+    n = _state["n"]
+    near, _ = within_radius(
+        float(_state["lat"][k]), float(_state["lon"][k]), _state["lat"][:n], _state["lon"][:n], _state["eps"]
+    )
+    near = near[(near != k) & (labels[near] >= 0)]
+    merged = set(np.unique(labels[near]).tolist())
+    label = min(merged | {k})
+    stale = merged - {label}
+    if stale:
+        labels[:n][np.isin(labels[:n], list(stale))] = label
+    labels[k] = label
+
+    for key, cached in _results.items():
+        parts = [acc for acc in map(cached.acc, merged) if acc is not None]
+        if _visible(key, k):
+            parts.append(_point_acc(key, k))
+        for m in stale:
+            cached.set(m, None)
+        cached.set(label, _merge_accs(parts))
+
+
+def _split(k: int) -> None:
+    """Drop point k from its cluster and relabel the rest, which may fall apart into several clusters."""
+    labels = _state["labels"]
+    n = _state["n"]
+    old = int(labels[k])
+    labels[k] = -1
+    idx = np.nonzero(labels[:n] == old)[0]
+    if len(idx):
+        labels[idx] = idx[cluster_points(_state["lat"][idx], _state["lon"][idx], _state["eps"])]
+    for key, cached in _results.items():
+        cached.set(old, None)
+        visible = idx[_state["district"][idx] == _state["districts"].get(key[0], -1)] if key[0] else idx
+        if len(visible):
+            cached.update(_rows(visible, labels[visible], key[1], key[2]))
+
+
+def load(rows: list[dict]) -> None:
+    """Replace the engine contents with `rows` (open reports carrying a `weight`)."""
+    with _lock:
+        _reset(rows, radius_m())
+
+
+def is_fresh() -> bool:
+    with _lock:
+        return (
+            bool(_state)
+            and _state["eps"] == radius_m()
+            and time.monotonic() - _state["loaded_at"] <= _refresh_seconds()
+        )
+
+
+def add_report(report: dict, weight: int) -> None:
+    """Insert a new open report, joining or merging clusters without a full recompute.
+
+    Cached groups() results are patched for the affected clusters only.
+    """
+    with _lock:
+        if not _state or int(report.get("id", 0)) in _state["index"]:
+            return
+        if str(report.get("status") or "submitted") not in OPEN_STATUSES:
+            return
+        k = _append(report, weight)
+        if _state["labels_ready"]:
+            _join(k)
+
+
+def update_report(report_id: int, *, status: str | None = None, vote: int | None = None) -> None:
+    """Apply a status change or a vote to a report held by the engine."""
+    with _lock:
+        if not _state:
+            return
+        k = _state["index"].get(int(report_id))
+        if k is None:
+            return
+        alive = bool(_state["alive"][k])
+        if vote is not None:
+            column = "agree" if int(vote) == 1 else "disagree"
+            _state[column][k] += 1
+            if alive and _state["labels_ready"]:
+                label = int(_state["labels"][k])
+                for key, cached in _results.items():
+                    acc = cached.acc(label) if _visible(key, k) else None
+                    if acc is not None:
+                        acc = list(acc)
+                        acc[2 if column == "agree" else 3] += 1
+                        cached.set(label, acc)
+        if status is not None and (status in OPEN_STATUSES) != alive:
+            _state["alive"][k] = not alive
+            if _state["labels_ready"]:
+                # A closed report can split its cluster; a reopened one can merge several.
+                _split(k) if alive else _join(k)
+
+
+def groups(district: str | None = None, *, now: dt.datetime, half_life_hours: float) -> list[dict]:
+    """Per-cluster aggregates of the loaded points, optionally limited to one district.
+
+    Each row has `cluster_id` (`p<smallest report id>`), centroid `latitude`/
+    `longitude`, `report_count`, `max_weight`, `agree`, `disagree` and
+    `hotspot_score` (member weights decayed by age at `now`).
+    Results are cached per (district, now, half-life) and patched in place
+    by writes, so only a new scoring hour recomputes them.
+    """
+
+    key = (district_key(district), now, half_life_hours)
+    with _lock:
+        if not _state:
+            return []
+        labels = _ensure_labels()
+        rows = _results.get(key)
+        if rows is None:
+            for old in [k for k in _results if k[1:] != key[1:]]:
+                del _results[old]
+            mask = labels >= 0
+            if key[0]:
+                code = _state["districts"].get(key[0])
+                mask &= _state["district"][: _state["n"]] == (-1 if code is None else code)
+            idx = np.nonzero(mask)[0]
+            rows = _rows(idx, labels[idx], now, half_life_hours) if len(idx) else _Groups({}, (), {})
+            _results[key] = rows
+        return list(rows.rows.values())
+
+
+def stats() -> dict:
+    with _lock:
+        if not _state:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "points": int(_state["alive"][: _state["n"]].sum()),
+            "radius_m": _state["eps"],
+            "age_sec": round(time.monotonic() - _state["loaded_at"], 1),
+        }
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import uuid
 from pathlib import Path
 
 import qrcode
@@ -14,5 +16,11 @@ def generate_qr_for_report(*, report_id: int, latitude: float, longitude: float)
     img = qrcode.make(url)
     filename = f"report_{report_id}.png"
     out_path = qr_dir / filename
-    img.save(out_path)
+    # Media jobs may run twice for one report; never let two writers interleave.
+    partial = out_path.with_name(f".{filename}.{uuid.uuid4().hex}.part")
+    try:
+        img.save(partial, format="PNG")
+        os.replace(partial, out_path)
+    finally:
+        partial.unlink(missing_ok=True)
     return f"qr/{filename}"
@@ -0,0 +1,234 @@
+"""Process-local grid index of open reports for nearby lookups.
+
+Open reports (submitted/accepted/assigned) are bucketed into CELL_DEG-sized
+lat/lon cells together with the fields the validation screen shows, so a
+nearby query touches only the cells around the caller and never MongoDB.
+
+Writes made through this process (new reports, status changes) update the
+index immediately via the cluster_service write hooks. Writes from other
+processes are picked up by a full reload once the index is older than
+REPORT_INDEX_REFRESH_SEC, which is the staleness bound for those. Reloads
+run on a background thread, one at a time, while queries keep using the
+current snapshot; only the very first load blocks. Writes that land while a
+reload scans MongoDB are logged and replayed onto the new snapshot before it
+is swapped in, so the scan cannot undo them.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+
+from pymongo.database import Database
+
+from backend.app.services.geo import bbox_around, haversine_many
+from backend.app.services.proximity_clusters import OPEN_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# ~1.1 km of latitude per cell.
+CELL_DEG = 0.01
+
+_FIELDS = {
+    "_id": 0,
+    "id": 1,
+    "user_id": 1,
+    "latitude": 1,
+    "longitude": 1,
+    "district": 1,
+    "description": 1,
+    "severity": 1,
+    "created_at": 1,
+}
+
+_lock = threading.Lock()
+_reports: dict[int, dict] = {}
+_cells: dict[tuple[int, int], set[int]] = {}
+_loaded_at: float | None = None
+_reloading = False
+# Write-hook changes seen while a load is scanning, as (report id, entry or None
+# for a removal); None when no load is running.
+_pending: list[tuple[int, dict | None]] | None = None
+# Serializes loads so concurrent callers never scan MongoDB in parallel.
+_load_lock = threading.Lock()
+_stats = {"reloads": 0, "queries": 0, "reload_errors": 0}
+
+
+def enabled() -> bool:
+    return os.getenv("REPORT_INDEX_ENABLED", "1").strip().lower() not in {"0", "false", "no"}
+
+
+def _refresh_seconds() -> float:
+    try:
+        return float(os.getenv("REPORT_INDEX_REFRESH_SEC", "60"))
+    except Exception:
+        return 60.0
+
+
+def _cell(latitude: float, longitude: float) -> tuple[int, int]:
+    return math.floor(latitude / CELL_DEG), math.floor(longitude / CELL_DEG)
+
+
+def _entry(report: dict) -> dict:
+    return {
+        "id": int(report.get("id", 0)),
+        "user_id": int(report.get("user_id", 0)),
+        "latitude": float(report.get("latitude", 0.0)),
+        "longitude": float(report.get("longitude", 0.0)),
+        "district": str(report.get("district") or ""),
+        "description": str(report.get("description") or ""),
+        "severity": report.get("severity", "Low"),
+        "created_at": report.get("created_at"),
+    }
+
+
+def _insert_locked(entry: dict) -> None:
+    _remove_locked(entry["id"])
+    _reports[entry["id"]] = entry
+    _cells.setdefault(_cell(entry["latitude"], entry["longitude"]), set()).add(entry["id"])
+
+
+def _remove_locked(report_id: int) -> None:
+    old = _reports.pop(report_id, None)
+    if old is None:
+        return
+    cell = _cell(old["latitude"], old["longitude"])
+    members = _cells.get(cell)
+    if members is not None:
+        members.discard(report_id)
+        if not members:
+            del _cells[cell]
+
+
+def _apply_locked(report_id: int, entry: dict | None) -> None:
+    if _loaded_at is not None:
+        if entry is None:
+            _remove_locked(report_id)
+        else:
+            _insert_locked(entry)
+    if _pending is not None:
+        _pending.append((report_id, entry))
+
+
+def _load_locked(db: Database) -> int:
+    global _reports, _cells, _loaded_at, _pending
+    with _lock:
+        _pending = []
+    try:
+        reports: dict[int, dict] = {}
+        cells: dict[tuple[int, int], set[int]] = {}
+        for r in db["reports"].find({"status": {"$in": list(OPEN_STATUSES)}}, _FIELDS):
+            entry = _entry(r)
+            reports[entry["id"]] = entry
+            cells.setdefault(_cell(entry["latitude"], entry["longitude"]), set()).add(entry["id"])
+        with _lock:
+            _reports, _cells, _loaded_at = reports, cells, time.monotonic()
+            # Replay the writes the scan may have missed, in order.
+            for report_id, entry in _pending:
+                if entry is None:
+                    _remove_locked(report_id)
+                else:
+                    _insert_locked(entry)
+            _stats["reloads"] += 1
+            return len(_reports)
+    finally:
+        with _lock:
+            _pending = None
+
+
+def load(db: Database) -> int:
+    """Rebuild the index from MongoDB; returns the number of open reports indexed."""
+    with _load_lock:
+        return _load_locked(db)
+
+
+def _reload(db: Database) -> None:
+    global _reloading
+    try:
+        load(db)
+    except Exception:
+        logger.exception("Reloading the report index failed")
+        with _lock:
+            _stats["reload_errors"] += 1
+    finally:
+        with _lock:
+            _reloading = False
+# Write-hook changes seen while a load is scanning, as (report id, entry or None
+# for a removal); None when no load is running.
+_pending: list[tuple[int, dict | None]] | None = None
+
+
+def ensure_fresh(db: Database) -> None:
+    """Load the index if it never was; start a background reload if it is stale."""
+    global _reloading
+    with _lock:
+        loaded = _loaded_at is not None
+        if loaded:
+            if _reloading or time.monotonic() - _loaded_at <= _refresh_seconds():
+                return
+            _reloading = True
+    if loaded:
+        threading.Thread(target=_reload, args=(db,), name="report-index-reload", daemon=True).start()
+        return
+    with _load_lock:
+        if _loaded_at is None:
+            _load_locked(db)
+
+
+def add_report(report: dict) -> None:
+    if str(report.get("status") or "submitted") not in OPEN_STATUSES:
+        return
+    entry = _entry(report)
+    with _lock:
+        _apply_locked(entry["id"], entry)
+
+
+def set_status(report: dict, status: str) -> None:
+    """Keep a report indexed while it is open and drop it once it is not."""
+    report_id = int(report.get("id", 0))
+    with _lock:
+        _apply_locked(report_id, _entry(report) if status in OPEN_STATUSES else None)
+
+
+def _candidate_ids_locked(bbox: tuple[float, float, float, float]) -> list[int]:
+    west, south, east, north = bbox
+    rows = range(math.floor(south / CELL_DEG), math.floor(north / CELL_DEG) + 1)
+    spans = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+    cols = [c for w, e in spans for c in range(math.floor(w / CELL_DEG), math.floor(e / CELL_DEG) + 1)]
+    if len(rows) * len(cols) > len(_cells):
+        # Huge radius: walking the occupied cells is cheaper than the box.
+        col_set = set(cols)
+        keys = [key for key in _cells if rows.start <= key[0] < rows.stop and key[1] in col_set]
+    else:
+        keys = [(r, c) for r in rows for c in cols if (r, c) in _cells]
+    return [rid for key in keys for rid in _cells[key]]
+
+
+def nearby(latitude: float, longitude: float, radius_m: float, *, exclude_user_id: int | None = None) -> list[dict]:
+    """Indexed reports within `radius_m`, nearest first, each with a `distance_m`."""
+    with _lock:
+        _stats["queries"] += 1
+        entries = [
+            _reports[rid]
+            for rid in _candidate_ids_locked(bbox_around(latitude, longitude, radius_m))
+            if _reports[rid]["user_id"] != exclude_user_id
+        ]
+    if not entries:
+        return []
+    dist = haversine_many(latitude, longitude, [e["latitude"] for e in entries], [e["longitude"] for e in entries])
+    hits = [{**e, "distance_m": float(d)} for e, d in zip(entries, dist.tolist()) if d <= radius_m]
+    hits.sort(key=lambda e: (e["distance_m"], e["id"]))
+    return hits
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            "loaded": _loaded_at is not None,
+            "reports": len(_reports),
+            "cells": len(_cells),
+            "age_sec": round(time.monotonic() - _loaded_at, 1) if _loaded_at is not None else None,
+            **_stats,
+        }
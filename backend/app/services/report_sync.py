@@ -0,0 +1,51 @@
+"""Change stamps for report lists, so dashboards can fetch only what changed.
+
+Every report write sets `updated_at` with `$currentDate`, so the value comes
+from the MongoDB server clock at write time and costs no extra round trip
+(inserts go through an upsert for the same reason). A sync returns the server
+time read before its query as `seq` (milliseconds since the epoch); the next
+sync asks for rows stamped after it.
+
+A write is stamped a moment before it becomes visible, so a write racing
+with a sync can carry a stamp the sync already covered. Deltas therefore
+re-read the REPORT_SYNC_LOOKBACK_SEC seconds before `since`; clients apply
+rows as upserts, so seeing a row twice is harmless.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import os
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+# Merge into an update document: {"$set": {...}, **STAMP}.
+STAMP = {"$currentDate": {"updated_at": True}}
+
+_EPOCH = dt.datetime(1970, 1, 1)
+
+
+def _lookback() -> dt.timedelta:
+    try:
+        return dt.timedelta(seconds=max(0.0, float(os.getenv("REPORT_SYNC_LOOKBACK_SEC", "5"))))
+    except Exception:
+        return dt.timedelta(seconds=5)
+
+
+def insert_op(doc: dict) -> UpdateOne:
+    """Insert `doc` (keyed by its `id`) with a server-side `updated_at`."""
+    fields = {k: v for k, v in doc.items() if k not in {"id", "_id"}}
+    return UpdateOne({"id": doc["id"]}, {"$setOnInsert": fields, **STAMP}, upsert=True)
+
+
+def server_seq(db: Database) -> int:
+    """MongoDB server time in ms; read it before listing to get the `since` for the next sync."""
+    local_time = db.command("hello")["localTime"]
+    return int((local_time.replace(tzinfo=None) - _EPOCH) / dt.timedelta(milliseconds=1))
+
+
+def changes(collection: Collection, scope: dict, since: int) -> list[dict]:
+    """Documents of `scope` stamped after `since` (minus the lookback), oldest change first."""
+    after = _EPOCH + dt.timedelta(milliseconds=int(since)) - _lookback()
+    return list(collection.find({"$and": [scope, {"updated_at": {"$gt": after}}]}).sort("updated_at", ASCENDING))
@@ -12,9 +12,19 @@ from fastapi.staticfiles import StaticFiles
 from backend.app.database import ensure_indexes, get_mongo_database
 from backend.app.routes.auth_routes import router as auth_router
 from backend.app.routes.cluster_routes import router as cluster_router
-from backend.app.routes.report_routes import router as report_router
+from backend.app.routes.map_routes import router as map_router
+from backend.app.routes.report_routes import router as report_router, start_media_sweeper
 from backend.app.routes.validation_routes import router as validation_router
 from backend.app.routes.worker_routes import router as worker_router
+from backend.app.services import (
+    cluster_cache,
+    location_buffer,
+    media_pipeline,
+    proximity_clusters,
+    report_index,
+)
+from backend.app.services.cluster_service import materialize_once
+from backend.app.services.districts import backfill_district_keys
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 BACKEND_STATIC_DIR = Path(__file__).resolve().parent / "static"
@@ -61,11 +71,13 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Report-Seq"],
     )
 
     app.include_router(auth_router)
     app.include_router(report_router)
     app.include_router(cluster_router)
+    app.include_router(map_router)
     app.include_router(validation_router)
     app.include_router(worker_router)
 
@@ -83,12 +95,30 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     def _startup() -> None:
         try:
-            ensure_indexes(get_mongo_database())
+            db = get_mongo_database()
+            ensure_indexes(db)
             logger.info("MongoDB indexes ensured")
+            # District lookups are exact matches on district_key; key up older documents.
+            keyed = backfill_district_keys(db)
+            if keyed:
+                logger.info("Set district_key on %d users/reports", keyed)
+            if report_index.enabled():
+                logger.info("Indexed %d open reports", report_index.load(db))
+            # Media jobs queued by a previous process died with it; re-queue them.
+            start_media_sweeper(db)
+            # First boot after upgrading: materialize clusters and hotspot buckets from existing reports.
+            built = materialize_once(db)
+            if built:
+                logger.info("Built %d cluster rows", built)
         except Exception as exc:
             # Do not crash boot on platform deploy if database is temporarily unreachable.
             logger.warning("Skipping index initialization at startup: %s", exc)
 
+    @app.on_event("shutdown")
+    def _shutdown() -> None:
+        media_pipeline.shutdown()
+        location_buffer.shutdown()
+
     @app.get("/health")
     def health() -> dict:
         return {
@@ -96,6 +126,16 @@ def create_app() -> FastAPI:
             "jwt_secret_configured": bool(os.getenv("JWT_SECRET")) and os.getenv("JWT_SECRET") != "change-me",
         }
 
+    @app.get("/metrics")
+    def metrics() -> dict:
+        return {
+            "media_pipeline": media_pipeline.stats(),
+            "cluster_cache": cluster_cache.stats(),
+            "proximity_clusters": proximity_clusters.stats(),
+            "report_index": report_index.stats(),
+            "location_buffer": location_buffer.stats(),
+        }
+
     @app.get("/")
     def index() -> FileResponse:
         if (LANDING_DIR / "landing.html").exists():
@@ -1,5 +1,57 @@
 const API = {
-  async request(path, { method = "GET", body = null, auth = true } = {}) {
+  async request(path, options = {}) {
+    return (await this.send(path, options)).data;
+  },
+
+  // Every row of a paged list: follows X-Next-Cursor until the last page.
+  async requestAll(path, { pageSize = 200 } = {}) {
+    return (await this.listAll(path, { pageSize })).rows;
+  },
+
+  // Like requestAll, plus the X-Report-Seq of the first page (the `since` for the next delta).
+  async listAll(path, { pageSize = 200 } = {}) {
+    const rows = [];
+    let seq = null;
+    let cursor = null;
+    do {
+      const sep = path.includes("?") ? "&" : "?";
+      const page = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+      const { data, headers } = await this.send(`${path}${sep}limit=${pageSize}${page}`);
+      rows.push(...(data || []));
+      if (seq === null) seq = headers.get("X-Report-Seq");
+      cursor = headers.get("X-Next-Cursor");
+    } while (cursor);
+    return { rows, seq };
+  },
+
+  // Report lists kept current with ?since= deltas, by path, for the signed-in token.
+  _synced: {},
+
+  // Every row of a report list. The first call loads it in full; later calls only fetch
+  // the reports changed since the previous one, upsert them and drop `removed_ids`.
+  async requestSynced(path) {
+    const token = localStorage.getItem("aa_token");
+    const cached = this._synced[path];
+    if (!cached || cached.token !== token || cached.seq === null) {
+      const { rows, seq } = await this.listAll(path);
+      this._synced[path] = { token, rows, seq };
+      return [...rows];
+    }
+
+    const sep = path.includes("?") ? "&" : "?";
+    const delta = await this.request(`${path}${sep}since=${encodeURIComponent(cached.seq)}`);
+    const removed = new Set(delta.removed_ids || []);
+    const changed = new Map((delta.reports || []).map((r) => [r.id, r]));
+    const kept = cached.rows.filter((r) => !removed.has(r.id)).map((r) => changed.get(r.id) || r);
+    const known = new Set(cached.rows.map((r) => r.id));
+    // Lists are newest first, so reports the client has not seen go on top.
+    const added = (delta.reports || []).filter((r) => !known.has(r.id));
+    cached.rows = [...added, ...kept];
+    cached.seq = String(delta.seq);
+    return [...cached.rows];
+  },
+
+  async send(path, { method = "GET", body = null, auth = true } = {}) {
     const headers = { "Content-Type": "application/json" };
     if (auth) {
       const token = localStorage.getItem("aa_token");
@@ -32,6 +84,6 @@ const API = {
       }
       throw new Error(msg);
     }
-    return data;
+    return { data, headers: res.headers };
   },
 };
@@ -343,7 +343,7 @@ async function refreshMyReports() {
   }
 
   try {
-    const reports = await API.request("/reports/me");
+    const reports = await API.requestSynced("/reports/me");
     if (!reports.length) {
       holder.innerHTML = `<div class="empty-state">No reports yet.</div>`;
       if (sidebarHolder) sidebarHolder.innerHTML = `<div class="nav__empty">No reports yet.</div>`;
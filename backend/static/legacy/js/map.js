@@ -94,7 +94,7 @@ async function refreshSupervisorViews() {
   if (!holder) return;
   holder.innerHTML = "";
   try {
-    const reports = await API.request("/reports");
+    const reports = await API.requestSynced("/reports");
 
     try {
       if (typeof window.renderSupervisorStats === "function") window.renderSupervisorStats(reports);
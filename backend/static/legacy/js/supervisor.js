@@ -24,7 +24,7 @@ async function refreshVerifyQueue() {
 
   let reports = [];
   try {
-    reports = await API.request("/reports");
+    reports = await API.requestSynced("/reports");
   } catch (err) {
     holder.innerHTML = `<div class="muted">${escapeHtml(err.message)}</div>`;
     return;
@@ -175,7 +175,7 @@ async function refreshHistory() {
 
   let rows = [];
   try {
-    rows = await API.request("/reports/history");
+    rows = await API.requestSynced("/reports/history");
   } catch (err) {
     holder.innerHTML = `<div class="muted">${escapeHtml(err.message)}</div>`;
     return;
@@ -303,7 +303,7 @@ async function refreshAssigned() {
 
   let reports = [];
   try {
-    reports = await API.request("/reports/assigned");
+    reports = await API.requestSynced("/reports/assigned");
   } catch (err) {
     list.innerHTML = `<div class="muted">${escapeHtml(err.message)}</div>`;
     return;
@@ -0,0 +1,93 @@
+"""Shared fixtures.
+
+Tests marked `mongodb` run against a scratch database (`<MONGODB_DB>_test`,
+dropped afterwards) on MONGODB_URI and are skipped when it is unreachable.
+"""
+from __future__ import annotations
+
+import os
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+from pymongo import MongoClient, monitoring
+from pymongo.errors import PyMongoError
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(ROOT_DIR / ".env")
+except Exception:
+    pass
+
+from backend.app.database import ensure_indexes  # noqa: E402
+
+
+class OpCounter(monitoring.CommandListener):
+    """Counts the commands sent by the test client, by command name."""
+
+    def __init__(self) -> None:
+        self.ops: Counter[str] = Counter()
+
+    def started(self, event):
+        self.ops[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def take(self) -> Counter[str]:
+        ops, self.ops = self.ops, Counter()
+        return ops
+
+
+def _mongo_uri() -> str:
+    return os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+
+
+@lru_cache(maxsize=1)
+def _mongo_error() -> str | None:
+    client = MongoClient(_mongo_uri(), serverSelectionTimeoutMS=2000)
+    try:
+        client.admin.command("ping")
+        return None
+    except PyMongoError as exc:
+        return str(exc)
+    finally:
+        client.close()
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "mongodb: needs MongoDB at MONGODB_URI; skipped when it is unreachable")
+
+
+def pytest_runtest_setup(item):
+    if item.get_closest_marker("mongodb") is not None and _mongo_error() is not None:
+        pytest.skip(f"MongoDB unreachable: {_mongo_error()}")
+
+
+@pytest.fixture(scope="session")
+def op_counter() -> OpCounter:
+    return OpCounter()
+
+
+@pytest.fixture(scope="session")
+def mongo_client(op_counter):
+    client = MongoClient(_mongo_uri(), event_listeners=[op_counter])
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def mongo_db(mongo_client):
+    name = os.getenv("MONGODB_DB", "aquaalert") + "_test"
+    mongo_client.drop_database(name)
+    db = mongo_client[name]
+    ensure_indexes(db)
+    yield db
+    mongo_client.drop_database(name)
@@ -0,0 +1,66 @@
+"""The grid cluster backends must agree with the Python scan, globally and per district."""
+from __future__ import annotations
+
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from backend.app.services.cluster_service import (
+    CLUSTER_BACKENDS,
+    GRID_BACKENDS,
+    SEVERITY_WEIGHT,
+    compute_cluster_id,
+    rebuild_clusters,
+)
+from backend.app.services.districts import district_key
+
+pytestmark = pytest.mark.mongodb
+
+# The same district spelled two ways must behave as one.
+DISTRICTS = ["Pune", "pune ", "Nagpur"]
+
+
+def _seed(db, n: int = 300) -> None:
+    rng = np.random.default_rng(9)
+    now = dt.datetime.utcnow()
+    severities = list(SEVERITY_WEIGHT)
+    reports = []
+    for i in range(1, n + 1):
+        # A small spread, so many reports share a cluster cell.
+        lat = 18.5 + float(rng.integers(0, 12)) * 0.001
+        lon = 73.8 + float(rng.integers(0, 12)) * 0.001
+        district = DISTRICTS[i % len(DISTRICTS)]
+        reports.append(
+            {
+                "id": i,
+                "latitude": lat,
+                "longitude": lon,
+                "cluster_id": compute_cluster_id(lat, lon),
+                "district": district,
+                "district_key": district_key(district),
+                "severity": severities[int(rng.integers(0, len(severities)))],
+                "status": "submitted",
+                "agree_count": int(rng.integers(0, 6)),
+                "disagree_count": int(rng.integers(0, 3)),
+                "created_at": now - dt.timedelta(minutes=i),
+            }
+        )
+    db["reports"].insert_many(reports)
+    rebuild_clusters(db)
+
+
+@pytest.mark.parametrize("district", [None, *DISTRICTS])
+def test_grid_backends_match_scan(mongo_db, district):
+    _seed(mongo_db)
+    expected = {c["cluster_id"]: c for c in CLUSTER_BACKENDS["scan"](mongo_db, district=district)}
+    assert expected
+    for name in GRID_BACKENDS:
+        got = {c["cluster_id"]: c for c in CLUSTER_BACKENDS[name](mongo_db, district=district)}
+        assert got == expected, name
+
+
+def test_district_spellings_share_clusters(mongo_db):
+    _seed(mongo_db)
+    for name in GRID_BACKENDS:
+        assert CLUSTER_BACKENDS[name](mongo_db, district="Pune") == CLUSTER_BACKENDS[name](mongo_db, district="PUNE")
@@ -0,0 +1,57 @@
+"""Accuracy of the vectorized geo helpers against the scalar haversine reference."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from backend.app.services import geo
+
+# Max allowed disagreement with the scalar reference, in meters.
+TOLERANCE_M = 1e-6
+
+# Includes near-pole, antimeridian and mid-latitude origins.
+ORIGINS = [(0.0, 0.0), (89.9, 10.0), (-45.0, 179.9), (28.6, 77.2)]
+
+
+@pytest.fixture(scope="module")
+def points() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(7)
+    return rng.uniform(-90, 90, 2000), rng.uniform(-180, 180, 2000)
+
+
+def test_known_distances():
+    # One degree of latitude, and a quarter of the equator.
+    assert geo.haversine_m(0.0, 0.0, 1.0, 0.0) == pytest.approx(111194.93, abs=0.01)
+    assert geo.haversine_m(0.0, 0.0, 0.0, 90.0) == pytest.approx(geo.EARTH_RADIUS_M * np.pi / 2, abs=1e-6)
+
+
+@pytest.mark.parametrize("lat,lon", ORIGINS)
+def test_haversine_many_matches_scalar(points, lat, lon):
+    lats, lons = points
+    expected = np.array([geo.haversine_m(lat, lon, a, b) for a, b in zip(lats, lons)])
+    assert np.max(np.abs(geo.haversine_many(lat, lon, lats, lons) - expected)) < TOLERANCE_M
+
+
+def test_haversine_matrix_matches_scalar(points):
+    lats, lons = points
+    matrix = geo.haversine_matrix(lats[:50], lons[:50], lats[50:120], lons[50:120])
+    for i in range(50):
+        expected = [geo.haversine_m(lats[i], lons[i], a, b) for a, b in zip(lats[50:120], lons[50:120])]
+        assert np.max(np.abs(matrix[i] - expected)) < TOLERANCE_M
+
+
+def test_haversine_pairs_matches_scalar(points):
+    lats, lons = points
+    got = geo.haversine_pairs(lats[:1000], lons[:1000], lats[1000:], lons[1000:])
+    expected = [geo.haversine_m(a, b, c, d) for a, b, c, d in zip(lats[:1000], lons[:1000], lats[1000:], lons[1000:])]
+    assert np.max(np.abs(got - expected)) < TOLERANCE_M
+
+
+@pytest.mark.parametrize("lat,lon", ORIGINS)
+@pytest.mark.parametrize("radius", [50.0, 3000.0, 500_000.0])
+def test_within_radius_never_drops_a_point(points, lat, lon, radius):
+    # The bbox prefilter must keep every point that is inside the radius.
+    lats, lons = points
+    dist = geo.haversine_many(lat, lon, lats, lons)
+    idx, _ = geo.within_radius(lat, lon, lats, lons, radius)
+    assert set(idx.tolist()) == set(np.nonzero(dist <= radius)[0].tolist())
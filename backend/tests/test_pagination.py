@@ -0,0 +1,25 @@
+"""Keyset cursors round-trip, including rows that lack the sort field."""
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+
+from backend.app.services import pagination
+
+
+def test_cursor_round_trip():
+    ts = dt.datetime(2026, 3, 1, 12, 30, 5, 123000)
+    token = pagination.encode_cursor("created_at", {"id": 42, "created_at": ts})
+    assert pagination.decode_cursor(token) == (ts, 42)
+
+
+def test_cursor_for_row_without_sort_field():
+    token = pagination.encode_cursor("assigned_at", {"id": 7})
+    assert pagination.decode_cursor(token) == (None, 7)
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", "WzEsMiwzXQ", "WyJub3QgYSBkYXRlIiwxXQ"])
+def test_invalid_cursor(token):
+    with pytest.raises(ValueError):
+        pagination.decode_cursor(token)
@@ -0,0 +1,104 @@
+"""Proximity clustering against a brute-force haversine graph, and incremental writes against a fresh load."""
+from __future__ import annotations
+
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from backend.app.services import proximity_clusters as pc
+from backend.app.services.geo import haversine_matrix
+
+NOW = dt.datetime(2026, 1, 15, 12, 0)
+HALF_LIFE = 24.0
+DISTRICTS = ["Pune", "pune ", "Nagpur", None]
+
+
+def _brute_force(lat: np.ndarray, lon: np.ndarray, eps: float) -> np.ndarray:
+    dist = haversine_matrix(lat, lon, lat, lon)
+    i, j = np.nonzero(np.triu(dist <= eps, k=1))
+    return pc._components(len(lat), i, j)
+
+
+def _partition(labels: np.ndarray) -> set[frozenset]:
+    groups: dict[int, set] = {}
+    for k, label in enumerate(labels.tolist()):
+        groups.setdefault(label, set()).add(k)
+    return {frozenset(g) for g in groups.values()}
+
+
+@pytest.mark.parametrize("lat0", [0.0, 28.6, -45.0, 70.0])
+@pytest.mark.parametrize("eps,spread", [(100.0, 0.02), (1000.0, 0.2), (50_000.0, 8.0)])
+def test_cluster_points_matches_brute_force(lat0, eps, spread):
+    rng = np.random.default_rng(int(lat0 * 10 + eps) % 2**32)
+    lat = np.clip(lat0 + rng.normal(0, spread, 1500), -89.0, 89.0)
+    lon = 77.2 + rng.normal(0, spread, 1500)
+    got = pc.cluster_points(lat, lon, eps)
+    assert _partition(got) == _partition(_brute_force(lat, lon, eps))
+    # Labels are the smallest member index.
+    assert all(got[k] <= k for k in range(len(got)))
+
+
+def _reports(n: int, seed: int = 3) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": i + 1,
+            "latitude": 18.5 + float(rng.normal(0, 0.004)),
+            "longitude": 73.8 + float(rng.normal(0, 0.004)),
+            "weight": int(rng.integers(1, 5)),
+            "agree_count": int(rng.integers(0, 3)),
+            "disagree_count": int(rng.integers(0, 2)),
+            "district": DISTRICTS[i % len(DISTRICTS)],
+            "created_at": NOW - dt.timedelta(hours=float(rng.uniform(0, 72))),
+            "status": "submitted",
+        }
+        for i in range(n)
+    ]
+
+
+def _snapshot(district: str | None) -> list[dict]:
+    rows = pc.groups(district, now=NOW, half_life_hours=HALF_LIFE)
+    return sorted(rows, key=lambda r: r["cluster_id"])
+
+
+def _assert_same(got: list[dict], expected: list[dict]) -> None:
+    assert [r["cluster_id"] for r in got] == [r["cluster_id"] for r in expected]
+    for a, b in zip(got, expected):
+        for field in ("report_count", "max_weight", "agree", "disagree"):
+            assert a[field] == b[field]
+        for field in ("latitude", "longitude", "hotspot_score"):
+            assert a[field] == pytest.approx(b[field], abs=1e-3)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setenv("PROXIMITY_RADIUS_M", "150")
+    yield
+    pc.load([])
+
+
+@pytest.mark.parametrize("district", [None, "Pune", "NAGPUR"])
+def test_incremental_writes_match_fresh_load(engine, district):
+    reports = _reports(400)
+    pc.load(reports[:300])
+    _snapshot(district)  # warm the cache so writes have to patch it
+
+    for report in reports[300:]:
+        pc.add_report(report, report["weight"])
+    state = {r["id"]: r for r in reports}
+    rng = np.random.default_rng(5)
+    for rid in rng.choice(list(state), 60, replace=False).tolist():
+        vote = int(rng.choice([1, -1]))
+        pc.update_report(rid, vote=vote)
+        state[rid]["agree_count" if vote == 1 else "disagree_count"] += 1
+    for rid in rng.choice(list(state), 80, replace=False).tolist():
+        pc.update_report(rid, status="closed")
+        state[rid]["status"] = "closed"
+    for rid in rng.choice([r for r in state if state[r]["status"] == "closed"], 20, replace=False).tolist():
+        pc.update_report(rid, status="accepted")
+        state[rid]["status"] = "accepted"
+    incremental = _snapshot(district)
+
+    pc.load([r for r in state.values() if r["status"] in pc.OPEN_STATUSES])
+    _assert_same(incremental, _snapshot(district))
@@ -0,0 +1,70 @@
+"""Writes landing while the report index reloads must survive the swap."""
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+
+from backend.app.services import report_index
+
+
+def _report(report_id: int, status: str = "submitted") -> dict:
+    return {
+        "id": report_id,
+        "user_id": 1,
+        "latitude": 18.5 + report_id * 1e-4,
+        "longitude": 73.8,
+        "district": "Pune",
+        "description": "",
+        "severity": "Low",
+        "created_at": dt.datetime(2026, 1, 1),
+        "status": status,
+    }
+
+
+class _Reports:
+    """A `reports` collection whose scan runs `during_scan` halfway through."""
+
+    def __init__(self, docs: list[dict], during_scan) -> None:
+        self.docs = docs
+        self.during_scan = during_scan
+
+    def find(self, query, projection):
+        for k, doc in enumerate(self.docs):
+            if k == len(self.docs) // 2:
+                self.during_scan()
+            yield doc
+
+
+@pytest.fixture
+def index():
+    yield report_index
+    with report_index._lock:
+        report_index._reports, report_index._cells, report_index._loaded_at = {}, {}, None
+
+
+def _ids() -> set[int]:
+    return {r["id"] for r in report_index.nearby(18.5, 73.8, 5000)}
+
+
+def test_writes_during_reload_are_replayed(index):
+    docs = [_report(i) for i in range(1, 11)]
+    index.load({"reports": _Reports(docs, lambda: None)})
+    assert _ids() == set(range(1, 11))
+
+    def writes() -> None:
+        # Report 2 is already scanned, 9 is not; 11 is new.
+        index.set_status(docs[1], "closed")
+        index.set_status(docs[8], "closed")
+        index.add_report(_report(11))
+
+    # The scan still sees the pre-write state of every document.
+    index.load({"reports": _Reports(docs, writes)})
+    assert _ids() == set(range(1, 11)) - {2, 9} | {11}
+    assert index._pending is None
+
+
+def test_writes_during_first_load_are_kept(index):
+    docs = [_report(i) for i in range(1, 5)]
+    index.load({"reports": _Reports(docs, lambda: index.add_report(_report(5)))})
+    assert _ids() == {1, 2, 3, 4, 5}
@@ -0,0 +1,58 @@
+"""GET /reports resolves assigned workers in a constant number of queries, however many rows it returns."""
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from fastapi import Response
+
+from backend.app.routes import report_routes
+from backend.app.services.districts import district_key
+
+pytestmark = pytest.mark.mongodb
+
+DISTRICT = "Bench"
+WORKERS = 8
+# A cursor larger than one batch adds getMores for the reports themselves; compare the rest.
+COUNTED = ("find", "aggregate")
+
+
+def _seed(db, n: int) -> None:
+    db["reports"].delete_many({})
+    now = dt.datetime.utcnow()
+    db["reports"].insert_many(
+        [
+            {
+                "id": i,
+                "user_id": 1,
+                "latitude": 28.6,
+                "longitude": 77.2,
+                "district": DISTRICT,
+                "district_key": district_key(DISTRICT),
+                "status": "assigned",
+                "assigned_worker_id": 1000 + i % WORKERS,
+                "created_at": now - dt.timedelta(seconds=i),
+            }
+            for i in range(1, n + 1)
+        ]
+    )
+
+
+def test_all_reports_query_count_is_constant(mongo_db, op_counter):
+    mongo_db["users"].insert_many(
+        [{"id": 1000 + k, "role": "worker", "name": f"worker {k}", "district": DISTRICT} for k in range(WORKERS)]
+    )
+    supervisor = {"id": 1, "role": "supervisor", "district": DISTRICT}
+
+    counts = []
+    for n in (10, 100, 500):
+        _seed(mongo_db, n)
+        op_counter.take()
+        rows = report_routes.all_reports(
+            supervisor=supervisor, response=Response(), db=mongo_db, limit=0, cursor=None, since=None
+        )
+        ops = op_counter.take()
+        assert len(rows) == n
+        assert all(r.assigned_worker is not None for r in rows)
+        counts.append(sum(ops[name] for name in COUNTED))
+    assert len(set(counts)) == 1, counts
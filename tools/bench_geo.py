@@ -0,0 +1,69 @@
+"""Micro-benchmark and accuracy check for backend/app/services/geo.py.
+
+Usage (from the repo root; needs NumPy and pytest):
+
+    python tools/bench_geo.py -n 10000
+
+Runs the accuracy tests in backend/tests/test_geo.py first (every variant
+must agree with the scalar reference), then compares the scalar haversine
+loop the routes used to run against the vectorized one-to-N,
+bbox-prefiltered and N-to-M variants.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from backend.app.services import geo  # noqa: E402
+
+GEO_TESTS = ROOT_DIR / "backend" / "tests" / "test_geo.py"
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=10_000, help="points per run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if pytest.main(["-q", str(GEO_TESTS)]) != 0:
+        sys.exit("accuracy checks failed")
+
+    rng = np.random.default_rng(7)
+
+    # A district-sized spread of points around one origin.
+    lat0, lon0 = 28.6, 77.2
+    lats = lat0 + rng.uniform(-0.5, 0.5, args.n)
+    lons = lon0 + rng.uniform(-0.5, 0.5, args.n)
+    lat_list, lon_list = lats.tolist(), lons.tolist()
+
+    scalar = _best_ms(lambda: [geo.haversine_m(lat0, lon0, a, b) for a, b in zip(lat_list, lon_list)], args.repeat)
+    batch = _best_ms(lambda: geo.haversine_many(lat0, lon0, lat_list, lon_list), args.repeat)
+    prefiltered = _best_ms(lambda: geo.within_radius(lat0, lon0, lats, lons, 3000.0), args.repeat)
+    m = min(args.n, 1000)
+    matrix = _best_ms(lambda: geo.haversine_matrix(lats[:m], lons[:m], lats, lons), 1)
+
+    print(f"scalar loop, 1 x {args.n}:          {scalar:8.2f} ms")
+    print(f"haversine_many, 1 x {args.n}:       {batch:8.2f} ms  ({scalar / batch:.0f}x)")
+    print(f"within_radius 3 km, 1 x {args.n}:   {prefiltered:8.2f} ms  ({scalar / prefiltered:.0f}x)")
+    print(f"haversine_matrix, {m} x {args.n}: {matrix:8.2f} ms  ({matrix * 1000 / (m * args.n):.3f} us/pair)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Check that GET /reports costs a constant number of MongoDB queries, however many rows it returns.
+
+Usage (from the repo root, with MongoDB reachable through MONGODB_URI):
+
+    python tools/bench_list_queries.py --sizes 10 100 500
+
+Runs against a scratch database (`<MONGODB_DB>_bench`) that is dropped at the end.
+Each size seeds that many assigned reports (spread over a handful of workers),
+calls the route handler directly and counts the commands it sends. Exits
+non-zero if the count changes with the number of rows.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from fastapi import Response
+from pymongo import MongoClient, monitoring
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(ROOT_DIR / ".env")
+except Exception:
+    pass
+
+from backend.app.database import ensure_indexes  # noqa: E402
+from backend.app.routes import report_routes  # noqa: E402
+from backend.app.services.districts import district_key  # noqa: E402
+
+COUNTED = {"find", "getMore", "aggregate"}
+DISTRICT = "Bench"
+WORKERS = 8
+
+
+class _OpCounter(monitoring.CommandListener):
+    def __init__(self) -> None:
+        self.ops: Counter[str] = Counter()
+
+    def started(self, event):
+        if event.command_name in COUNTED:
+            self.ops[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def take(self) -> Counter[str]:
+        ops, self.ops = self.ops, Counter()
+        return ops
+
+
+def _seed(db, n: int) -> None:
+    db["reports"].delete_many({})
+    now = dt.datetime.utcnow()
+    db["reports"].insert_many(
+        [
+            {
+                "id": i,
+                "user_id": 1,
+                "latitude": 28.6,
+                "longitude": 77.2,
+                "district": DISTRICT,
+                "district_key": district_key(DISTRICT),
+                "status": "assigned",
+                "assigned_worker_id": 1000 + i % WORKERS,
+                "created_at": now - dt.timedelta(seconds=i),
+            }
+            for i in range(1, n + 1)
+        ]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="report counts to compare")
+    args = parser.parse_args()
+
+    counter = _OpCounter()
+    client = MongoClient(os.getenv("MONGODB_URI", "mongodb://localhost:27017"), event_listeners=[counter])
+    db_name = os.getenv("MONGODB_DB", "aquaalert") + "_bench"
+    client.drop_database(db_name)
+    db = client[db_name]
+    ensure_indexes(db)
+    db["users"].insert_many(
+        [
+            {"id": 1000 + k, "role": "worker", "name": f"worker {k}", "district": DISTRICT}
+            for k in range(WORKERS)
+        ]
+    )
+    supervisor = {"id": 1, "role": "supervisor", "district": DISTRICT}
+
+    results: list[tuple[int, Counter[str], float]] = []
+    try:
+        for n in args.sizes:
+            _seed(db, n)
+            counter.take()
+            started = time.perf_counter()
+            rows = report_routes.all_reports(
+                supervisor=supervisor, response=Response(), db=db, limit=0, cursor=None, since=None
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            assert len(rows) == n and all(r.assigned_worker is not None for r in rows)
+            results.append((n, counter.take(), elapsed_ms))
+    finally:
+        client.drop_database(db_name)
+
+    for n, ops, elapsed_ms in results:
+        # A cursor larger than one batch adds getMores for the reports themselves; compare finds only.
+        detail = ", ".join(f"{k}={v}" for k, v in sorted(ops.items()))
+        print(f"{n:>6} reports: {detail}  {elapsed_ms:.1f} ms")
+    finds = {ops["find"] + ops["aggregate"] for _, ops, _ in results}
+    if len(finds) != 1:
+        sys.exit(f"query count grows with the number of rows: {sorted(finds)}")
+
+
+if __name__ == "__main__":
+    main()
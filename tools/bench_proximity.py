@@ -0,0 +1,101 @@
+"""Benchmark for the proximity clustering engine (backend/app/services/proximity_clusters.py).
+
+Usage (from the repo root; needs NumPy and SciPy):
+
+    python tools/bench_proximity.py -n 300000
+
+For a dense single-city spread and a country-wide spread of open reports it
+times the batch clustering, the first nationwide `groups()` read, and then
+single-report inserts each followed by a `groups()` read (the write path of
+POST /reports with a dashboard polling GET /clusters). Exits non-zero if the
+batch clustering misses TARGET_SEC.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from backend.app.services import proximity_clusters  # noqa: E402
+
+TARGET_SEC = 1.0
+HALF_LIFE_HOURS = 72.0
+
+
+def _city(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    # ~5 km standard deviation around one city center.
+    return 28.6 + rng.normal(0, 0.045, n), 77.2 + rng.normal(0, 0.051, n)
+
+
+def _country(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    return rng.uniform(8.0, 35.0, n), rng.uniform(68.0, 97.0, n)
+
+
+def _rows(lat: np.ndarray, lon: np.ndarray, now: dt.datetime) -> list[dict]:
+    return [
+        {
+            "id": k + 1,
+            "latitude": a,
+            "longitude": b,
+            "weight": 1 + k % 3,
+            "district": f"d{k % 50}",
+            "created_at": now - dt.timedelta(minutes=k % 10_000),
+        }
+        for k, (a, b) in enumerate(zip(lat.tolist(), lon.tolist()))
+    ]
+
+
+def _run(name: str, lat: np.ndarray, lon: np.ndarray, inserts: int) -> float:
+    now = dt.datetime.utcnow()
+    started = time.perf_counter()
+    proximity_clusters.cluster_points(lat, lon)
+    batch = time.perf_counter() - started
+
+    proximity_clusters.load(_rows(lat, lon, now))
+    started = time.perf_counter()
+    groups = proximity_clusters.groups(None, now=now, half_life_hours=HALF_LIFE_HOURS)
+    first = time.perf_counter() - started
+
+    rng = np.random.default_rng(1)
+    base = len(lat)
+    started = time.perf_counter()
+    for k in range(inserts):
+        p = int(rng.integers(0, base))
+        proximity_clusters.add_report(
+            {"id": base + k + 1, "latitude": lat[p] + 1e-5, "longitude": lon[p], "district": "d0", "created_at": now},
+            2,
+        )
+        proximity_clusters.groups(None, now=now, half_life_hours=HALF_LIFE_HOURS)
+    per_insert = (time.perf_counter() - started) / max(1, inserts)
+
+    print(f"{name}: {len(lat)} points, {len(groups)} clusters")
+    print(f"  batch clustering:          {batch * 1000:8.1f} ms")
+    print(f"  first groups(None):        {first * 1000:8.1f} ms")
+    print(f"  insert + groups(None):     {per_insert * 1000:8.2f} ms each")
+    return batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=300_000, help="open reports per scenario")
+    parser.add_argument("--inserts", type=int, default=50, help="single-report inserts to time")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    slowest = max(
+        _run("city", *_city(rng, args.n), args.inserts),
+        _run("country", *_country(rng, args.n), args.inserts),
+    )
+    if slowest > TARGET_SEC:
+        sys.exit(f"batch clustering took {slowest:.2f} s (target {TARGET_SEC:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
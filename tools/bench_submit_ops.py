@@ -0,0 +1,154 @@
+"""Count MongoDB operations per report submission, before and after the media pipeline.
+
+Usage (from the repo root, with MongoDB reachable through MONGODB_URI):
+
+    python tools/bench_submit_ops.py -n 20
+
+Runs against a scratch database (`<MONGODB_DB>_bench`) that is dropped at the end.
+"before" replays the legacy create_report write sequence (a counter increment
+per report, insert, qr_path update, media URL update); "after" calls the current submit path and
+reports request-path and background operations separately.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from PIL import Image
+from pymongo import MongoClient, ReturnDocument, monitoring
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(ROOT_DIR / ".env")
+except Exception:
+    pass
+
+# Keep bench media local; never upload to the configured Supabase bucket.
+os.environ.pop("SUPABASE_URL", None)
+
+from backend.app.database import ensure_indexes  # noqa: E402
+from backend.app.routes import report_routes  # noqa: E402
+from backend.app.schemas import ReportCreateMetaIn  # noqa: E402
+from backend.app.services import media_pipeline  # noqa: E402
+
+# Start bench ids far above real ones so generated QR files never overwrite real reports' QRs.
+BENCH_ID_BASE = 900_000_000
+COUNTED = {"insert", "update", "delete", "findAndModify", "find", "aggregate"}
+
+
+class _OpCounter(monitoring.CommandListener):
+    def __init__(self) -> None:
+        self.ops: Counter[str] = Counter()
+
+    def started(self, event):
+        if event.command_name in COUNTED:
+            self.ops[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def take(self) -> Counter[str]:
+        ops, self.ops = self.ops, Counter()
+        return ops
+
+
+def _sample_meta(i: int) -> ReportCreateMetaIn:
+    return ReportCreateMetaIn(
+        latitude=28.6 + i * 0.0001,
+        longitude=77.2 + i * 0.0001,
+        accuracy=20,
+        district="Bench",
+        contact_phone="9999999999",
+        description=f"bench report {i}",
+    )
+
+
+def _sample_image() -> str:
+    report_routes.IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    filename = f"bench_{uuid.uuid4().hex}.jpg"
+    Image.new("RGB", (640, 480), (40, 90, 160)).save(report_routes.IMAGES_DIR / filename, format="JPEG")
+    return filename
+
+
+def _legacy_next_id(db) -> int:
+    """The legacy id counter: one findAndModify per report (no hi/lo blocks)."""
+    doc = db["counters"].find_one_and_update(
+        {"_id": "reports"}, {"$inc": {"seq": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    return int(doc["seq"])
+
+
+def _legacy_submit(db, user: dict, meta: ReportCreateMetaIn, filename: str) -> None:
+    report_id = _legacy_next_id(db)
+    doc = report_routes._build_report_doc(
+        report_id=report_id, user=user, meta=meta, filename=filename, created_at=report_routes.dt.datetime.utcnow()
+    )
+    db["reports"].insert_one(doc)
+    db["reports"].update_one({"id": report_id}, {"$set": {"qr_path": f"qr/report_{report_id}.png"}})
+    db["reports"].update_one({"id": report_id}, {"$set": {"image_url": doc["image_url"], "qr_url": ""}})
+
+
+def _fmt(ops: Counter[str], n: int) -> str:
+    total = sum(ops.values())
+    detail = ", ".join(f"{k}={v / n:.1f}" for k, v in sorted(ops.items()))
+    return f"{total / n:.1f} ops/report ({detail})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=20, help="reports per scenario")
+    args = parser.parse_args()
+
+    counter = _OpCounter()
+    client = MongoClient(os.getenv("MONGODB_URI", "mongodb://localhost:27017"), event_listeners=[counter])
+    db_name = os.getenv("MONGODB_DB", "aquaalert") + "_bench"
+    client.drop_database(db_name)
+    db = client[db_name]
+    ensure_indexes(db)
+    db["counters"].insert_one({"_id": "reports", "seq": BENCH_ID_BASE})
+    user = {"id": 1, "role": "user"}
+    files: list[str] = []
+
+    try:
+        counter.take()
+        for i in range(args.n):
+            files.append(_sample_image())
+            _legacy_submit(db, user, _sample_meta(i), files[-1])
+        before = counter.take()
+
+        started = time.perf_counter()
+        for i in range(args.n):
+            files.append(_sample_image())
+            report_routes._submit_report(db=db, user=user, meta=_sample_meta(i), filename=files[-1])
+        request_ms = (time.perf_counter() - started) * 1000.0 / args.n
+        after_request = counter.take()
+        media_pipeline.shutdown(timeout=120)
+        after_background = counter.take()
+    finally:
+        client.drop_database(db_name)
+        for report_id in range(BENCH_ID_BASE + 1, BENCH_ID_BASE + 2 * args.n + 1):
+            (report_routes.STATIC_DIR / "qr" / f"report_{report_id}.png").unlink(missing_ok=True)
+        for name in files:
+            stem = Path(name).stem
+            for path in report_routes.IMAGES_DIR.glob(f"{stem}*"):
+                path.unlink(missing_ok=True)
+
+    print(f"before (legacy writes):  {_fmt(before, args.n)}")
+    print(f"after  (request path):   {_fmt(after_request, args.n)}  avg {request_ms:.1f} ms/report")
+    print(f"after  (background job): {_fmt(after_background, args.n)}")
+
+
+if __name__ == "__main__":
+    main()
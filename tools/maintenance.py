@@ -0,0 +1,131 @@
+"""One-off maintenance commands (rebuilds and backfills) against MONGODB_URI/MONGODB_DB.
+
+Usage (from the repo root):
+
+    python tools/maintenance.py rebuild-clusters
+    python tools/maintenance.py check-cluster-parity
+    python tools/maintenance.py backfill-report-cells
+    python tools/maintenance.py backfill-vote-counts
+    python tools/maintenance.py backfill-report-locations
+    python tools/maintenance.py backfill-district-keys
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(ROOT_DIR / ".env")
+except Exception:
+    pass
+
+from backend.app.database import ensure_indexes, get_mongo_database  # noqa: E402
+from pymongo import UpdateOne  # noqa: E402
+
+from backend.app.services.cluster_service import (  # noqa: E402
+    CLUSTER_BACKENDS,
+    GRID_BACKENDS,
+    backfill_vote_counts,
+    compute_cell_ids,
+    rebuild_clusters,
+)
+from backend.app.services.districts import backfill_district_keys  # noqa: E402
+from backend.app.services.geo import geo_point  # noqa: E402
+
+
+def _rebuild_clusters(db) -> None:
+    print("cluster rows:", rebuild_clusters(db))
+
+
+def _check_cluster_parity(db) -> None:
+    """Compare every grid cluster backend against the Python scan, globally and per district."""
+    districts = [None] + sorted(d for d in db["reports"].distinct("district_key") if d)
+    mismatches = 0
+    for district in districts:
+        expected = {c["cluster_id"]: c for c in CLUSTER_BACKENDS["scan"](db, district=district)}
+        for name in GRID_BACKENDS:
+            if name == "scan":
+                continue
+            got = {c["cluster_id"]: c for c in CLUSTER_BACKENDS[name](db, district=district)}
+            if got != expected:
+                mismatches += 1
+                diff = sorted(cid for cid in set(got) | set(expected) if got.get(cid) != expected.get(cid))
+                print(f"MISMATCH {name} district={district!r}: {diff[:10]}")
+    print("parity ok" if mismatches == 0 else f"{mismatches} mismatching backend/district pairs")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def _backfill_report_cells(db) -> None:
+    """Set multi-resolution `cells` on reports created before they were stored."""
+    ops = []
+    updated = 0
+    for r in db["reports"].find({"cells": {"$exists": False}}, {"id": 1, "latitude": 1, "longitude": 1}):
+        cells = compute_cell_ids(float(r.get("latitude", 0.0)), float(r.get("longitude", 0.0)))
+        ops.append(UpdateOne({"_id": r["_id"]}, {"$set": {"cells": cells}}))
+        if len(ops) >= 1000:
+            updated += db["reports"].bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += db["reports"].bulk_write(ops, ordered=False).modified_count
+    print("reports updated:", updated)
+    # Cluster rows carry the same cell ids; recompute them too.
+    _rebuild_clusters(db)
+
+
+def _backfill_vote_counts(db) -> None:
+    print("reports with votes:", backfill_vote_counts(db))
+    _rebuild_clusters(db)
+
+
+def _backfill_report_locations(db) -> None:
+    """Set the GeoJSON `location` (2dsphere-indexed) on reports created before it was stored."""
+    ops = []
+    updated = 0
+    for r in db["reports"].find({"location": {"$exists": False}}, {"latitude": 1, "longitude": 1}):
+        location = geo_point(float(r.get("latitude", 0.0)), float(r.get("longitude", 0.0)))
+        ops.append(UpdateOne({"_id": r["_id"]}, {"$set": {"location": location}}))
+        if len(ops) >= 1000:
+            updated += db["reports"].bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += db["reports"].bulk_write(ops, ordered=False).modified_count
+    print("reports updated:", updated)
+
+
+def _backfill_district_keys(db) -> None:
+    print("documents updated:", backfill_district_keys(db))
+    # Cluster rows, hotspot buckets and cache scopes are keyed by district_key; rekey them too.
+    _rebuild_clusters(db)
+
+
+COMMANDS = {
+    "rebuild-clusters": (_rebuild_clusters, "recompute cluster rows and hotspot buckets from reports"),
+    "check-cluster-parity": (_check_cluster_parity, "compare cluster backends against the Python scan"),
+    "backfill-report-cells": (_backfill_report_cells, "store grid cell ids on old reports and rebuild clusters"),
+    "backfill-vote-counts": (_backfill_vote_counts, "recount agree/disagree votes on reports and rebuild clusters"),
+    "backfill-report-locations": (_backfill_report_locations, "store GeoJSON locations on old reports for geo queries"),
+    "backfill-district-keys": (_backfill_district_keys, "store normalized district_key on old users and reports and rebuild clusters"),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        sub.add_parser(name, help=help_text)
+    args = parser.parse_args()
+
+    db = get_mongo_database()
+    ensure_indexes(db)
+    COMMANDS[args.command][0](db)
+
+
+if __name__ == "__main__":
+    main()